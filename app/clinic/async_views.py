@@ -0,0 +1,188 @@
+"""
+ASGI 용 비동기 API
+
+clinic.views 의 APIView 와 같은 요청/응답 형식을 제공하지만, DRF 의 동기
+dispatch 를 거치지 않는 Django 비동기 뷰라서 ASGI 서버에서 요청마다
+스레드 풀로 넘어가지 않습니다. 응답은 이미 렌더링된 HttpResponse 로 반환합니다.
+"""
+
+import asyncio
+
+from clinic.caching import (
+    doctor_search_cache_key,
+    get_cached_response,
+    set_cached_response,
+)
+from clinic.events import request_events
+from clinic.exceptions import NotImplementedOnServer
+from clinic.models import Doctor
+from clinic.pagination import join_rendered
+from clinic.renderers import FastJSONRenderer
+from clinic.selectors import get_doctor_documents, get_requests
+from clinic.serializers import TreatmentRequestSerializer
+from clinic.services import aaccept_request, acreate_request
+from clinic.views import DoctorApi, RequestAcceptApi, TreatmentRequestApi
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import serializers, status
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+
+class AsyncApiView(View):
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES
+    renderer = FastJSONRenderer()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # APIView 와 같이 세션 인증을 쓰지 않으므로 CSRF 검사를 하지 않습니다.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, parsers=[parser() for parser in self.parser_classes])
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except Exception as exc:
+            response = exception_handler(exc, {"view": self, "request": request})
+            if response is None:
+                raise
+            headers = {
+                key: value for key, value in response.items() if key != "Content-Type"
+            }
+            return self.render(response.data, response.status_code, headers)
+
+    def render(self, data, status_code=status.HTTP_200_OK, headers=None):
+        return self.render_content(self.renderer.render(data), status_code, headers)
+
+    def render_content(self, content, status_code=status.HTTP_200_OK, headers=None):
+        return HttpResponse(
+            content,
+            status=status_code,
+            headers=headers,
+            content_type=self.renderer.media_type,
+        )
+
+
+class AsyncDoctorApi(AsyncApiView):
+    async def get(self, request):
+        filter_serializer = DoctorApi.FilterSerializer(data=request.query_params)
+        filter_serializer.is_valid(raise_exception=True)
+
+        cache_key = doctor_search_cache_key(filter_serializer.validated_data, request)
+        if cache_key:
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                content, headers = cached
+                return self.render_content(content, headers=headers)
+
+        documents = get_doctor_documents(filter_serializer.validated_data)
+
+        paginator = DoctorApi.Pagination()
+        page = await paginator.apaginate_queryset(documents, request)
+        content = join_rendered(page, "card")
+        headers = paginator.get_headers()
+        if cache_key:
+            set_cached_response(cache_key, content, headers)
+        return self.render_content(content, headers=headers)
+
+
+class AsyncTreatmentRequestApi(AsyncApiView):
+    async def get(self, request):
+        filter_serializer = TreatmentRequestApi.FilterSerializer(
+            data=request.query_params
+        )
+        filter_serializer.is_valid(raise_exception=True)
+
+        treatment_requests = get_requests(filter_serializer.validated_data)
+
+        paginator = TreatmentRequestApi.Pagination()
+        page = await paginator.apaginate_queryset(treatment_requests, request)
+        output_serializer = TreatmentRequestApi.OutputSerializer(page, many=True)
+        return self.render(output_serializer.data, headers=paginator.get_headers())
+
+    async def post(self, request):
+        serializer = TreatmentRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        treatment_request = await acreate_request(serializer.validated_data)
+
+        output_serializer = TreatmentRequestApi.OutputSerializer(treatment_request)
+        return self.render(output_serializer.data, status.HTTP_201_CREATED)
+
+
+class AsyncRequestAcceptApi(AsyncApiView):
+    async def patch(self, request, id):
+        treatment_request = await aaccept_request(id)
+
+        output_serializer = RequestAcceptApi.OutputSerializer(treatment_request)
+        return self.render(output_serializer.data)
+
+
+class AsyncTreatmentRequestStreamApi(AsyncApiView):
+    """
+    의사의 새 진료 요청과 상태가 바뀐 진료 요청을 Server-Sent Events 로 전달
+
+    스트림에 연결한 뒤 목록을 한 번 조회하고, 이후에는 이벤트로 바뀐 요청만 반영합니다.
+    다시 연결할 때는 마지막으로 받은 이벤트 id 를 Last-Event-ID 헤더(브라우저
+    EventSource 가 자동으로 보냅니다) 또는 last_event_id 파라미터로 보냅니다.
+    이어 받을 수 없으면(다른 워커나 다시 시작하기 전 프로세스의 id 포함) reset 이벤트를
+    보내고 끊으므로 목록을 다시 조회해야 합니다.
+    """
+
+    HEARTBEAT_SECONDS = 15
+    RETRY_MILLISECONDS = 3000
+
+    class FilterSerializer(serializers.Serializer):
+        doctor_id = serializers.IntegerField()
+        last_event_id = serializers.CharField(required=False)
+
+    async def get(self, request):
+        # WSGI 서버는 끝나지 않는 비동기 스트림을 끝까지 모은 뒤 보내려 하므로 막습니다.
+        if not isinstance(request._request, ASGIRequest):
+            raise NotImplementedOnServer(
+                {"detail": "ASGI 서버에서만 사용할 수 있습니다."}
+            )
+        params = request.query_params.dict()
+        last_event_id = request.headers.get("Last-Event-ID")
+        if last_event_id:
+            params.setdefault("last_event_id", last_event_id)
+        filter_serializer = self.FilterSerializer(data=params)
+        filter_serializer.is_valid(raise_exception=True)
+        doctor_id = filter_serializer.validated_data["doctor_id"]
+        if not await Doctor.objects.filter(id=doctor_id).aexists():
+            raise NotFound({"detail": "존재하지 않는 의사입니다."})
+
+        subscription = request_events.subscribe(
+            doctor_id, filter_serializer.validated_data.get("last_event_id")
+        )
+        return StreamingHttpResponse(
+            self.stream(subscription),
+            content_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def stream(self, subscription):
+        try:
+            yield f"retry: {self.RETRY_MILLISECONDS}\n\n".encode()
+            while True:
+                if not subscription.complete:
+                    yield b"event: reset\ndata: {}\n\n"
+                    return
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), self.HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # 프록시가 유휴 연결을 끊지 않도록 주석 줄을 보냅니다.
+                    yield b": keep-alive\n\n"
+                    continue
+                yield b"id: %s\nevent: request\ndata: %s\n\n" % (
+                    event.id.encode(),
+                    event.data,
+                )
+        finally:
+            request_events.unsubscribe(subscription)
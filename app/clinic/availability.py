@@ -0,0 +1,104 @@
+"""
+의사별 주간 진료 가능 시간 비트맵
+
+한 주(월요일 00:00 ~ 일요일 24:00)를 SLOT_MINUTES 단위 슬롯으로 나누고,
+진료 가능한 슬롯의 비트를 켠 정수 하나로 의사의 주간 일정을 표현합니다.
+슬롯은 해당 구간 전체가 진료 시간(점심시간 제외)에 포함될 때만 켜집니다.
+
+영업시간은 SLOT_MINUTES 단위로만 입력받습니다(schedule.validate_business_hours).
+예약(is_business_time)은 세션이 끝나는 시각도 진료 시간으로 보므로, 검색도
+slots_at 으로 그 시각에 끝나는 슬롯까지 확인해 두 규칙을 맞춥니다.
+
+DB에는 비트맵을 SLOTS_PER_BLOCK 개 슬롯(4시간) 단위 블록으로 잘라,
+켜진 비트가 있는 블록만 (블록 번호, 64비트 정수 마스크) 행으로 저장합니다.
+"""
+
+SLOT_MINUTES = 5
+MINUTES_PER_DAY = 24 * 60
+SLOTS_PER_DAY = MINUTES_PER_DAY // SLOT_MINUTES
+SLOTS_PER_WEEK = SLOTS_PER_DAY * 7
+SLOTS_PER_BLOCK = 48
+
+
+def _minutes(time):
+    return time.hour * 60 + time.minute
+
+
+def to_slot(day, time):
+    """
+    요일과 시각을 주간 슬롯 번호로 변환
+    """
+    return day * SLOTS_PER_DAY + _minutes(time) // SLOT_MINUTES
+
+
+def datetime_to_slot(value):
+    return to_slot(value.weekday(), value.time())
+
+
+def is_on_grid(value):
+    """
+    value 시각이 슬롯 경계(SLOT_MINUTES 단위, 초 이하 0)인지 여부
+    """
+    return (
+        value.minute % SLOT_MINUTES == 0 and not value.second and not value.microsecond
+    )
+
+
+def slots_at(value):
+    """
+    value 시각에 진료 가능한지 판단할 때 확인할 주간 슬롯 번호
+
+    value 가 슬롯 경계이면 바로 앞 슬롯(value 에 끝나는 세션의 마지막 슬롯)도
+    포함합니다. 같은 날의 슬롯만 보므로 자정에 앞 요일로 넘어가지 않습니다.
+    """
+    slot = datetime_to_slot(value)
+    if is_on_grid(value) and slot % SLOTS_PER_DAY:
+        return [slot, slot - 1]
+    return [slot]
+
+
+def session_bitmap(day, start, end):
+    """
+    [start, end) 구간에 완전히 포함되는 슬롯의 비트맵
+    """
+    if start is None or end is None:
+        return 0
+    first = -(-_minutes(start) // SLOT_MINUTES)
+    last = _minutes(end) // SLOT_MINUTES
+    if last <= first:
+        return 0
+    offset = day * SLOTS_PER_DAY
+    return ((1 << (last - first)) - 1) << (offset + first)
+
+
+def weekly_bitmap(hours):
+    """
+    BusinessHour 목록으로부터 주간 비트맵 생성
+    """
+    bitmap = 0
+    for hour in hours:
+        bitmap |= session_bitmap(hour.day, *hour.first_session)
+        if hour.has_lunch_time:
+            bitmap |= session_bitmap(hour.day, *hour.second_session)
+    return bitmap
+
+
+def iter_blocks(bitmap):
+    """
+    비트맵을 (블록 번호, 마스크)로 나누어 반환 (마스크가 0인 블록은 제외)
+    """
+    block_mask = (1 << SLOTS_PER_BLOCK) - 1
+    block = 0
+    while bitmap:
+        mask = bitmap & block_mask
+        if mask:
+            yield block, mask
+        bitmap >>= SLOTS_PER_BLOCK
+        block += 1
+
+
+def slot_block(slot):
+    """
+    슬롯 번호의 (블록 번호, 블록 내 비트)
+    """
+    return slot // SLOTS_PER_BLOCK, 1 << (slot % SLOTS_PER_BLOCK)
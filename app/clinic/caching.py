@@ -0,0 +1,81 @@
+"""
+의사 검색 응답 캐시
+
+의사 검색 결과는 요일과 시각(주간 일정), 검색어에만 의존하므로
+(정렬된 검색어, 요일, 15분 단위 시각) 조합을 키로 렌더링된 응답 본문을 저장합니다.
+의사 관련 데이터가 바뀌면 전역 데이터 버전을 올려 이전 캐시를 모두 무효화합니다.
+"""
+
+import hashlib
+import time
+
+from clinic.models import DoctorSearchDocument
+from clinic.search import normalize
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+
+DATA_VERSION_KEY = "clinic:doctor-data-version"
+TIME_BUCKET_MINUTES = 15
+
+
+def get_data_version():
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        version = _initial_version()
+        if not cache.add(DATA_VERSION_KEY, version, None):
+            version = cache.get(DATA_VERSION_KEY, version)
+    return version
+
+
+def bump_data_version():
+    try:
+        cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        # 버전이 캐시에서 사라졌다면 이전에 쓰인 적 없는 값부터 다시 시작합니다.
+        cache.set(DATA_VERSION_KEY, _initial_version(), None)
+
+
+def _initial_version():
+    return int(time.time() * 1000)
+
+
+def doctor_search_cache_key(filters, request):
+    """
+    캐시할 수 있는 검색이면 캐시 키를, 아니면 None 을 반환
+    """
+    keywords = sorted({normalize(keyword) for keyword in filters["search"].split()})
+    time_filter = filters.get("time")
+    bucket = ""
+    if time_filter is not None:
+        if (
+            time_filter.minute % TIME_BUCKET_MINUTES
+            or time_filter.second
+            or time_filter.microsecond
+        ):
+            return None
+        bucket = f"{time_filter.weekday()}:{time_filter.hour}:{time_filter.minute}"
+
+    # 다음 페이지 Link 헤더는 절대 주소이므로 호스트와 경로도 키에 포함합니다.
+    # 복제본에서 읽은 응답을 primary 에서 읽어야 하는 클라이언트에게 주지 않도록
+    # 조회할 DB 도 키에 포함합니다.
+    parts = [
+        router.db_for_read(DoctorSearchDocument),
+        request.get_host(),
+        request.path,
+        " ".join(keywords),
+        bucket,
+        request.query_params.get("cursor", ""),
+        request.query_params.get("limit", ""),
+    ]
+    digest = hashlib.md5("\x00".join(parts).encode()).hexdigest()
+    return f"clinic:doctor-search:{get_data_version()}:{digest}"
+
+
+def get_cached_response(key):
+    return cache.get(key)
+
+
+def set_cached_response(key, content, headers):
+    timeout = getattr(settings, "DOCTOR_SEARCH_CACHE_TIMEOUT", 300)
+    cache.set(key, (content, headers), timeout)
@@ -0,0 +1,137 @@
+"""
+진료 요청 이벤트의 프로세스 내 pub/sub
+
+서비스가 진료 요청을 만들거나 상태를 바꾸면 커밋된 뒤 의사별로 이벤트를 발행하고,
+ASGI 스트림(SSE) 뷰가 구독한 의사의 이벤트만 받아 클라이언트로 보냅니다.
+
+이벤트 id 는 "<epoch>-<순번>" 형식입니다. epoch 는 브로커(프로세스)마다 새로 만들고
+순번은 그 안에서 단조 증가하며, 최근 EVENT_HISTORY 개를 보관하므로 다시 연결한
+클라이언트는 마지막으로 받은 id 다음부터 이어서 받습니다. epoch 가 다르거나
+(다른 워커 또는 다시 시작한 프로세스의 id) 보관된 범위를 벗어난 id 는 이어 받을 수
+없으므로 클라이언트가 목록을 다시 조회해야 합니다.
+
+이벤트는 발행한 프로세스의 구독자에게만 전달됩니다. 워커가 하나인 배포에서만 스트림이
+빠짐없이 이어지고, 워커가 여럿이면 다른 워커에서 발행된 이벤트는 받지 못합니다.
+"""
+
+import asyncio
+import secrets
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+EVENT_HISTORY = 10000
+SUBSCRIPTION_QUEUE_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class Event:
+    id: str
+    seq: int
+    doctor_id: int
+    # 렌더링된 JSON (구독자마다 다시 직렬화하지 않습니다)
+    data: bytes
+
+
+class Subscription:
+    """
+    한 의사의 이벤트를 받는 구독 (구독한 이벤트 루프에서만 읽습니다)
+
+    complete 가 False 이면 요청한 id 다음부터 이어 받을 수 없거나, 이벤트를 제때 읽지 못해
+    큐가 넘친 것이므로 클라이언트가 목록을 다시 조회해야 합니다.
+    """
+
+    def __init__(self, doctor_id, loop):
+        self.doctor_id = doctor_id
+        self.loop = loop
+        self.queue = asyncio.Queue(SUBSCRIPTION_QUEUE_SIZE)
+        self.complete = True
+
+    def put(self, event):
+        # 발행하는 스레드와 구독한 이벤트 루프의 스레드가 다를 수 있습니다.
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫혔습니다.
+            pass
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.complete = False
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class EventBroker:
+    def __init__(self, history=EVENT_HISTORY):
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=history)
+        # 다른 프로세스(다른 워커, 다시 시작한 프로세스)의 id 와 구분합니다.
+        self.epoch = secrets.token_hex(4)
+        self._last_seq = 0
+        self._subscribers = {}
+
+    def _parse_id(self, event_id):
+        """
+        이 브로커가 발행한 이벤트 id 의 순번 (다른 epoch 이거나 형식이 틀리면 None)
+        """
+        epoch, _, seq = event_id.partition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publish(self, events):
+        """
+        (의사 id, 렌더링된 JSON) 목록을 순서대로 발행
+        """
+        published = []
+        with self._lock:
+            for doctor_id, data in events:
+                self._last_seq += 1
+                event = Event(
+                    f"{self.epoch}-{self._last_seq}", self._last_seq, doctor_id, data
+                )
+                self._events.append(event)
+                published.append(event)
+            subscribers = {
+                doctor_id: list(self._subscribers.get(doctor_id, ()))
+                for doctor_id in {event.doctor_id for event in published}
+            }
+        for event in published:
+            for subscription in subscribers[event.doctor_id]:
+                subscription.put(event)
+        return published
+
+    def subscribe(self, doctor_id, last_event_id=None):
+        """
+        의사의 이벤트 구독 (last_event_id 가 있으면 그 다음 이벤트부터 큐에 넣어 둡니다)
+        """
+        subscription = Subscription(doctor_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(doctor_id, set()).add(subscription)
+            if last_event_id is None:
+                return subscription
+            # 이 브로커가 발행한 id 중 보관된 첫 이벤트 바로 앞부터 현재까지만
+            # 이어 받을 수 있습니다.
+            last_seq = self._parse_id(last_event_id)
+            first_seq = self._events[0].seq if self._events else self._last_seq + 1
+            if last_seq is None or not first_seq - 1 <= last_seq <= self._last_seq:
+                subscription.complete = False
+                return subscription
+            for event in self._events:
+                if event.seq > last_seq and event.doctor_id == doctor_id:
+                    subscription._put(event)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.doctor_id, set())
+            subscribers.discard(subscription)
+            if not subscribers:
+                self._subscribers.pop(subscription.doctor_id, None)
+
+
+request_events = EventBroker()
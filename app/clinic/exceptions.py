@@ -0,0 +1,14 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class Conflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "이미 처리된 요청입니다."
+    default_code = "conflict"
+
+
+class NotImplementedOnServer(APIException):
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = "이 서버에서는 사용할 수 없는 API 입니다."
+    default_code = "not_implemented"
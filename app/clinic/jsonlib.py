@@ -0,0 +1,48 @@
+"""
+JSON 인코딩/디코딩
+
+orjson 이 설치되어 있으면 사용하고, 없으면 표준 json 모듈로 동작합니다.
+datetime/time 은 두 경우 모두 마이크로초 없이 %Y-%m-%dT%H:%M:%S, %H:%M:%S 로 씁니다.
+"""
+
+import json
+from datetime import datetime, time
+
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    if isinstance(obj, (datetime, time)):
+        return obj.isoformat(timespec="seconds")
+    # Decimal, lazy 번역 문자열, QuerySet 등은 DRF 인코더에 맡깁니다.
+    return _encoder.default(obj)
+
+
+if orjson is not None:
+    OPTIONS = orjson.OPT_OMIT_MICROSECONDS | orjson.OPT_NON_STR_KEYS
+
+    def dumps(data, indent=None):
+        options = OPTIONS | orjson.OPT_INDENT_2 if indent else OPTIONS
+        return orjson.dumps(data, default=_default, option=options)
+
+    loads = orjson.loads
+
+else:  # pragma: no cover
+
+    def dumps(data, indent=None):
+        return json.dumps(
+            data,
+            default=_default,
+            ensure_ascii=False,
+            indent=indent,
+            separators=(",", ":") if indent is None else None,
+        ).encode()
+
+    loads = json.loads
@@ -0,0 +1,37 @@
+import time
+from datetime import datetime, timedelta
+
+from clinic.services import ARCHIVE_CHUNK_SIZE, archive_requests
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "희망 시각이 older-than 일보다 오래된 끝난 진료 요청(수락/거절/만료)을 "
+        "월 단위 보관 테이블로 옮깁니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            required=True,
+            help="희망 시각이 이 일수보다 오래된 요청을 옮깁니다.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if options["older_than"] < 0:
+            raise CommandError("--older-than 은 0 이상이어야 합니다.")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size 는 1 이상이어야 합니다.")
+        before = datetime.now() - timedelta(days=options["older_than"])
+
+        started = time.perf_counter()
+        archived = archive_requests(before, chunk_size=options["chunk_size"])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"archived={archived} before {before:%Y-%m-%d %H:%M} "
+            f"in {elapsed:.2f}s ({archived / elapsed if elapsed else 0:.0f} rows/s)"
+        )
@@ -1,77 +1,359 @@
-from datetime import datetime, time, timedelta
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from datetime import time as dt_time
+from datetime import timedelta
 
-from clinic.enums import Days
+from clinic.enums import RequestStatus
 from clinic.models import (
     BusinessHour,
     Department,
     Doctor,
+    DoctorDepartment,
+    DoctorTreatment,
     Hospital,
     Patient,
     TreatmentRequest,
     UninsuredTreatment,
 )
+from clinic.schedule import get_slot_start
+from clinic.signals import doctors_created
 from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나"
+GIVEN_NAME_SYLLABLES = (
+    "민서준하지윤도현수아우진예은시연유재원동혜영성호경태훈희정소채다인주승"
+)
+HOSPITAL_PREFIXES = [
+    "메라키",
+    "서울",
+    "연세",
+    "하나",
+    "밝은",
+    "새봄",
+    "푸른",
+    "튼튼",
+    "바른",
+    "행복",
+    "우리",
+    "365",
+]
+HOSPITAL_SUFFIXES = ["병원", "의원", "내과의원", "정형외과", "한의원", "메디컬센터"]
+DEPARTMENT_NAMES = [
+    "내과",
+    "외과",
+    "정형외과",
+    "신경외과",
+    "소아청소년과",
+    "산부인과",
+    "피부과",
+    "안과",
+    "이비인후과",
+    "비뇨의학과",
+    "재활의학과",
+    "가정의학과",
+    "일반의",
+    "한의사",
+    "치과",
+    "정신건강의학과",
+]
+# 흔한 진료과일수록 가중치가 큽니다.
+DEPARTMENT_WEIGHTS = [20, 6, 14, 3, 8, 4, 8, 5, 8, 3, 4, 10, 12, 6, 6, 3]
+TREATMENT_NAMES = [
+    "다이어트약",
+    "도수치료",
+    "체외충격파",
+    "보톡스",
+    "필러",
+    "레이저토닝",
+    "탈모치료",
+    "영양주사",
+    "라식",
+    "라섹",
+    "임플란트",
+    "치아교정",
+    "추나요법",
+    "예방접종",
+    "건강검진",
+]
+
+# 주간 일정 템플릿: 요일별 (진료 시작, 점심 시작, 점심 끝, 진료 끝)
+WEEKDAY = (dt_time(9, 0), dt_time(12, 30), dt_time(13, 30), dt_time(18, 0))
+WEEKDAY_LATE = (dt_time(10, 0), dt_time(13, 0), dt_time(14, 0), dt_time(20, 0))
+HALF_DAY = (dt_time(9, 0), None, None, dt_time(13, 0))
+WEEKEND = (dt_time(10, 0), dt_time(13, 0), dt_time(14, 0), dt_time(17, 0))
+SCHEDULE_TEMPLATES = [
+    {0: WEEKDAY, 1: WEEKDAY, 2: WEEKDAY, 3: WEEKDAY, 4: WEEKDAY},
+    {0: WEEKDAY, 1: WEEKDAY, 2: WEEKDAY, 3: WEEKDAY, 4: WEEKDAY, 5: HALF_DAY},
+    {0: WEEKDAY, 1: WEEKDAY, 2: HALF_DAY, 3: WEEKDAY, 4: WEEKDAY, 5: HALF_DAY},
+    {0: WEEKDAY_LATE, 1: WEEKDAY, 2: WEEKDAY_LATE, 3: WEEKDAY, 4: WEEKDAY_LATE},
+    {5: WEEKEND, 6: WEEKEND},
+]
+REQUEST_STATUSES = [
+    RequestStatus.PENDING,
+    RequestStatus.ACCEPTED,
+    RequestStatus.REFUSED,
+    RequestStatus.EXPIRED,
+]
+REQUEST_STATUS_WEIGHTS = [60, 25, 5, 10]
+SLOT_MINUTES = 15
+REQUEST_DAYS = 28
+WORKER_LOCK_TIMEOUT = 600
+INSERT_BATCH_SIZE = 500
+
+
+def person_name(rng):
+    return rng.choice(SURNAMES) + "".join(rng.choices(GIVEN_NAME_SYLLABLES, k=2))
+
+
+def business_slots(template):
+    """
+    템플릿의 진료 가능 시각을 (요일, 시작 후 분) 목록으로 반환
+    """
+    slots = []
+    for day, (opening, lunch_start, lunch_end, closing) in template.items():
+        sessions = [(opening, lunch_start or closing)]
+        if lunch_start:
+            sessions.append((lunch_end, closing))
+        for start, end in sessions:
+            minutes = start.hour * 60 + start.minute
+            end_minutes = end.hour * 60 + end.minute
+            slots += [(day, m) for m in range(minutes, end_minutes, SLOT_MINUTES)]
+    return slots
+
+
+def chunked(total, chunk_size):
+    for start in range(0, total, chunk_size):
+        yield start, min(start + chunk_size, total)
+
+
+def create_requests(args):
+    start, end, seed, doctors, patient_ids, chunk_size = args
+    rng = random.Random(seed * 1_000_003 + start)
+    slots_by_template = [business_slots(template) for template in SCHEDULE_TEMPLATES]
+    today = datetime.now().date()
+    monday = today - timedelta(days=today.weekday())
+
+    # 워커마다 다른 의사를 맡으므로 수락된 슬롯은 워커 안에서만 겹치지 않게 하면 됩니다.
+    occupied = set()
+
+    for chunk_start, chunk_end in chunked(end - start, chunk_size):
+        treatment_requests = []
+        for _ in range(chunk_end - chunk_start):
+            doctor_id, template = rng.choice(doctors)
+            day, minutes = rng.choice(slots_by_template[template])
+            week = rng.randrange(REQUEST_DAYS // 7)
+            desired_datetime = datetime.combine(
+                monday + timedelta(days=week * 7 + day), dt_time()
+            ) + timedelta(minutes=minutes)
+            status = rng.choices(REQUEST_STATUSES, REQUEST_STATUS_WEIGHTS)[0]
+            slot_start = None
+            if status == RequestStatus.ACCEPTED:
+                slot_start = get_slot_start(desired_datetime, SLOT_MINUTES)
+                if (doctor_id, slot_start) in occupied:
+                    # 이미 수락된 슬롯이면 대기중인 요청으로 남깁니다.
+                    status, slot_start = RequestStatus.PENDING, None
+                else:
+                    occupied.add((doctor_id, slot_start))
+            treatment_requests.append(
+                TreatmentRequest(
+                    doctor_id=doctor_id,
+                    patient_id=rng.choice(patient_ids),
+                    desired_datetime=desired_datetime,
+                    status=status,
+                    slot_start=slot_start,
+                )
+            )
+        # 짧은 트랜잭션으로 나누어 다른 워커가 SQL을 만드는 동안 쓰기 잠금을 넘겨줍니다.
+        for i in range(0, len(treatment_requests), INSERT_BATCH_SIZE):
+            TreatmentRequest.objects.bulk_create(
+                treatment_requests[i : i + INSERT_BATCH_SIZE]
+            )
+    return end - start
+
+
+def create_requests_in_worker(args):
+    # fork로 물려받은 연결은 부모 프로세스와 공유되므로 새로 연결합니다.
+    connections.close_all()
+    connection = connections["default"]
+    if connection.vendor == "sqlite":
+        # SQLite는 쓰기가 한 번에 하나씩만 가능하므로 다른 워커의 쓰기를 기다립니다.
+        connection.settings_dict["OPTIONS"]["timeout"] = WORKER_LOCK_TIMEOUT
+    try:
+        return create_requests(args)
+    finally:
+        connections.close_all()
 
 
 class Command(BaseCommand):
+    help = "테스트용 병원, 의사, 환자, 진료 요청 데이터를 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hospitals", type=int, default=1)
+        parser.add_argument("--doctors", type=int, default=2)
+        parser.add_argument("--patients", type=int, default=3)
+        parser.add_argument("--requests", type=int, default=6)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="진료 요청을 나누어 생성할 프로세스 수 (fork 를 지원하는 플랫폼만)",
+        )
+
     def handle(self, *args, **options):
-        def get_next_weekday(weekday, date):
-            day_diff = weekday - date.weekday()
-            if day_diff < 0:
-                day_diff = day_diff + 7
-            next_weekday = date + timedelta(days=day_diff)
-            return next_weekday
-
-        hospital = Hospital.objects.create(name="메라키병원")
-        patients = [
-            Patient.objects.create(name="김환자"),
-            Patient.objects.create(name="이환자"),
-            Patient.objects.create(name="박환자"),
-        ]
-        doctor = Doctor.objects.create(name="손웅래", hospital=hospital)
-        doctor2 = Doctor.objects.create(name="선재원", hospital=hospital)
-        department_names = ["정형외과", "내과", "일반의", "한의사"]
-        departments = [
-            Department.objects.create(name=name) for name in department_names
-        ]
-        treatment = UninsuredTreatment.objects.create(name="다이어트약")
-        doctor.departments.add(*departments[:3])
-        doctor2.departments.add(*departments[2:])
-        doctor2.treatments.add(treatment)
+        self.rng = random.Random(options["seed"])
+        self.chunk_size = options["chunk_size"]
+
+        departments = self.create_named(Department, DEPARTMENT_NAMES)
+        treatments = self.create_named(UninsuredTreatment, TREATMENT_NAMES)
+        hospital_ids = self.timed("hospitals", self.create_hospitals, options)
+        doctors = self.timed(
+            "doctors",
+            self.create_doctors,
+            options,
+            hospital_ids,
+            departments,
+            treatments,
+        )
+        patient_ids = self.timed("patients", self.create_patients, options)
+        self.timed("requests", self.create_requests, options, doctors, patient_ids)
 
-        desired_datetime = datetime.combine(
-            get_next_weekday(Days.monday.value, datetime.now()), time(10, 0)
+    def timed(self, label, func, *args):
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        rows = len(result) if isinstance(result, list) else result
+        self.stdout.write(
+            f"{label}: {rows} rows in {elapsed:.2f}s "
+            f"({rows / elapsed if elapsed else 0:.0f} rows/s)"
         )
-        requests = []
-        for patient in patients:
-            requests.append(
-                TreatmentRequest.objects.create(
-                    doctor=doctor, patient=patient, desired_datetime=desired_datetime
+        return result
+
+    def create_named(self, model, names):
+        model.objects.bulk_create(
+            [model(name=name) for name in names], ignore_conflicts=True
+        )
+        return dict(model.objects.filter(name__in=names).values_list("name", "id"))
+
+    def create_hospitals(self, options):
+        hospitals = Hospital.objects.bulk_create(
+            [
+                Hospital(
+                    name=self.rng.choice(HOSPITAL_PREFIXES)
+                    + self.rng.choice(HOSPITAL_SUFFIXES)
                 )
-            )
-            requests.append(
-                TreatmentRequest.objects.create(
-                    doctor=doctor2, patient=patient, desired_datetime=desired_datetime
+                for _ in range(options["hospitals"])
+            ],
+            batch_size=self.chunk_size,
+        )
+        return [hospital.id for hospital in hospitals]
+
+    def create_doctors(self, options, hospital_ids, departments, treatments):
+        """
+        의사와 중간 테이블, 영업시간을 청크 단위로 생성 (반환: (의사 id, 템플릿) 목록)
+        """
+        doctors = []
+        department_ids = [departments[name] for name in DEPARTMENT_NAMES]
+        treatment_ids = list(treatments.values())
+        for start, end in chunked(options["doctors"], self.chunk_size):
+            with transaction.atomic():
+                doctor_objs = Doctor.objects.bulk_create(
+                    [
+                        Doctor(
+                            name=person_name(self.rng),
+                            hospital_id=self.rng.choice(hospital_ids or [None]),
+                        )
+                        for _ in range(end - start)
+                    ]
                 )
-            )
+                doctor_departments = []
+                doctor_treatments = []
+                business_hours = []
+                for doctor in doctor_objs:
+                    chosen = set(
+                        self.rng.choices(
+                            department_ids,
+                            DEPARTMENT_WEIGHTS,
+                            k=self.rng.randint(1, 3),
+                        )
+                    )
+                    doctor_departments += [
+                        DoctorDepartment(doctor=doctor, department_id=department_id)
+                        for department_id in chosen
+                    ]
+                    doctor_treatments += [
+                        DoctorTreatment(doctor=doctor, treatment_id=treatment_id)
+                        for treatment_id in self.rng.sample(
+                            treatment_ids, self.rng.randint(0, 3)
+                        )
+                    ]
+                    template = self.rng.randrange(len(SCHEDULE_TEMPLATES))
+                    business_hours += [
+                        BusinessHour(
+                            doctor=doctor,
+                            day=day,
+                            opening_time=opening,
+                            lunch_start_time=lunch_start,
+                            lunch_end_time=lunch_end,
+                            closing_time=closing,
+                        )
+                        for day, (
+                            opening,
+                            lunch_start,
+                            lunch_end,
+                            closing,
+                        ) in SCHEDULE_TEMPLATES[template].items()
+                    ]
+                    doctors.append((doctor.id, template))
 
-        opening_time = time(9, 0)
-        closing_time = time(19, 0)
-        # 평일만 넣기
-        for day in Days.values()[:5]:
-            BusinessHour.objects.create(
-                doctor=doctor,
-                day=day,
-                opening_time=opening_time,
-                closing_time=closing_time,
-            )
-        opening_time = time(9, 0)
-        closing_time = time(19, 0)
-        # 주말만 넣기
-        for day in Days.values()[5:]:
-            BusinessHour.objects.create(
-                doctor=doctor2,
-                day=day,
-                opening_time=opening_time,
-                closing_time=closing_time,
+                DoctorDepartment.objects.bulk_create(doctor_departments)
+                DoctorTreatment.objects.bulk_create(doctor_treatments)
+                BusinessHour.objects.bulk_create(business_hours, notify=False)
+                # bulk_create는 model 시그널을 보내지 않으므로 청크마다 한 번 알려
+                # 진료 가능 블록과 검색 색인을 한 번에 만듭니다.
+                doctors_created.send(
+                    sender=Doctor, doctor_ids={doctor.id for doctor in doctor_objs}
+                )
+        return doctors
+
+    def create_patients(self, options):
+        patients = Patient.objects.bulk_create(
+            [Patient(name=person_name(self.rng)) for _ in range(options["patients"])],
+            batch_size=self.chunk_size,
+        )
+        return [patient.id for patient in patients]
+
+    def create_requests(self, options, doctors, patient_ids):
+        total = options["requests"]
+        if not total or not doctors or not patient_ids:
+            return 0
+        workers = min(max(options["workers"], 1), len(doctors))
+        per_worker = -(-total // workers)
+        ranges = list(chunked(total, per_worker))
+        # 같은 슬롯을 두 워커가 수락하지 않도록 워커마다 서로 다른 의사를 나눠 줍니다.
+        jobs = [
+            (
+                start,
+                end,
+                options["seed"],
+                doctors[i :: len(ranges)],
+                patient_ids,
+                self.chunk_size,
             )
+            for i, (start, end) in enumerate(ranges)
+        ]
+        # 워커는 fork 로 부모의 Django 설정과 DB 설정(테스트 DB 등)을 그대로 물려받습니다.
+        # fork 를 쓸 수 없는 플랫폼(Windows)에서는 한 프로세스에서 만듭니다.
+        if workers == 1 or "fork" not in multiprocessing.get_all_start_methods():
+            return sum(create_requests(job) for job in jobs)
+
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            return sum(executor.map(create_requests_in_worker, jobs))
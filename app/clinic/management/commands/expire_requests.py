@@ -0,0 +1,32 @@
+import time
+
+from clinic.services import EXPIRE_CHUNK_SIZE, expire_requests
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "대기중인 진료 요청의 만료 시각을 계산하고 만료된 요청의 상태를 변경합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=EXPIRE_CHUNK_SIZE)
+        parser.add_argument(
+            "--loop", action="store_true", help="interval 마다 반복 실행합니다."
+        )
+        parser.add_argument("--interval", type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            result = expire_requests(chunk_size=options["chunk_size"])
+            elapsed = time.perf_counter() - started
+
+            rows = sum(result.values())
+            self.stdout.write(
+                "refused={refused} computed={computed} expired={expired} ".format(
+                    **result
+                )
+                + f"in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)"
+            )
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,278 @@
+import csv
+import json
+import os
+import time
+from datetime import time as dt_time
+from itertools import islice
+
+from clinic.enums import Days
+from clinic.models import (
+    BusinessHour,
+    Department,
+    Doctor,
+    DoctorDepartment,
+    DoctorTreatment,
+    Hospital,
+    ImportProgress,
+    UninsuredTreatment,
+)
+from clinic.schedule import DEFAULT_SLOT_MINUTES, validate_business_hours
+from clinic.signals import doctors_created
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_SLOT_MINUTES = 24 * 60
+# 진료과, 비급여진료과목 목록과 오전/오후 진료 구간의 구분자
+LIST_SEPARATOR = "|"
+SESSION_SEPARATOR = ","
+# 요일별 영업시간 컬럼 (예: mon="09:00-12:30,13:30-18:00")
+DAY_COLUMNS = {day.name[:3]: day.value for day in Days}
+
+
+def read_records(path, file_format):
+    """
+    파일의 레코드를 하나씩 반환 (CSV 는 행 dict, JSONL 은 해석하기 전의 줄)
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if file_format == "csv":
+            yield from csv.DictReader(file)
+            return
+        for line in file:
+            if line.strip():
+                yield line
+
+
+def chunks(records, chunk_size):
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def parse_names(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(LIST_SEPARATOR)
+    return list(dict.fromkeys(name.strip() for name in value if name.strip()))
+
+
+def parse_time(value):
+    hour, minute = value.strip().split(":")
+    return dt_time(int(hour), int(minute))
+
+
+def parse_hours(day, value):
+    """
+    "09:00-18:00" 또는 점심시간이 있는 "09:00-12:30,13:30-18:00" 형식의 영업시간
+    """
+    sessions = [
+        [parse_time(part) for part in session.split("-")]
+        for session in value.split(SESSION_SEPARATOR)
+    ]
+    if len(sessions) > 2 or any(len(session) != 2 for session in sessions):
+        raise ValueError(f"영업시간 형식이 올바르지 않습니다: {value}")
+    opening_time, closing_time = sessions[0][0], sessions[-1][1]
+    lunch_start_time = lunch_end_time = None
+    if len(sessions) == 2:
+        lunch_start_time, lunch_end_time = sessions[0][1], sessions[1][0]
+    try:
+        validate_business_hours(
+            opening_time, closing_time, lunch_start_time, lunch_end_time
+        )
+    except ValueError as e:
+        raise ValueError(f"{e} ({value})")
+    return BusinessHour(
+        day=day,
+        opening_time=opening_time,
+        lunch_start_time=lunch_start_time,
+        lunch_end_time=lunch_end_time,
+        closing_time=closing_time,
+    )
+
+
+def parse_record(record):
+    if isinstance(record, str):
+        record = json.loads(record)
+    name = (record.get("name") or "").strip()
+    if not name:
+        raise ValueError("의사 이름이 없습니다.")
+    slot_minutes = int(record.get("slot_minutes") or DEFAULT_SLOT_MINUTES)
+    if not 1 <= slot_minutes <= MAX_SLOT_MINUTES:
+        raise ValueError(f"slot_minutes 는 1~{MAX_SLOT_MINUTES} 사이여야 합니다.")
+    return {
+        "name": name,
+        "hospital": (record.get("hospital") or "").strip() or None,
+        "slot_minutes": slot_minutes,
+        "departments": parse_names(record.get("departments")),
+        "treatments": parse_names(record.get("treatments")),
+        "hours": [
+            parse_hours(day, record[column])
+            for column, day in DAY_COLUMNS.items()
+            if record.get(column)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "CSV/JSONL 파일에서 병원, 의사, 진료과, 비급여진료과목, 영업시간을 가져옵니다. "
+        "중간에 실패하면 다시 실행했을 때 마지막으로 저장된 청크 다음부터 이어서 가져옵니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="파일 형식 (기본: 확장자로 판단)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+        parser.add_argument(
+            "--source",
+            help="진행 상황을 기록할 이름 (기본: 파일의 절대 경로)",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="이전 진행 상황을 무시하고 처음부터 가져옵니다.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or (
+            "csv" if path.lower().endswith(".csv") else "jsonl"
+        )
+        source = options["source"] or os.path.abspath(path)
+
+        progress, _ = ImportProgress.objects.get_or_create(source=source)
+        if options["restart"]:
+            progress.records = 0
+            progress.completed = False
+            progress.save()
+        if progress.completed:
+            self.stdout.write(
+                f"{source}: 이미 가져온 파일입니다. ({progress.records} rows)"
+            )
+            return
+        if progress.records:
+            self.stdout.write(
+                f"{source}: {progress.records}번째 레코드 다음부터 이어서 가져옵니다."
+            )
+
+        # 이름 -> id (커밋된 행만 기억합니다)
+        self.names = {Hospital: {}, Department: {}, UninsuredTreatment: {}}
+        started = time.perf_counter()
+        imported = 0
+        records = islice(read_records(path, file_format), progress.records, None)
+        for chunk in chunks(records, options["chunk_size"]):
+            created = self.import_chunk(progress, chunk)
+            for model, ids in created.items():
+                self.names[model].update(ids)
+            imported += len(chunk)
+            self.report(imported, progress.records, started)
+
+        progress.completed = True
+        progress.save()
+        self.report(imported, progress.records, started)
+
+    def report(self, imported, total, started):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"doctors: {imported} rows in {elapsed:.2f}s "
+            f"({imported / elapsed if elapsed else 0:.0f} rows/s, total {total})"
+        )
+
+    def import_chunk(self, progress, chunk):
+        """
+        레코드 청크 하나를 한 트랜잭션으로 저장 (반환: 새로 알게 된 이름 -> id)
+        """
+        doctors = []
+        for number, record in enumerate(chunk, progress.records + 1):
+            try:
+                doctors.append(parse_record(record))
+            except (AttributeError, KeyError, TypeError, ValueError) as e:
+                raise CommandError(f"{number}번째 레코드를 읽을 수 없습니다: {e}")
+
+        with transaction.atomic():
+            hospitals = self.resolve(
+                Hospital, {doctor["hospital"] for doctor in doctors} - {None}
+            )
+            departments = self.resolve(
+                Department,
+                {name for doctor in doctors for name in doctor["departments"]},
+            )
+            treatments = self.resolve(
+                UninsuredTreatment,
+                {name for doctor in doctors for name in doctor["treatments"]},
+            )
+
+            doctor_objs = Doctor.objects.bulk_create(
+                [
+                    Doctor(
+                        name=doctor["name"],
+                        hospital_id=hospitals.get(doctor["hospital"]),
+                        slot_minutes=doctor["slot_minutes"],
+                    )
+                    for doctor in doctors
+                ]
+            )
+            DoctorDepartment.objects.bulk_create(
+                [
+                    DoctorDepartment(doctor=doctor_obj, department_id=departments[name])
+                    for doctor_obj, doctor in zip(doctor_objs, doctors)
+                    for name in doctor["departments"]
+                ]
+            )
+            DoctorTreatment.objects.bulk_create(
+                [
+                    DoctorTreatment(doctor=doctor_obj, treatment_id=treatments[name])
+                    for doctor_obj, doctor in zip(doctor_objs, doctors)
+                    for name in doctor["treatments"]
+                ]
+            )
+            business_hours = []
+            for doctor_obj, doctor in zip(doctor_objs, doctors):
+                for hours in doctor["hours"]:
+                    hours.doctor = doctor_obj
+                    business_hours.append(hours)
+            # bulk_create는 model 시그널을 보내지 않으므로 청크마다 한 번 알려
+            # 진료 가능 블록과 검색 색인을 한 번에 만듭니다.
+            BusinessHour.objects.bulk_create(business_hours, notify=False)
+            doctors_created.send(
+                sender=Doctor, doctor_ids={doctor.id for doctor in doctor_objs}
+            )
+
+            progress.records += len(chunk)
+            progress.save()
+
+        return {
+            Hospital: hospitals,
+            Department: departments,
+            UninsuredTreatment: treatments,
+        }
+
+    def resolve(self, model, names):
+        """
+        이름 -> id (메모리에 없는 이름은 DB 에서 찾고, DB 에도 없으면 한 번에 생성)
+        """
+        known = self.names[model]
+        ids = {name: known[name] for name in names if name in known}
+        missing = names - ids.keys()
+        if missing:
+            # 이름이 같은 병원이 여러 개면 먼저 만들어진 병원을 씁니다.
+            for name, id in (
+                model.objects.filter(name__in=missing)
+                .order_by("-id")
+                .values_list("name", "id")
+            ):
+                ids[name] = id
+            missing -= ids.keys()
+        if missing:
+            created = model.objects.bulk_create(
+                [model(name=name) for name in sorted(missing)]
+            )
+            ids.update((obj.name, obj.id) for obj in created)
+        return ids
@@ -0,0 +1,39 @@
+import time
+
+from clinic.caching import bump_data_version
+from clinic.models import Doctor, DoctorSearchDocument
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+REBUILD_CHUNK_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "모든 의사의 검색 문서를 다시 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=REBUILD_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = 0
+        last_id = 0
+        while True:
+            doctor_ids = list(
+                Doctor.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[: options["chunk_size"]]
+            )
+            if not doctor_ids:
+                break
+            with transaction.atomic():
+                DoctorSearchDocument.objects.rebuild(doctor_ids)
+            rows += len(doctor_ids)
+            last_id = doctor_ids[-1]
+        bump_data_version()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"documents: {rows} rows in {elapsed:.2f}s "
+            f"({rows / elapsed if elapsed else 0:.0f} rows/s)"
+        )
@@ -0,0 +1,14 @@
+import time
+
+from clinic.replicas import sync_replicas
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "primary 데이터베이스를 읽기 전용 복제본으로 복사합니다."
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        replicas = sync_replicas()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"replicas: {', '.join(replicas) or '-'} in {elapsed:.2f}s")
@@ -0,0 +1,98 @@
+"""
+요청별 지표 수집 (Prometheus text format)
+
+RequestMetricsMiddleware 가 기록한 값을 URL 이름(view)과 HTTP 메서드로 묶어
+히스토그램으로 모아 두고, /metrics 에서 텍스트로 내보냅니다.
+"""
+
+import threading
+
+from clinic.schedule import schedule_cache
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    def __init__(self, name, description, buckets):
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self.series.setdefault(labels, [[0] * len(self.buckets), 0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self.series.clear()
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self.series.items()):
+                label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(
+                        f'{self.name}_bucket{{{label_text},le="{bound}"}} {bucket_count}'
+                    )
+                lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {count}')
+                lines.append(f"{self.name}_sum{{{label_text}}} {total}")
+                lines.append(f"{self.name}_count{{{label_text}}} {count}")
+        return lines
+
+
+request_duration = Histogram(
+    "clinic_request_duration_seconds", "요청 처리 시간", DURATION_BUCKETS
+)
+sql_duration = Histogram(
+    "clinic_request_sql_duration_seconds", "요청당 SQL 실행 시간", DURATION_BUCKETS
+)
+serialization_duration = Histogram(
+    "clinic_request_serialization_duration_seconds",
+    "요청당 응답 렌더링 시간",
+    DURATION_BUCKETS,
+)
+query_count = Histogram("clinic_request_queries", "요청당 쿼리 수", QUERY_BUCKETS)
+HISTOGRAMS = (request_duration, sql_duration, serialization_duration, query_count)
+
+
+def record(view_name, method, queries, sql_time, serialization_time, wall_time):
+    labels = (("view", view_name), ("method", method))
+    request_duration.observe(labels, wall_time)
+    sql_duration.observe(labels, sql_time)
+    serialization_duration.observe(labels, serialization_time)
+    query_count.observe(labels, queries)
+
+
+def clear():
+    for histogram in HISTOGRAMS:
+        histogram.clear()
+
+
+def render():
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines += histogram.render()
+
+    stats = schedule_cache.stats()
+    for name in ("hits", "misses"):
+        lines += [
+            f"# TYPE clinic_schedule_cache_{name}_total counter",
+            f"clinic_schedule_cache_{name}_total {stats[name]}",
+        ]
+    lines += [
+        "# TYPE clinic_schedule_cache_size gauge",
+        f"clinic_schedule_cache_size {stats['size']}",
+    ]
+    return "\n".join(lines) + "\n"
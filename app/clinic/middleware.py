@@ -0,0 +1,117 @@
+import time
+from contextlib import ExitStack
+
+from clinic import metrics
+from clinic.replicas import get_replicas, replica_reads
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    요청별 쿼리 수, SQL 시간, 응답 렌더링 시간, 전체 처리 시간을 기록
+
+    settings.REQUEST_METRICS_ENABLED 가 꺼져 있으면 미들웨어 체인에서 빠지므로
+    비용이 들지 않습니다. REQUEST_METRICS_HEADERS 를 켜면 응답 헤더로도 내보냅니다.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.expose_headers = getattr(settings, "REQUEST_METRICS_HEADERS", False)
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        recorder = QueryRecorder()
+        request._serialization_time = 0.0
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        wall_time = time.perf_counter() - started
+
+        resolver_match = getattr(request, "resolver_match", None)
+        view_name = resolver_match.view_name if resolver_match else "unresolved"
+        metrics.record(
+            view_name,
+            request.method,
+            recorder.queries,
+            recorder.sql_time,
+            request._serialization_time,
+            wall_time,
+        )
+        if self.expose_headers:
+            response["X-Query-Count"] = str(recorder.queries)
+            response["Server-Timing"] = ", ".join(
+                [
+                    f"sql;dur={recorder.sql_time * 1000:.2f}",
+                    f"render;dur={request._serialization_time * 1000:.2f}",
+                    f"total;dur={wall_time * 1000:.2f}",
+                ]
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF Response 는 이 훅이 끝난 뒤 렌더링되므로 렌더링 시간을 콜백으로 잽니다.
+        started = time.perf_counter()
+
+        def measure(rendered):
+            request._serialization_time += time.perf_counter() - started
+
+        response.add_post_render_callback(measure)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    읽기 요청의 조회를 복제본으로 보내고, 쓰기 요청을 보낸 클라이언트는
+    settings.READ_YOUR_WRITES_SECONDS 동안 primary 에서 읽게 함
+
+    쓰기 요청을 보낸 시각은 쿠키로 기억합니다. 복제본이 없으면 미들웨어 체인에서 빠집니다.
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+    COOKIE_NAME = "clinic_last_write"
+
+    def __init__(self, get_response):
+        if not get_replicas():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.window = getattr(settings, "READ_YOUR_WRITES_SECONDS", 5)
+
+    def __call__(self, request):
+        safe = request.method in self.SAFE_METHODS
+        with replica_reads(safe and not self.wrote_recently(request)):
+            response = self.get_response(request)
+        if not safe:
+            response.set_cookie(
+                self.COOKIE_NAME,
+                str(time.time()),
+                max_age=self.window,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def wrote_recently(self, request):
+        try:
+            last_write = float(request.COOKIES.get(self.COOKIE_NAME, ""))
+        except ValueError:
+            return False
+        return time.time() - last_write < self.window
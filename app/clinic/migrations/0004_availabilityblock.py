@@ -0,0 +1,89 @@
+# Generated by Django 5.0 on 2026-10-19 00:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+SLOTS_PER_BLOCK = 48
+
+
+def build_availability_blocks(apps, schema_editor):
+    BusinessHour = apps.get_model("clinic", "BusinessHour")
+    AvailabilityBlock = apps.get_model("clinic", "AvailabilityBlock")
+
+    def session_bitmap(day, start, end):
+        if start is None or end is None:
+            return 0
+        first = -(-(start.hour * 60 + start.minute) // SLOT_MINUTES)
+        last = (end.hour * 60 + end.minute) // SLOT_MINUTES
+        if last <= first:
+            return 0
+        return ((1 << (last - first)) - 1) << (day * SLOTS_PER_DAY + first)
+
+    bitmaps = {}
+    for hours in BusinessHour.objects.all():
+        if hours.lunch_start_time is not None:
+            sessions = [
+                (hours.opening_time, hours.lunch_start_time),
+                (hours.lunch_end_time, hours.closing_time),
+            ]
+        else:
+            sessions = [(hours.opening_time, hours.closing_time)]
+        bitmap = bitmaps.get(hours.doctor_id, 0)
+        for start, end in sessions:
+            bitmap |= session_bitmap(hours.day, start, end)
+        bitmaps[hours.doctor_id] = bitmap
+
+    blocks = []
+    block_mask = (1 << SLOTS_PER_BLOCK) - 1
+    for doctor_id, bitmap in bitmaps.items():
+        block = 0
+        while bitmap:
+            if bitmap & block_mask:
+                blocks.append(
+                    AvailabilityBlock(
+                        doctor_id=doctor_id, block=block, mask=bitmap & block_mask
+                    )
+                )
+            bitmap >>= SLOTS_PER_BLOCK
+            block += 1
+    AvailabilityBlock.objects.bulk_create(blocks, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0003_rename_businesshours_businesshour"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AvailabilityBlock",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("block", models.PositiveSmallIntegerField()),
+                ("mask", models.BigIntegerField()),
+                (
+                    "doctor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="availability_blocks",
+                        to="clinic.doctor",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("block", "doctor")},
+            },
+        ),
+        migrations.RunPython(build_availability_blocks, migrations.RunPython.noop),
+    ]
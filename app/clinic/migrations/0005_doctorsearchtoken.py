@@ -0,0 +1,86 @@
+# Generated by Django 5.0 on 2026-10-19 00:20
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# 이 마이그레이션 시점의 clinic.search 토크나이저 (이후 바뀌어도 결과가 같도록 복사해 둡니다)
+NGRAM_SIZE = 2
+
+
+def tokenize(texts):
+    tokens = set()
+    for text in texts:
+        for word in (text or "").lower().split():
+            tokens |= {
+                word[i : i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1)
+            }
+    return tokens
+
+
+def build_search_tokens(apps, schema_editor):
+    Doctor = apps.get_model("clinic", "Doctor")
+    DoctorDepartment = apps.get_model("clinic", "DoctorDepartment")
+    DoctorTreatment = apps.get_model("clinic", "DoctorTreatment")
+    DoctorSearchToken = apps.get_model("clinic", "DoctorSearchToken")
+
+    texts = defaultdict(list)
+    for doctor_id, name, hospital_name in Doctor.objects.values_list(
+        "id", "name", "hospital__name"
+    ):
+        texts[doctor_id] += [name, hospital_name]
+    for doctor_id, name in DoctorDepartment.objects.values_list(
+        "doctor_id", "department__name"
+    ):
+        texts[doctor_id].append(name)
+    for doctor_id, name in DoctorTreatment.objects.values_list(
+        "doctor_id", "treatment__name"
+    ):
+        texts[doctor_id].append(name)
+
+    DoctorSearchToken.objects.bulk_create(
+        [
+            DoctorSearchToken(doctor_id=doctor_id, token=token)
+            for doctor_id, doctor_texts in texts.items()
+            for token in tokenize(doctor_texts)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0004_availabilityblock"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DoctorSearchToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("token", models.CharField(max_length=8)),
+                (
+                    "doctor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_tokens",
+                        to="clinic.doctor",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("token", "doctor")},
+            },
+        ),
+        migrations.RunPython(build_search_tokens, migrations.RunPython.noop),
+    ]
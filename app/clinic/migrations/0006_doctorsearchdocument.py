@@ -0,0 +1,135 @@
+# Generated by Django 5.0 on 2026-10-19 00:38
+
+import json
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+DAY_NAMES = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+
+
+def hhmm(value):
+    return f"{value.hour:02d}:{value.minute:02d}"
+
+
+def build_search_documents(apps, schema_editor):
+    """
+    기존 의사의 검색 문서와 카드를 만듦 (이 시점의 카드 모양으로 고정해 둡니다)
+    """
+    Doctor = apps.get_model("clinic", "Doctor")
+    DoctorDepartment = apps.get_model("clinic", "DoctorDepartment")
+    DoctorTreatment = apps.get_model("clinic", "DoctorTreatment")
+    BusinessHour = apps.get_model("clinic", "BusinessHour")
+    DoctorSearchDocument = apps.get_model("clinic", "DoctorSearchDocument")
+
+    departments = defaultdict(list)
+    for doctor_id, department_id, name in DoctorDepartment.objects.order_by(
+        "id"
+    ).values_list("doctor_id", "department_id", "department__name"):
+        departments[doctor_id].append({"id": department_id, "name": name})
+    treatments = defaultdict(list)
+    for doctor_id, treatment_id, name in DoctorTreatment.objects.order_by(
+        "id"
+    ).values_list("doctor_id", "treatment_id", "treatment__name"):
+        treatments[doctor_id].append({"id": treatment_id, "name": name})
+    hours = defaultdict(list)
+    for (
+        hours_id,
+        doctor_id,
+        day,
+        opening,
+        closing,
+        lunch_start,
+        lunch_end,
+    ) in BusinessHour.objects.order_by("id").values_list(
+        "id",
+        "doctor_id",
+        "day",
+        "opening_time",
+        "closing_time",
+        "lunch_start_time",
+        "lunch_end_time",
+    ):
+        hours[doctor_id].append(
+            {
+                "id": hours_id,
+                "day": day,
+                "요일": DAY_NAMES[day],
+                "영업시간": f"{hhmm(opening)}~{hhmm(closing)}",
+                "점심시간": (
+                    f"{hhmm(lunch_start)}~{hhmm(lunch_end)}"
+                    if lunch_start is not None
+                    else None
+                ),
+                "doctor_id": doctor_id,
+                "opening_time": opening and opening.isoformat(),
+                "closing_time": closing and closing.isoformat(),
+                "lunch_start_time": lunch_start and lunch_start.isoformat(),
+                "lunch_end_time": lunch_end and lunch_end.isoformat(),
+            }
+        )
+
+    documents = []
+    for doctor_id, name, hospital_id, hospital_name in Doctor.objects.values_list(
+        "id", "name", "hospital_id", "hospital__name"
+    ).iterator(chunk_size=2000):
+        card = {
+            "id": doctor_id,
+            "name": name,
+            "hospital": (
+                {"id": hospital_id, "name": hospital_name}
+                if hospital_id is not None
+                else None
+            ),
+            "departments": departments[doctor_id],
+            "treatments": treatments[doctor_id],
+            "business_hours": hours[doctor_id],
+        }
+        texts = [name, hospital_name]
+        texts += [department["name"] for department in departments[doctor_id]]
+        texts += [treatment["name"] for treatment in treatments[doctor_id]]
+        documents.append(
+            DoctorSearchDocument(
+                doctor_id=doctor_id,
+                text="\n".join((text or "").lower() for text in texts if text),
+                card=json.dumps(card, ensure_ascii=False, separators=(",", ":")),
+            )
+        )
+    DoctorSearchDocument.objects.bulk_create(documents, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0005_doctorsearchtoken"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DoctorSearchDocument",
+            fields=[
+                (
+                    "doctor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="clinic.doctor",
+                    ),
+                ),
+                ("text", models.TextField()),
+                ("card", models.TextField()),
+            ],
+        ),
+        migrations.RunPython(build_search_documents, migrations.RunPython.noop),
+    ]
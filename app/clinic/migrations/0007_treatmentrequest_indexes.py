@@ -0,0 +1,35 @@
+# Generated by Django 5.0 on 2026-10-19 00:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0006_doctorsearchdocument"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="treatmentrequest",
+            index=models.Index(
+                fields=["doctor", "desired_datetime"], name="request_doctor_desired_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="treatmentrequest",
+            index=models.Index(fields=["desired_datetime"], name="request_desired_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="treatmentrequest",
+            index=models.Index(
+                fields=["status", "desired_datetime"], name="request_status_desired_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="treatmentrequest",
+            index=models.Index(
+                fields=["status", "expired_datetime"], name="request_status_expired_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.0 on 2026-10-19 00:51
+
+import json
+from datetime import datetime
+from datetime import time as dt_time
+
+import django.core.validators
+from django.db import migrations, models
+
+SLOT_MINUTES = 15
+
+
+def fill_slot_starts(apps, schema_editor):
+    """
+    이미 수락된 요청의 슬롯을 채움 (같은 슬롯이 겹치면 먼저 수락된 요청만 차지합니다)
+    """
+    TreatmentRequest = apps.get_model("clinic", "TreatmentRequest")
+    occupied = set()
+    changed = []
+    for treatment_request in (
+        TreatmentRequest.objects.filter(status="수락됨", doctor__isnull=False)
+        .order_by("id")
+        .only("id", "doctor_id", "desired_datetime")
+        .iterator(chunk_size=2000)
+    ):
+        value = treatment_request.desired_datetime
+        minutes = value.hour * 60 + value.minute
+        start = minutes - minutes % SLOT_MINUTES
+        slot_start = datetime.combine(value.date(), dt_time(start // 60, start % 60))
+        if (treatment_request.doctor_id, slot_start) in occupied:
+            continue
+        occupied.add((treatment_request.doctor_id, slot_start))
+        treatment_request.slot_start = slot_start
+        changed.append(treatment_request)
+    TreatmentRequest.objects.bulk_update(changed, ["slot_start"], batch_size=1000)
+
+
+def add_slot_minutes_to_cards(apps, schema_editor):
+    DoctorSearchDocument = apps.get_model("clinic", "DoctorSearchDocument")
+    documents = list(DoctorSearchDocument.objects.all())
+    for document in documents:
+        card = json.loads(document.card)
+        card["slot_minutes"] = SLOT_MINUTES
+        document.card = json.dumps(card, ensure_ascii=False, separators=(",", ":"))
+    DoctorSearchDocument.objects.bulk_update(documents, ["card"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0007_treatmentrequest_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="doctor",
+            name="slot_minutes",
+            field=models.PositiveSmallIntegerField(
+                default=15,
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(1440),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="treatmentrequest",
+            name="slot_start",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(fill_slot_starts, migrations.RunPython.noop),
+        migrations.RunPython(add_slot_minutes_to_cards, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="treatmentrequest",
+            constraint=models.UniqueConstraint(
+                fields=("doctor", "slot_start"), name="request_doctor_slot_unique"
+            ),
+        ),
+    ]
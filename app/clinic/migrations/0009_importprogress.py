@@ -0,0 +1,31 @@
+# Generated by Django 5.0 on 2026-10-19 01:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0008_slot_occupancy"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportProgress",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=500, unique=True)),
+                ("records", models.PositiveBigIntegerField(default=0)),
+                ("completed", models.BooleanField(default=False)),
+                ("updated_datetime", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.0 on 2026-10-19 01:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0009_importprogress"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTreatmentRequest",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("desired_datetime", models.DateTimeField()),
+                ("created_datetime", models.DateTimeField()),
+                ("expired_datetime", models.DateTimeField(null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("대기중", "PENDING"),
+                            ("수락됨", "ACCEPTED"),
+                            ("거절됨", "REFUSED"),
+                            ("만료됨", "EXPIRED"),
+                        ],
+                        max_length=100,
+                    ),
+                ),
+                ("slot_start", models.DateTimeField(null=True)),
+                ("month", models.DateField()),
+                ("archived_datetime", models.DateTimeField(auto_now_add=True)),
+                (
+                    "doctor",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="clinic.doctor",
+                    ),
+                ),
+                (
+                    "patient",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="clinic.patient",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["month", "desired_datetime"],
+                        name="archive_month_desired_idx",
+                    ),
+                    models.Index(
+                        fields=["month", "doctor", "desired_datetime"],
+                        name="archive_month_doctor_idx",
+                    ),
+                    models.Index(
+                        fields=["month", "patient", "desired_datetime"],
+                        name="archive_month_patient_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
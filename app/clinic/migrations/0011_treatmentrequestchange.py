@@ -0,0 +1,55 @@
+# Generated by Django 5.0 on 2026-10-19 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0010_archivedtreatmentrequest"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TreatmentRequestChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("treatment_request_id", models.BigIntegerField(db_index=True)),
+                ("doctor_id", models.BigIntegerField(null=True)),
+                (
+                    "from_status",
+                    models.CharField(
+                        choices=[
+                            ("대기중", "PENDING"),
+                            ("수락됨", "ACCEPTED"),
+                            ("거절됨", "REFUSED"),
+                            ("만료됨", "EXPIRED"),
+                        ],
+                        max_length=100,
+                        null=True,
+                    ),
+                ),
+                (
+                    "to_status",
+                    models.CharField(
+                        choices=[
+                            ("대기중", "PENDING"),
+                            ("수락됨", "ACCEPTED"),
+                            ("거절됨", "REFUSED"),
+                            ("만료됨", "EXPIRED"),
+                        ],
+                        max_length=100,
+                    ),
+                ),
+                ("created_datetime", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations
+
+# 진료 요청을 쓰는 문장이 같은 문장 안에서 변경 기록을 남깁니다.
+# SQLite 는 테이블을 다시 만들면(AlterField 등) 트리거도 지우므로,
+# clinic_treatmentrequest 를 다시 만드는 마이그레이션 뒤에는 트리거를 다시 만들어야 합니다.
+# (test_treatment_request_change_triggers 가 마이그레이션 후 트리거가 남아 있는지 확인합니다.)
+# created_datetime 은 strftime(..., 'localtime') 으로 서버 지역 시각을 씁니다. USE_TZ=False 라
+# 모델이 naive 지역 시각(datetime.now())을 저장하기 때문에 같은 기준이 됩니다.
+# USE_TZ 를 켜면 'localtime' 을 빼고 UTC 로 저장하도록 함께 바꿔야 합니다.
+CREATE_TRIGGERS = [
+    """
+    CREATE TRIGGER clinic_treatmentrequest_change_insert
+    AFTER INSERT ON clinic_treatmentrequest
+    BEGIN
+        INSERT INTO clinic_treatmentrequestchange
+            (treatment_request_id, doctor_id, from_status, to_status, created_datetime)
+        VALUES (
+            NEW.id, NEW.doctor_id, NULL, NEW.status,
+            strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER clinic_treatmentrequest_change_update
+    AFTER UPDATE OF status ON clinic_treatmentrequest
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        INSERT INTO clinic_treatmentrequestchange
+            (treatment_request_id, doctor_id, from_status, to_status, created_datetime)
+        VALUES (
+            NEW.id, NEW.doctor_id, OLD.status, NEW.status,
+            strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+        );
+    END
+    """,
+]
+
+DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS clinic_treatmentrequest_change_insert",
+    "DROP TRIGGER IF EXISTS clinic_treatmentrequest_change_update",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clinic", "0011_treatmentrequestchange"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
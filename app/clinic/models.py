@@ -1,9 +1,19 @@
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import datetime
 
+from clinic.availability import iter_blocks, slot_block, weekly_bitmap
 from clinic.enums import Days, RequestStatus
-from django.db import models
-
-DAYS_IN_WEEK = 7
+from clinic.jsonlib import dumps
+from clinic.schedule import (
+    DEFAULT_SLOT_MINUTES,
+    get_expired_datetime,
+    is_business_time,
+    schedule_cache,
+)
+from clinic.search import document_text, ngrams, tokenize
+from clinic.signals import business_hours_batch, business_hours_changed
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
 
 
 class Hospital(models.Model):
@@ -16,6 +26,11 @@ class Patient(models.Model):
 
 class Doctor(models.Model):
     name = models.CharField(max_length=200)
+    # 진료 요청 하나가 차지하는 시간 (같은 슬롯에는 한 요청만 수락됩니다)
+    slot_minutes = models.PositiveSmallIntegerField(
+        default=DEFAULT_SLOT_MINUTES,
+        validators=[MinValueValidator(1), MaxValueValidator(24 * 60)],
+    )
     hospital = models.ForeignKey(
         "Hospital", on_delete=models.SET_NULL, related_name="doctors", null=True
     )
@@ -69,6 +84,66 @@ class UninsuredTreatment(models.Model):
         return super().save(*args, **kwargs)
 
 
+class BusinessHourQuerySet(models.QuerySet):
+    """
+    시그널이 발생하지 않는 대량 쓰기에서도 영업시간 변경을 알립니다.
+    """
+
+    def update(self, **kwargs):
+        doctor_ids = set(self.values_list("doctor_id", flat=True))
+        rows = super().update(**kwargs)
+        if rows and ("doctor" in kwargs or "doctor_id" in kwargs):
+            doctor = kwargs.get("doctor_id", kwargs.get("doctor"))
+            doctor_ids.add(getattr(doctor, "pk", doctor))
+        self._notify(doctor_ids)
+        return rows
+
+    def bulk_create(self, objs, *args, notify=True, **kwargs):
+        # notify=False 이면 호출한 쪽이 변경을 직접 알립니다. (doctors_created 등)
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if notify:
+            self._notify({obj.doctor_id for obj in objs})
+        return objs
+
+    def bulk_update(self, objs, *args, **kwargs):
+        rows = super().bulk_update(objs, *args, **kwargs)
+        self._notify({obj.doctor_id for obj in objs})
+        return rows
+
+    def replace_week(self, doctor_id, hours):
+        """
+        의사의 주간 영업시간을 hours 로 교체 (hours 에 없는 요일은 삭제)
+
+        요일별로 한 번씩 저장하면 행마다 파생 데이터를 다시 만들게 되므로,
+        upsert 와 삭제를 한 트랜잭션에서 끝낸 뒤 변경을 한 번만 알립니다.
+        """
+        for hour in hours:
+            hour.doctor_id = doctor_id
+        with transaction.atomic(using=self.db):
+            with business_hours_batch():
+                super().bulk_create(
+                    hours,
+                    update_conflicts=True,
+                    unique_fields=["doctor", "day"],
+                    update_fields=[
+                        "opening_time",
+                        "lunch_start_time",
+                        "lunch_end_time",
+                        "closing_time",
+                    ],
+                )
+                self.filter(doctor_id=doctor_id).exclude(
+                    day__in=[hour.day for hour in hours]
+                ).delete()
+            self._notify({doctor_id})
+        return self.filter(doctor_id=doctor_id).order_by("day")
+
+    def _notify(self, doctor_ids):
+        doctor_ids = doctor_ids - {None}
+        if doctor_ids:
+            business_hours_changed.send(sender=self.model, doctor_ids=doctor_ids)
+
+
 class BusinessHour(models.Model):
     """
     영업시간
@@ -81,8 +156,11 @@ class BusinessHour(models.Model):
     lunch_end_time = models.TimeField(null=True)
     closing_time = models.TimeField(null=True)
 
+    objects = BusinessHourQuerySet.as_manager()
+
     class Meta:
         unique_together = (("doctor", "day"),)
+        base_manager_name = "objects"
 
     @property
     def 요일(self):
@@ -123,6 +201,169 @@ class BusinessHour(models.Model):
         return self.first_session
 
 
+class AvailabilityBlockManager(models.Manager):
+    def rebuild(self, doctor_ids):
+        """
+        의사들의 영업시간으로부터 주간 진료 가능 블록을 다시 생성
+        """
+        doctor_ids = set(doctor_ids)
+        hours_by_doctor = {doctor_id: [] for doctor_id in doctor_ids}
+        for hours in BusinessHour.objects.filter(doctor_id__in=doctor_ids):
+            hours_by_doctor[hours.doctor_id].append(hours)
+
+        blocks = [
+            self.model(doctor_id=doctor_id, block=block, mask=mask)
+            for doctor_id, hours in hours_by_doctor.items()
+            for block, mask in iter_blocks(weekly_bitmap(hours))
+        ]
+        self.filter(doctor_id__in=doctor_ids).delete()
+        self.bulk_create(blocks, batch_size=1000)
+
+    def available_at(self, *slots):
+        """
+        slots 중 하나라도 진료 가능한 의사 id
+        """
+        blocks = set()
+        aliases = {}
+        condition = models.Q()
+        for i, slot in enumerate(slots):
+            block, bit = slot_block(slot)
+            blocks.add(block)
+            aliases[f"available_{i}"] = models.F("mask").bitand(bit)
+            condition |= models.Q(block=block, **{f"available_{i}__gt": 0})
+        return (
+            self.filter(block__in=blocks)
+            .alias(**aliases)
+            .filter(condition)
+            .values("doctor_id")
+        )
+
+
+class AvailabilityBlock(models.Model):
+    """
+    진료 가능 시간 블록 (주간 비트맵의 4시간 단위 조각)
+    """
+
+    doctor = models.ForeignKey(
+        "Doctor", on_delete=models.CASCADE, related_name="availability_blocks"
+    )
+    block = models.PositiveSmallIntegerField()
+    mask = models.BigIntegerField()
+
+    objects = AvailabilityBlockManager()
+
+    class Meta:
+        unique_together = (("block", "doctor"),)
+
+
+class DoctorSearchTokenManager(models.Manager):
+    def rebuild(self, doctor_ids):
+        """
+        의사 이름, 병원 이름, 진료과, 비급여진료과목으로부터 검색 토큰을 다시 생성
+        """
+        doctor_ids = set(doctor_ids)
+        texts = defaultdict(list)
+        for doctor_id, name, hospital_name in Doctor.objects.filter(
+            id__in=doctor_ids
+        ).values_list("id", "name", "hospital__name"):
+            texts[doctor_id] += [name, hospital_name]
+        for doctor_id, name in DoctorDepartment.objects.filter(
+            doctor_id__in=texts
+        ).values_list("doctor_id", "department__name"):
+            texts[doctor_id].append(name)
+        for doctor_id, name in DoctorTreatment.objects.filter(
+            doctor_id__in=texts
+        ).values_list("doctor_id", "treatment__name"):
+            texts[doctor_id].append(name)
+
+        tokens = [
+            self.model(doctor_id=doctor_id, token=token)
+            for doctor_id, doctor_texts in texts.items()
+            for token in tokenize(doctor_texts)
+        ]
+        self.filter(doctor_id__in=doctor_ids).delete()
+        self.bulk_create(tokens, batch_size=1000)
+
+    def match(self, keywords):
+        """
+        모든 키워드의 바이그램을 가진 의사 id (포스팅 리스트의 교집합)
+        """
+        tokens = set()
+        for keyword in keywords:
+            tokens |= ngrams(keyword)
+        return (
+            self.filter(token__in=tokens)
+            .values("doctor_id")
+            .annotate(matched=models.Count("token"))
+            .filter(matched=len(tokens))
+            .values("doctor_id")
+        )
+
+
+class DoctorSearchToken(models.Model):
+    """
+    의사 검색 역색인 (바이그램 하나당 한 행)
+    """
+
+    doctor = models.ForeignKey(
+        "Doctor", on_delete=models.CASCADE, related_name="search_tokens"
+    )
+    token = models.CharField(max_length=8)
+
+    objects = DoctorSearchTokenManager()
+
+    class Meta:
+        unique_together = (("token", "doctor"),)
+
+
+class DoctorSearchDocumentManager(models.Manager):
+    def rebuild(self, doctor_ids):
+        """
+        doctor_ids 의사들의 검색 문서를 다시 생성
+        """
+        # serializers 가 models 를 import 하므로 여기서 불러옵니다.
+        from clinic.serializers import DoctorProjectionSerializer
+
+        doctor_ids = set(doctor_ids)
+        cards = DoctorProjectionSerializer(
+            Doctor.objects.filter(id__in=doctor_ids)
+        ).data
+        documents = []
+        for card in cards:
+            texts = [card["name"], card["hospital"] and card["hospital"]["name"]]
+            texts += [department["name"] for department in card["departments"]]
+            texts += [treatment["name"] for treatment in card["treatments"]]
+            documents.append(
+                self.model(
+                    doctor_id=card["id"],
+                    text=document_text(texts),
+                    card=dumps(card).decode(),
+                )
+            )
+        self.filter(doctor_id__in=doctor_ids).delete()
+        self.bulk_create(documents, batch_size=1000)
+
+
+class DoctorSearchDocument(models.Model):
+    """
+    의사 검색 문서 (의사 한 명당 한 행)
+
+    검색할 텍스트와 렌더링된 의사 카드 JSON 을 미리 만들어 두어
+    검색과 목록 조회가 조인이나 직렬화 없이 이 테이블만 읽도록 합니다.
+    """
+
+    doctor = models.OneToOneField(
+        "Doctor",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    text = models.TextField()
+    card = models.TextField()
+
+    objects = DoctorSearchDocumentManager()
+
+
 class TreatmentRequest(models.Model):
     """
     진료 요청
@@ -136,32 +377,43 @@ class TreatmentRequest(models.Model):
     status = models.CharField(
         max_length=100, choices=RequestStatus.choices(), default=RequestStatus.PENDING
     )
+    # 수락된 요청이 차지하는 슬롯의 시작 시각 (수락될 때만 채워집니다)
+    slot_start = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            # 의사별 목록: doctor_id 로 찾고 desired_datetime, id 순서 그대로 페이지를 읽습니다.
+            models.Index(
+                fields=["doctor", "desired_datetime"], name="request_doctor_desired_idx"
+            ),
+            models.Index(fields=["desired_datetime"], name="request_desired_idx"),
+            # 만료 처리: 대기중인 요청 중 시각이 지난 요청만 찾습니다.
+            models.Index(
+                fields=["status", "desired_datetime"], name="request_status_desired_idx"
+            ),
+            models.Index(
+                fields=["status", "expired_datetime"], name="request_status_expired_idx"
+            ),
+        ]
+        constraints = [
+            # 의사별 슬롯마다 수락된 요청은 하나뿐이며, 이 유니크 인덱스로 검사합니다.
+            models.UniqueConstraint(
+                fields=["doctor", "slot_start"], name="request_doctor_slot_unique"
+            ),
+        ]
+
+    @property
+    def schedule(self):
+        return schedule_cache.get(self.doctor_id)
 
     @property
     def is_expired(self):
         if self.status == RequestStatus.EXPIRED or not self.is_available:
             return True
         if self.expired_datetime is None:
-            # created_datetime 요일
-            day = self.created_datetime.weekday()
-
-            # self.doctor.hours에서 해당 요일의 영업시간 가져오기
-            hours = self.doctor.hours.filter(day=day).first()
-
-            # 해당 영업 시간과 요청 시간이 일치하는지 확인하고 만료 시간 설정
-            if hours:
-                self._check_business_hours(hours)
-
-            # 일치하는 영업시간이 없다면 가장 가까운 요일의 영업시간 가져오기
-            if self.expired_datetime is None:
-                hours = self._find_next_business_hours(day)
-                day_diff = (hours.day - day) % DAYS_IN_WEEK
-                duration = timedelta(minutes=15)
-                start_date = datetime.combine(
-                    self.created_datetime.date() + timedelta(days=day_diff),
-                    hours.opening_time,
-                )
-                self._set_expired_datetime(start_date, duration)
+            self._set_expired_datetime(
+                get_expired_datetime(self.created_datetime, self.schedule)
+            )
 
         if self.expired_datetime <= datetime.now():
             self._set_status(RequestStatus.EXPIRED)
@@ -175,56 +427,86 @@ class TreatmentRequest(models.Model):
         if self.desired_datetime <= datetime.now():
             self._set_status(RequestStatus.REFUSED)
             return False
-        day = self.desired_datetime.weekday()
 
-        # self.doctor.hours 에서 해당 요일의 영업시간 가져오기
-        try:
-            hours = self.doctor.hours.get(day=day)
-        except BusinessHour.DoesNotExist:
-            self._set_status(RequestStatus.REFUSED)
-            return False
-
-        desired_time = self.desired_datetime.time()
-
-        if self._in_range(desired_time, hours.first_session) or self._in_range(
-            desired_time, hours.second_session
-        ):
+        if is_business_time(self.desired_datetime, self.schedule):
             return True
         self._set_status(RequestStatus.REFUSED)
         return False
 
-    def _in_range(self, time, time_range):
-        if time_range[0] <= time <= time_range[1]:
-            return True
-        return False
-
-    def _find_next_business_hours(self, day):
-        next_day = (day + 1) % DAYS_IN_WEEK
-        hours = self.doctor.hours.filter(day__gte=next_day).order_by("day")
-        if not hours.exists():
-            hours = self.doctor.hours.filter(day__lte=next_day).order_by("-day")
-        hours = hours.first()
-        return hours
+    def _set_expired_datetime(self, expired_datetime):
+        self.expired_datetime = expired_datetime
+        self.save()
 
-    def _set_expired_datetime(self, start_datetime, duration):
-        self.expired_datetime = start_datetime + duration
+    def _set_status(self, status):
+        self.status = status
         self.save()
 
-    def _check_business_hours(self, hours):
-        created_time = self.created_datetime.time()
 
-        if self._in_range(created_time, hours.first_session) or self._in_range(
-            created_time, hours.second_session
-        ):
-            duration = timedelta(minutes=20)
-            self._set_expired_datetime(self.created_time, duration)
+class TreatmentRequestChange(models.Model):
+    """
+    진료 요청 변경 기록 (outbox, 추가만 합니다)
 
-        elif hours.has_lunch_time and self._in_range(
-            created_time, hours.lunch_time_range
-        ):
-            duration = timedelta(minutes=15)
-            self._set_expired_datetime(self.created_time, duration)
+    진료 요청을 만들거나 상태를 바꾸는 문장이 SQLite 트리거로 함께 기록하므로
+    (0012 마이그레이션) 쓰는 경로와 관계없이 빠지지 않고, 쿼리도 늘지 않습니다.
+    SQLite 는 쓰기 트랜잭션을 하나씩 커밋하므로 id 는 커밋 순서대로 증가하며,
+    소비자는 마지막으로 받은 id 다음부터 읽으면 변경을 빠짐없이 받습니다.
+    보관(archive_requests)된 요청의 기록도 남도록 진료 요청을 외래키로 참조하지 않습니다.
+    """
 
-    def _set_status(self, status):
-        self.status = status
-        self.save()
+    treatment_request_id = models.BigIntegerField(db_index=True)
+    doctor_id = models.BigIntegerField(null=True)
+    # 생성된 요청은 이전 상태가 없습니다.
+    from_status = models.CharField(
+        max_length=100, choices=RequestStatus.choices(), null=True
+    )
+    to_status = models.CharField(max_length=100, choices=RequestStatus.choices())
+    created_datetime = models.DateTimeField(auto_now_add=True)
+
+
+class ArchivedTreatmentRequest(models.Model):
+    """
+    보관된 진료 요청 (archive_requests 명령이 끝난 요청을 옮겨 둡니다)
+
+    진료 요청과 같은 컬럼에 희망 시각의 월(month, 그 달 1일)을 더해 월 단위로 나눕니다.
+    인덱스가 모두 month 로 시작하므로 이력 조회는 한 달 구간만 읽습니다.
+    """
+
+    # 진료 요청의 id 를 그대로 씁니다.
+    id = models.BigIntegerField(primary_key=True)
+    patient = models.ForeignKey("Patient", on_delete=models.SET_NULL, null=True)
+    doctor = models.ForeignKey("Doctor", on_delete=models.SET_NULL, null=True)
+    desired_datetime = models.DateTimeField()
+    created_datetime = models.DateTimeField()
+    expired_datetime = models.DateTimeField(null=True)
+    status = models.CharField(max_length=100, choices=RequestStatus.choices())
+    slot_start = models.DateTimeField(null=True)
+    month = models.DateField()
+    archived_datetime = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["month", "desired_datetime"], name="archive_month_desired_idx"
+            ),
+            models.Index(
+                fields=["month", "doctor", "desired_datetime"],
+                name="archive_month_doctor_idx",
+            ),
+            models.Index(
+                fields=["month", "patient", "desired_datetime"],
+                name="archive_month_patient_idx",
+            ),
+        ]
+
+
+class ImportProgress(models.Model):
+    """
+    대량 가져오기(import_directory) 진행 상황
+
+    청크를 저장하는 트랜잭션에서 함께 갱신하므로, records 는 항상 커밋된 레코드 수입니다.
+    """
+
+    source = models.CharField(max_length=500, unique=True)
+    records = models.PositiveBigIntegerField(default=0)
+    completed = models.BooleanField(default=False)
+    updated_datetime = models.DateTimeField(auto_now=True)
@@ -0,0 +1,144 @@
+"""
+의사별 가장 빠른 진료 가능 시각 계산
+
+availability 의 주간 비트맵을 (의사 수, 주간 슬롯 수) 크기의 NumPy 배열로 펼치고,
+수락된 요청이 차지한 구간을 지운 뒤 의사마다 처음으로 비어 있는 슬롯을 찾습니다.
+시각은 availability.SLOT_MINUTES 단위로 검사하며, 어떤 시각 t 는 진료 시간이고
+t 가 속한 의사의 진료 슬롯(get_slot_start)이 수락된 요청에 차지되지 않았을 때 비어 있습니다.
+
+대부분의 의사는 조회 구간 앞쪽에서 빈 시각이 나오므로, 하루씩 검사하면서
+빈 시각을 찾은 의사는 다음 날부터 제외합니다.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+from clinic.availability import (
+    SLOT_MINUTES,
+    SLOTS_PER_BLOCK,
+    SLOTS_PER_DAY,
+    SLOTS_PER_WEEK,
+    datetime_to_slot,
+)
+
+BLOCKS_PER_WEEK = SLOTS_PER_WEEK // SLOTS_PER_BLOCK
+SLOT = timedelta(minutes=SLOT_MINUTES)
+
+
+def align(value):
+    """
+    value 이후(포함) 가장 가까운 SLOT_MINUTES 단위 시각
+    """
+    if value.second or value.microsecond:
+        value = value.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    return value + timedelta(minutes=-value.minute % SLOT_MINUTES)
+
+
+def weekly_matrix(size, rows, blocks, masks):
+    """
+    (의사 행, 블록 번호, 마스크) 배열로부터 (size, SLOTS_PER_WEEK) 진료 가능 배열 생성
+    """
+    bits = np.unpackbits(
+        masks.astype("<i8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little"
+    )
+    weekly = np.zeros((size, BLOCKS_PER_WEEK, SLOTS_PER_BLOCK), dtype=bool)
+    weekly[rows, blocks] = bits[:, :SLOTS_PER_BLOCK]
+    return weekly.reshape(size, SLOTS_PER_WEEK)
+
+
+def occupied_columns(slot_starts, slot_minutes, start):
+    """
+    수락된 요청이 차지한 [시작, 끝) 열 번호 (열 0 은 start)
+
+    슬롯은 자정에서 잘리므로 그 날 안에서만 차지합니다.
+    """
+    begin = np.asarray(slot_starts, dtype="datetime64[m]")
+    end = np.minimum(
+        begin + slot_minutes.astype("timedelta64[m]"),
+        begin.astype("datetime64[D]") + np.timedelta64(1, "D"),
+    )
+    origin = np.datetime64(start, "m")
+
+    def column(value):
+        return -(-(value - origin).astype(np.int64) // SLOT_MINUTES)
+
+    return column(begin), column(end)
+
+
+def earliest_openings(doctor_ids, slot_minutes, blocks, accepted, start, end):
+    """
+    [start, end) 에서 의사별로 가장 빠른 진료 가능 시각
+
+    doctor_ids, slot_minutes: 의사 id 와 슬롯 길이 목록
+    blocks: (의사 id, 블록 번호, 마스크) 목록
+    accepted: 수락된 요청의 (의사 id, slot_start) 목록
+    반환: {의사 id: 시각} (진료 가능한 시각이 없는 의사는 제외)
+    """
+    start = align(start)
+    slots = max(-(-(end - start) // SLOT), 0)
+    if not doctor_ids or not slots:
+        return {}
+
+    doctor_ids = np.asarray(doctor_ids, dtype=np.int64)
+    order = np.argsort(doctor_ids)
+    sorted_ids = doctor_ids[order]
+
+    def rows_of(ids):
+        return order[np.searchsorted(sorted_ids, ids)]
+
+    block_array = np.asarray(blocks, dtype=np.int64).reshape(-1, 3)
+    weekly = weekly_matrix(
+        len(doctor_ids),
+        rows_of(block_array[:, 0]),
+        block_array[:, 1],
+        block_array[:, 2],
+    )
+
+    occupied_rows = np.empty(0, dtype=np.int64)
+    occupied_begin = occupied_end = occupied_rows
+    if accepted:
+        accepted_ids, slot_starts = zip(*accepted)
+        occupied_rows = rows_of(np.asarray(accepted_ids, dtype=np.int64))
+        occupied_begin, occupied_end = occupied_columns(
+            slot_starts, np.asarray(slot_minutes)[occupied_rows], start
+        )
+
+    first = np.full(len(doctor_ids), -1)
+    remaining = np.arange(len(doctor_ids))
+    week_slot = datetime_to_slot(start)
+    column = 0
+    while column < slots and len(remaining):
+        # 하루 안의 열은 주간 배열에서 연속이므로 행만 골라 읽습니다.
+        width = min(SLOTS_PER_DAY - week_slot % SLOTS_PER_DAY, slots - column)
+        available = weekly[remaining, week_slot : week_slot + width]
+
+        overlaps = np.flatnonzero(
+            (occupied_begin < column + width) & (occupied_end > column)
+        )
+        # 이미 빈 시각을 찾은 의사의 구간은 건너뜁니다.
+        rows = np.searchsorted(remaining, occupied_rows[overlaps])
+        pending = rows < len(remaining)
+        pending[pending] = remaining[rows[pending]] == occupied_rows[overlaps][pending]
+        rows, overlaps = rows[pending], overlaps[pending]
+        if len(rows):
+            # 구간의 시작과 끝에 +1/-1 을 더한 뒤 누적합이 양수인 열이 차지된 열입니다.
+            marks = np.zeros((len(remaining), width + 1), dtype=np.int16)
+            for bounds, value in ((occupied_begin, 1), (occupied_end, -1)):
+                np.add.at(
+                    marks,
+                    (rows, np.clip(bounds[overlaps] - column, 0, width)),
+                    value,
+                )
+            available &= np.cumsum(marks[:, :width], axis=1) <= 0
+
+        found = available.any(axis=1)
+        first[remaining[found]] = column + available[found].argmax(axis=1)
+        remaining = remaining[~found]
+        column += width
+        week_slot = (week_slot + width) % SLOTS_PER_WEEK
+
+    found = first >= 0
+    return {
+        int(doctor_id): start + SLOT * int(offset)
+        for doctor_id, offset in zip(doctor_ids[found], first[found])
+    }
@@ -0,0 +1,159 @@
+import base64
+import json
+from datetime import datetime
+
+from clinic.responses import RenderedResponse
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# 커서의 정수는 SQLite INTEGER(부호 있는 64비트) 범위여야 조회할 수 있습니다.
+MIN_INTEGER = -(2**63)
+MAX_INTEGER = 2**63 - 1
+
+
+class KeysetPagination:
+    """
+    키셋(커서) 기반 페이지네이션
+
+    ordering 필드 값의 조합을 불투명한 커서로 만들어 다음 페이지를 조회하므로
+    OFFSET, COUNT(*) 없이 인덱스 범위 검색만으로 페이지를 가져옵니다.
+    응답 본문은 목록 그대로 두고, 다음 페이지 주소는 Link 헤더로 전달합니다.
+    """
+
+    ordering = ("id",)
+    page_size = 100
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+
+    def paginate_queryset(self, queryset, request):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request):
+        self.request = request
+        self.limit = self.get_limit(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            try:
+                queryset = queryset.filter(self.get_keyset_filter(self.decode(cursor)))
+            except (DjangoValidationError, ValueError, TypeError):
+                # 변조된 커서의 값은 필드 타입과 맞지 않을 수 있습니다. (None, 객체 등)
+                raise ValidationError({"cursor": "잘못된 커서입니다."})
+        # 한 행을 더 읽어 다음 페이지가 있는지 확인합니다.
+        return queryset[: self.limit + 1]
+
+    def set_page(self, page):
+        self.has_next = len(page) > self.limit
+        self.page = page[: self.limit]
+        return self.page
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get(self.page_size_query_param, ""))
+        except ValueError:
+            return self.page_size
+        return min(max(limit, 1), self.max_page_size)
+
+    def get_keyset_filter(self, values):
+        # (a, b) > (x, y)  ==  a > x OR (a = x AND b > y)
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            equal = {name: values[j] for j, name in enumerate(self.ordering[:i])}
+            condition |= Q(**equal, **{f"{field}__gt": values[i]})
+        # OR 조건만으로는 인덱스 범위 검색을 못 하므로 첫 정렬 필드의 하한을 함께 겁니다.
+        return Q(**{f"{self.ordering[0]}__gte": values[0]}) & condition
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        values = [getattr(self.page[-1], field) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode(values))
+
+    def get_headers(self):
+        headers = {}
+        next_link = self.get_next_link()
+        if next_link:
+            headers["Link"] = f'<{next_link}>; rel="next"'
+        return headers
+
+    def get_paginated_response(self, data):
+        return Response(data, headers=self.get_headers())
+
+    def encode(self, values):
+        values = [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in values
+        ]
+        payload = json.dumps(values, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode(self, cursor):
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(payload)
+        except (ValueError, TypeError):
+            raise ValidationError({"cursor": "잘못된 커서입니다."})
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValidationError({"cursor": "잘못된 커서입니다."})
+        if not all(map(is_valid_integer, values)):
+            raise ValidationError({"cursor": "잘못된 커서입니다."})
+        return values
+
+
+class SequencePagination(KeysetPagination):
+    """
+    증가하는 id 를 그대로 커서로 쓰는 페이지네이션 (?after=<id>)
+
+    소비자가 마지막으로 받은 id 를 저장해 두었다가 이어서 읽을 수 있도록
+    커서를 감추지 않습니다.
+    """
+
+    cursor_query_param = "after"
+
+    def encode(self, values):
+        return str(values[0])
+
+    def decode(self, cursor):
+        try:
+            value = int(cursor)
+        except ValueError:
+            value = None
+        if value is None or not is_valid_integer(value):
+            raise ValidationError({self.cursor_query_param: "잘못된 커서입니다."})
+        return [value]
+
+
+def is_valid_integer(value):
+    # 정수가 아닌 값은 필터를 만들 때 필드 타입으로 검사합니다.
+    return not isinstance(value, int) or MIN_INTEGER <= value <= MAX_INTEGER
+
+
+def get_paginated_response(*, pagination_class, serializer_class, queryset, request):
+    paginator = pagination_class()
+    page = paginator.paginate_queryset(queryset, request)
+    serializer = serializer_class(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
+def get_rendered_paginated_response(*, pagination_class, queryset, field, request):
+    """
+    행마다 미리 렌더링된 JSON(field)을 이어 붙여 목록 응답을 만듭니다.
+    """
+    paginator = pagination_class()
+    page = paginator.paginate_queryset(queryset, request)
+    return RenderedResponse(join_rendered(page, field), headers=paginator.get_headers())
+
+
+def join_rendered(rows, field):
+    return ("[" + ",".join(getattr(row, field) for row in rows) + "]").encode()
@@ -0,0 +1,181 @@
+from clinic.caching import bump_data_version
+from clinic.events import request_events
+from clinic.models import (
+    AvailabilityBlock,
+    BusinessHour,
+    Department,
+    Doctor,
+    DoctorSearchDocument,
+    DoctorSearchToken,
+    Hospital,
+    UninsuredTreatment,
+)
+from clinic.renderers import FastJSONRenderer
+from clinic.schedule import schedule_cache
+from clinic.serializers import TreatmentRequestEventSerializer
+from clinic.signals import (
+    business_hours_changed,
+    doctors_changed,
+    doctors_created,
+    in_business_hours_batch,
+    treatment_requests_changed,
+)
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    # 운영 프로필의 WAL, busy_timeout 등은 연결마다 설정해야 합니다.
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(pre_save, sender=BusinessHour)
+def remember_previous_doctor(sender, instance, raw=False, **kwargs):
+    # 다른 의사로 옮겨진 영업시간은 이전 의사의 일정도 갱신해야 합니다.
+    instance._previous_doctor_id = None
+    if instance.pk is not None and not raw:
+        instance._previous_doctor_id = (
+            sender.objects.filter(pk=instance.pk)
+            .values_list("doctor_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=BusinessHour)
+@receiver(post_delete, sender=BusinessHour)
+def notify_business_hours_changed(sender, instance, **kwargs):
+    if in_business_hours_batch():
+        return
+    doctor_ids = {instance.doctor_id, getattr(instance, "_previous_doctor_id", None)}
+    doctor_ids.discard(None)
+    if doctor_ids:
+        business_hours_changed.send(sender=sender, doctor_ids=doctor_ids)
+
+
+@receiver(business_hours_changed)
+@receiver(doctors_created)
+def rebuild_availability(sender, doctor_ids, **kwargs):
+    AvailabilityBlock.objects.rebuild(doctor_ids)
+
+
+@receiver(business_hours_changed)
+@receiver(doctors_created)
+def invalidate_schedules(sender, doctor_ids, **kwargs):
+    doctor_ids = set(doctor_ids)
+    schedule_cache.invalidate(doctor_ids)
+    # 롤백되는 트랜잭션 안에서 캐시에 들어간 일정을 커밋 시점에 한 번 더 비웁니다.
+    transaction.on_commit(lambda: schedule_cache.invalidate(doctor_ids))
+
+
+@receiver(post_save, sender=Doctor)
+def notify_doctor_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        doctors_changed.send(sender=sender, doctor_ids={instance.pk})
+
+
+@receiver(post_delete, sender=Doctor)
+def notify_doctor_deleted(sender, instance, **kwargs):
+    doctors_changed.send(sender=sender, doctor_ids={instance.pk})
+
+
+@receiver(post_save, sender=Hospital)
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=UninsuredTreatment)
+def notify_related_saved(sender, instance, created=False, raw=False, **kwargs):
+    if created or raw:
+        return
+    doctor_ids = set(instance.doctors.values_list("id", flat=True))
+    if doctor_ids:
+        doctors_changed.send(sender=sender, doctor_ids=doctor_ids)
+
+
+@receiver(pre_delete, sender=Hospital)
+@receiver(pre_delete, sender=Department)
+@receiver(pre_delete, sender=UninsuredTreatment)
+def remember_related_doctors(sender, instance, **kwargs):
+    # 삭제가 끝나면 연결 정보(중간 테이블, hospital_id)가 사라지므로 미리 기억합니다.
+    instance._doctor_ids = set(instance.doctors.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Hospital)
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=UninsuredTreatment)
+def notify_related_deleted(sender, instance, **kwargs):
+    doctor_ids = getattr(instance, "_doctor_ids", None)
+    if doctor_ids:
+        doctors_changed.send(sender=sender, doctor_ids=doctor_ids)
+
+
+@receiver(m2m_changed, sender=Doctor.departments.through)
+@receiver(m2m_changed, sender=Doctor.treatments.through)
+def notify_doctor_relations_changed(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action == "pre_clear" and reverse:
+        instance._doctor_ids = set(instance.doctors.values_list("id", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        doctor_ids = {instance.pk}
+    elif action == "post_clear":
+        doctor_ids = getattr(instance, "_doctor_ids", set())
+    else:
+        doctor_ids = set(pk_set or ())
+    if doctor_ids:
+        doctors_changed.send(sender=Doctor, doctor_ids=doctor_ids)
+
+
+@receiver(doctors_changed)
+@receiver(doctors_created)
+def rebuild_search_tokens(sender, doctor_ids, **kwargs):
+    DoctorSearchToken.objects.rebuild(doctor_ids)
+
+
+@receiver(doctors_changed)
+@receiver(business_hours_changed)
+@receiver(doctors_created)
+def rebuild_search_documents(sender, doctor_ids, **kwargs):
+    # 의사 카드에 영업시간이 포함되므로 영업시간이 바뀌어도 다시 만듭니다.
+    DoctorSearchDocument.objects.rebuild(doctor_ids)
+
+
+@receiver(doctors_changed)
+@receiver(business_hours_changed)
+@receiver(doctors_created)
+def invalidate_doctor_search_cache(sender, **kwargs):
+    bump_data_version()
+    # 커밋 전에 다른 요청이 이전 데이터를 새 버전으로 캐시했을 수 있으므로
+    # invalidate_schedules 와 같이 커밋 시점에 한 번 더 올립니다.
+    transaction.on_commit(bump_data_version)
+
+
+@receiver(treatment_requests_changed)
+def publish_request_events(sender, treatment_requests, **kwargs):
+    renderer = FastJSONRenderer()
+    events = [
+        (
+            treatment_request.doctor_id,
+            renderer.render(TreatmentRequestEventSerializer(treatment_request).data),
+        )
+        for treatment_request in treatment_requests
+        if treatment_request.doctor_id is not None
+    ]
+    # 롤백된 변경은 발행하지 않습니다.
+    if events:
+        transaction.on_commit(lambda: request_events.publish(events))
@@ -0,0 +1,17 @@
+from clinic.jsonlib import dumps
+from rest_framework.renderers import JSONRenderer
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    clinic.jsonlib 으로 인코딩하는 JSONRenderer
+
+    REST_FRAMEWORK 의 DEFAULT_RENDERER_CLASSES 로 전역 지정하거나
+    뷰의 renderer_classes 로 뷰마다 지정할 수 있습니다.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return dumps(data, indent=indent)
@@ -0,0 +1,95 @@
+"""
+읽기 전용 복제본(replica) 라우팅
+
+settings.DATABASE_REPLICAS 에 복제본 DB 별칭이 있으면, ReplicaRoutingMiddleware 가
+읽기 요청(GET 등)을 처리하는 동안에만 selectors 의 조회를 복제본으로 보냅니다.
+쓰기 요청, 관리 명령, 시그널 수신기 등 그 밖의 모든 조회와 쓰기는 primary(default) 를
+사용하므로, 서비스가 방금 쓴 데이터를 복제본에서 다시 읽는 일은 없습니다.
+
+요청마다 복제본 하나를 골라 그 요청의 조회는 모두 같은 복제본에서 읽으므로, 한 요청
+안에서 복사 시점이 다른 복제본을 섞어 읽지 않습니다. 아직 한 번도 복사되지 않은(스키마가
+없는) 복제본은 고르지 않고, 쓸 수 있는 복제본이 없으면 primary 에서 읽습니다.
+
+복제본은 sync_replicas 명령으로 primary 를 통째로 복사해 갱신합니다.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from clinic.caching import bump_data_version
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# 현재 요청의 조회를 보낼 복제본 별칭 (None 이면 primary)
+_replica = ContextVar("replica", default=None)
+# 복사된 것을 확인한 복제본의 (별칭, DB 파일)
+_synced = set()
+
+
+def get_replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def _is_synced(alias):
+    replica = connections[alias]
+    key = (alias, str(replica.settings_dict["NAME"]))
+    if key not in _synced:
+        # sync_replicas 가 한 번도 실행되지 않은 복제본에는 테이블이 없습니다.
+        if "django_migrations" not in replica.introspection.table_names():
+            return False
+        _synced.add(key)
+    return True
+
+
+def choose_replica():
+    """
+    조회를 보낼 복제본 하나 (복사된 복제본이 없으면 None)
+    """
+    replicas = [alias for alias in get_replicas() if _is_synced(alias)]
+    return random.choice(replicas) if replicas else None
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """
+    블록 안의 조회를 복제본 하나로 보냄 (복제본이 없으면 primary)
+    """
+    token = _replica.set(choose_replica() if enabled else None)
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _replica.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 primary 의 사본이므로 어느 DB 에서 읽은 객체든 연결할 수 있습니다.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # 복제본의 스키마는 sync_replicas 로 primary 에서 복사됩니다.
+        return db not in get_replicas()
+
+
+def sync_replicas():
+    """
+    primary 를 모든 복제본으로 복사 (SQLite 온라인 백업)
+    """
+    replicas = get_replicas()
+    primary = connections[DEFAULT_DB_ALIAS]
+    primary.ensure_connection()
+    for alias in replicas:
+        replica = connections[alias]
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
+    if replicas:
+        # 복제본에서 렌더링한 이전 검색 응답을 더 이상 쓰지 않도록 합니다.
+        bump_data_version()
+    return replicas
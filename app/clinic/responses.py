@@ -0,0 +1,24 @@
+from clinic.jsonlib import loads
+from rest_framework.response import Response
+
+
+class RenderedResponse(Response):
+    """
+    이미 렌더링된 JSON 본문으로 만드는 응답
+
+    렌더러를 거치지 않고 content 를 그대로 내보냅니다. data 는 접근할 때 본문을
+    파싱해서 돌려줍니다.
+    """
+
+    def __init__(self, content, status=None, headers=None):
+        super().__init__(status=status, headers=headers)
+        self.content = content
+        self["Content-Type"] = "application/json"
+
+    @property
+    def data(self):
+        return loads(self.content) if self._is_rendered else None
+
+    @data.setter
+    def data(self, value):
+        pass
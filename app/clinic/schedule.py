@@ -0,0 +1,240 @@
+"""
+의사의 주간 영업시간(schedule) 계산
+
+schedule은 {요일: BusinessHour} 형태의 dict 입니다. 한 번 불러온 schedule로
+여러 진료 요청을 추가 쿼리 없이 검사할 수 있습니다.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from datetime import time as dt_time
+from datetime import timedelta
+
+from clinic.availability import SLOT_MINUTES, is_on_grid
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+DAYS_IN_WEEK = 7
+
+# 영업시간 중에 접수된 요청의 만료 기한
+OPEN_EXPIRY = timedelta(minutes=20)
+# 점심시간 또는 영업시간 외에 접수된 요청의 만료 기한
+CLOSED_EXPIRY = timedelta(minutes=15)
+# 의사가 진료 요청 하나에 쓰는 기본 시간
+DEFAULT_SLOT_MINUTES = 15
+
+
+def validate_business_hours(
+    opening_time, closing_time, lunch_start_time=None, lunch_end_time=None
+):
+    """
+    영업시간의 순서 검사 (틀리면 ValueError)
+
+    opening < closing 이고, 점심시간이 있으면 opening <= lunch_start < lunch_end <= closing
+    이어야 합니다. 순서가 틀린 영업시간은 진료 가능 비트맵을 망가뜨립니다.
+    모든 시각은 슬롯(SLOT_MINUTES) 경계여야 검색과 예약의 판단이 같아집니다.
+    """
+    if (lunch_start_time is None) != (lunch_end_time is None):
+        raise ValueError("점심시간은 시작과 끝을 함께 입력해주세요.")
+    times = (opening_time, closing_time, lunch_start_time, lunch_end_time)
+    if not all(time is None or is_on_grid(time) for time in times):
+        raise ValueError(f"영업시간은 {SLOT_MINUTES}분 단위로 입력해주세요.")
+    if opening_time >= closing_time:
+        raise ValueError("영업 시작 시간은 종료 시간보다 빨라야 합니다.")
+    if lunch_start_time is not None and not (
+        opening_time <= lunch_start_time < lunch_end_time <= closing_time
+    ):
+        raise ValueError("점심시간은 영업시간 안에서 시작이 끝보다 빨라야 합니다.")
+
+
+def in_range(time, time_range):
+    return time_range[0] <= time <= time_range[1]
+
+
+def in_session(time, hours):
+    return in_range(time, hours.first_session) or in_range(time, hours.second_session)
+
+
+def is_business_time(value, schedule):
+    """
+    value 시각이 진료 시간(점심시간 제외)에 포함되는지 여부
+    """
+    hours = schedule.get(value.weekday())
+    if hours is None:
+        return False
+    return in_session(value.time(), hours)
+
+
+def get_slot_start(value, slot_minutes):
+    """
+    value 가 속한 진료 슬롯의 시작 시각 (자정부터 slot_minutes 단위로 나눈 구간)
+    """
+    minutes = value.hour * 60 + value.minute
+    start = minutes - minutes % slot_minutes
+    return datetime.combine(value.date(), dt_time(start // 60, start % 60))
+
+
+def find_next_business_hours(day, schedule):
+    """
+    day 다음 날부터 가장 가까운 영업일의 영업시간
+    """
+    for diff in range(1, DAYS_IN_WEEK + 1):
+        hours = schedule.get((day + diff) % DAYS_IN_WEEK)
+        if hours is not None:
+            return hours
+    return None
+
+
+def get_expired_datetime(created_datetime, schedule):
+    """
+    접수 시각과 schedule로 요청의 만료 시각 계산 (영업일이 없으면 None)
+    """
+    day = created_datetime.weekday()
+    created_time = created_datetime.time()
+
+    hours = schedule.get(day)
+    if hours:
+        if in_session(created_time, hours):
+            return created_datetime + OPEN_EXPIRY
+        if hours.has_lunch_time and in_range(created_time, hours.lunch_time_range):
+            return created_datetime + CLOSED_EXPIRY
+
+    hours = find_next_business_hours(day, schedule)
+    if hours is None:
+        return None
+    day_diff = (hours.day - day) % DAYS_IN_WEEK
+    start_datetime = datetime.combine(
+        created_datetime.date() + timedelta(days=day_diff), hours.opening_time
+    )
+    return start_datetime + CLOSED_EXPIRY
+
+
+class ScheduleCache:
+    """
+    의사 id별 schedule을 보관하는 프로세스 내 LRU 캐시
+
+    settings.SCHEDULE_CACHE_SHARED_VERSION 이 켜져 있으면 Django 캐시에 저장한
+    의사별 버전을 함께 비교하여, 다른 프로세스에서 바뀐 영업시간도 반영합니다.
+
+    invalidate 할 때마다 프로세스 내 세대(generation)를 올리고, 불러오기를 시작한 뒤
+    세대가 바뀌었으면 불러온 schedule 을 저장하지 않습니다.
+    (무효화 전에 읽은 영업시간이 무효화 뒤에 저장되어 남지 않도록 합니다.)
+    """
+
+    VERSION_KEY = "clinic:schedule-version:{}"
+
+    def __init__(self, max_size=None):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self):
+        return self._max_size or getattr(settings, "SCHEDULE_CACHE_MAX_SIZE", 10000)
+
+    @property
+    def shared_version(self):
+        return getattr(settings, "SCHEDULE_CACHE_SHARED_VERSION", False)
+
+    def get(self, doctor_id):
+        return self.get_many([doctor_id])[doctor_id]
+
+    async def aget(self, doctor_id):
+        return (await self.aget_many([doctor_id]))[doctor_id]
+
+    def get_many(self, doctor_ids):
+        """
+        여러 의사의 schedule을 반환 (캐시에 없는 의사는 한 번의 쿼리로 불러옴)
+        """
+        versions, generation, schedules, missing_ids = self._lookup(doctor_ids)
+        if missing_ids:
+            hours = self._hours_queryset(missing_ids)
+            schedules.update(self._store(missing_ids, hours, versions, generation))
+        return schedules
+
+    async def aget_many(self, doctor_ids):
+        versions, generation, schedules, missing_ids = self._lookup(doctor_ids)
+        if missing_ids:
+            hours = [hours async for hours in self._hours_queryset(missing_ids)]
+            schedules.update(self._store(missing_ids, hours, versions, generation))
+        return schedules
+
+    def _lookup(self, doctor_ids):
+        doctor_ids = set(doctor_ids) - {None}
+        versions = self._versions(doctor_ids)
+        schedules = {}
+        with self._lock:
+            generation = self._generation
+            for doctor_id in doctor_ids:
+                entry = self._entries.get(doctor_id)
+                if entry is None or entry[0] != versions.get(doctor_id):
+                    continue
+                self._entries.move_to_end(doctor_id)
+                schedules[doctor_id] = entry[1]
+            missing_ids = doctor_ids - schedules.keys()
+            self.hits += len(schedules)
+            self.misses += len(missing_ids)
+        return versions, generation, schedules, missing_ids
+
+    def _hours_queryset(self, doctor_ids):
+        BusinessHour = apps.get_model("clinic", "BusinessHour")
+        return BusinessHour.objects.filter(doctor_id__in=doctor_ids)
+
+    def _store(self, doctor_ids, business_hours, versions, generation):
+        loaded = {doctor_id: {} for doctor_id in doctor_ids}
+        for hours in business_hours:
+            loaded[hours.doctor_id][hours.day] = hours
+        with self._lock:
+            if generation != self._generation:
+                # 불러오는 동안 무효화되었으므로 이번 결과만 쓰고 저장하지 않습니다.
+                return loaded
+            for doctor_id, schedule in loaded.items():
+                self._entries[doctor_id] = (versions.get(doctor_id), schedule)
+                self._entries.move_to_end(doctor_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return loaded
+
+    def invalidate(self, doctor_ids):
+        with self._lock:
+            self._generation += 1
+            for doctor_id in doctor_ids:
+                self._entries.pop(doctor_id, None)
+        if self.shared_version:
+            for doctor_id in doctor_ids:
+                key = self.VERSION_KEY.format(doctor_id)
+                try:
+                    cache.incr(key)
+                except ValueError:
+                    cache.set(key, 1, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+    def _versions(self, doctor_ids):
+        if not self.shared_version or not doctor_ids:
+            return {}
+        keys = {
+            self.VERSION_KEY.format(doctor_id): doctor_id for doctor_id in doctor_ids
+        }
+        return {keys[key]: version for key, version in cache.get_many(keys).items()}
+
+
+schedule_cache = ScheduleCache()
@@ -0,0 +1,36 @@
+"""
+의사 검색용 문자 바이그램 역색인
+
+한글은 띄어쓰기 없이 붙여 쓰는 경우가 많아 단어 단위 색인으로는
+'메라키병원'에서 '메라키'를 찾을 수 없으므로, 공백으로 나눈 각 단어를
+연속한 두 글자 단위로 쪼개 색인합니다.
+"""
+
+NGRAM_SIZE = 2
+
+
+def normalize(text):
+    return (text or "").lower()
+
+
+def ngrams(word):
+    word = normalize(word)
+    return {word[i : i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1)}
+
+
+def tokenize(texts):
+    """
+    여러 텍스트에 포함된 단어들의 바이그램 집합
+    """
+    tokens = set()
+    for text in texts:
+        for word in normalize(text).split():
+            tokens |= ngrams(word)
+    return tokens
+
+
+def document_text(texts):
+    """
+    검색 문서 본문 (필드 사이는 줄바꿈으로 구분해 키워드가 필드를 넘어 일치하지 않게 합니다)
+    """
+    return "\n".join(normalize(text) for text in texts if text)
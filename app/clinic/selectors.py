@@ -1,35 +1,55 @@
+from datetime import datetime
+from datetime import time as dt_time
+from datetime import timedelta
+
+from clinic.availability import slots_at
 from clinic.enums import RequestStatus
-from clinic.models import Doctor, TreatmentRequest
-from django.db.models import Q
+from clinic.models import (
+    ArchivedTreatmentRequest,
+    AvailabilityBlock,
+    Doctor,
+    DoctorDepartment,
+    DoctorSearchDocument,
+    DoctorSearchToken,
+    TreatmentRequest,
+    TreatmentRequestChange,
+)
+from clinic.openings import earliest_openings
+from clinic.search import NGRAM_SIZE, normalize
 
+OPENING_WINDOW = timedelta(days=7)
 
-def filter_doctors(filters):
-    doctor_queryset = (
-        Doctor.objects.select_related("hospital")
-        .prefetch_related("hours", "departments", "treatments")
-        .all()
-    )
+
+def filter_doctor_documents(filters):
+    document_queryset = DoctorSearchDocument.objects.all()
     search = filters.get("search", None)
     time = filters.get("time", None)
+    department_id = filters.get("department_id", None)
     if search:
-        search_keywords = search.split(" ")
+        search_keywords = search.split()
+        if any(len(keyword) >= NGRAM_SIZE for keyword in search_keywords):
+            # 역색인으로 후보를 좁힌 뒤, 후보에 대해서만 부분 문자열을 확인합니다.
+            document_queryset = document_queryset.filter(
+                doctor_id__in=DoctorSearchToken.objects.match(search_keywords)
+            )
         for keyword in search_keywords:
-            conditions = (
-                Q(name__icontains=keyword)
-                | Q(hospital__name__icontains=keyword)
-                | Q(departments__name__icontains=keyword)
-                | Q(treatments__name__icontains=keyword)
+            document_queryset = document_queryset.filter(
+                text__contains=normalize(keyword)
             )
-            doctor_queryset = doctor_queryset.filter(conditions).distinct()
 
     if time:
-        day = time.weekday()
-        time = time.time()
-        doctor_queryset = doctor_queryset.filter(
-            hours__day=day, hours__opening_time__lte=time, hours__closing_time__gte=time
+        document_queryset = document_queryset.filter(
+            doctor_id__in=AvailabilityBlock.objects.available_at(*slots_at(time))
         )
 
-    return doctor_queryset
+    if department_id:
+        document_queryset = document_queryset.filter(
+            doctor_id__in=DoctorDepartment.objects.filter(
+                department_id=department_id
+            ).values("doctor_id")
+        )
+
+    return document_queryset
 
 
 def filter_requests(filters):
@@ -43,12 +63,26 @@ def filter_requests(filters):
     return request_queryset
 
 
-def get_doctors(filters=None):
+def filter_archived_requests(filters):
+    # 보관된 요청은 항상 한 달(month) 구간 안에서만 찾습니다.
+    request_queryset = ArchivedTreatmentRequest.objects.select_related(
+        "patient"
+    ).filter(month=filters["month"])
+    doctor_id = filters.get("doctor_id", None)
+    patient_id = filters.get("patient_id", None)
+    if doctor_id:
+        request_queryset = request_queryset.filter(doctor_id=doctor_id)
+    if patient_id:
+        request_queryset = request_queryset.filter(patient_id=patient_id)
+    return request_queryset
+
+
+def get_doctor_documents(filters=None):
     filters = filters or {}
 
-    doctor_queryset = filter_doctors(filters)
+    document_queryset = filter_doctor_documents(filters).defer("text")
 
-    return doctor_queryset
+    return document_queryset
 
 
 def get_requests(filters=None):
@@ -57,3 +91,65 @@ def get_requests(filters=None):
     request_queryset = filter_requests(filters)
 
     return request_queryset
+
+
+def get_archived_requests(filters):
+    request_queryset = filter_archived_requests(filters)
+
+    return request_queryset
+
+
+def get_request_changes():
+    # 커서(after) 이후의 기록만 id 순서로 읽습니다. (SequencePagination)
+    return TreatmentRequestChange.objects.all()
+
+
+def get_next_openings(filters=None):
+    """
+    조건에 맞는 의사별 가장 빠른 진료 가능 시각 (빠른 순, 같으면 의사 id 순)
+
+    지난 시각은 진료 요청을 받을 수 없으므로 start 가 과거이면 현재 시각부터 찾습니다.
+    """
+    filters = filters or {}
+    now = datetime.now()
+    start = max(filters.get("start", None) or now, now)
+    end = filters.get("end", None) or start + OPENING_WINDOW
+    limit = filters.get("limit", None)
+    if end <= start:
+        return []
+
+    doctor_ids = filter_doctor_documents(filters).values("doctor_id")
+    doctors = {
+        doctor_id: (name, slot_minutes)
+        for doctor_id, name, slot_minutes in Doctor.objects.filter(
+            id__in=doctor_ids
+        ).values_list("id", "name", "slot_minutes")
+    }
+    blocks = AvailabilityBlock.objects.filter(doctor_id__in=doctor_ids).values_list(
+        "doctor_id", "block", "mask"
+    )
+    # 슬롯은 자정을 넘지 않으므로 start 가 속한 날부터 차지된 슬롯만 보면 됩니다.
+    accepted = TreatmentRequest.objects.filter(
+        doctor_id__in=doctor_ids,
+        slot_start__gte=datetime.combine(start.date(), dt_time()),
+        slot_start__lt=end,
+    ).values_list("doctor_id", "slot_start")
+
+    # 세 쿼리는 doctor_ids 하위 쿼리를 따로 실행하므로, 그 사이에 추가된 의사의 행은 버립니다.
+    openings = earliest_openings(
+        list(doctors),
+        [slot_minutes for _, slot_minutes in doctors.values()],
+        [row for row in blocks if row[0] in doctors],
+        [row for row in accepted if row[0] in doctors],
+        start,
+        end,
+    )
+    ordered = sorted(openings.items(), key=lambda item: (item[1], item[0]))
+    return [
+        {
+            "doctor_id": doctor_id,
+            "name": doctors[doctor_id][0],
+            "available_datetime": available_datetime,
+        }
+        for doctor_id, available_datetime in ordered[:limit]
+    ]
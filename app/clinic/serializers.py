@@ -1,7 +1,12 @@
+from collections import defaultdict
+
+from clinic.enums import Days
 from clinic.models import (
     BusinessHour,
     Department,
     Doctor,
+    DoctorDepartment,
+    DoctorTreatment,
     Hospital,
     Patient,
     TreatmentRequest,
@@ -73,6 +78,7 @@ class DoctorSerializer(serializers.ModelSerializer):
             "departments",
             "treatments",
             "business_hours",
+            "slot_minutes",
             "hospital_id",
             "department_ids",
             "treatment_ids",
@@ -86,6 +92,102 @@ class DoctorSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+DAY_NAMES = dict(Days.choices())
+
+
+def _hhmm(value):
+    return f"{value.hour:02d}:{value.minute:02d}"
+
+
+def _business_hour_data(row):
+    hours_id, doctor_id, day, opening, closing, lunch_start, lunch_end = row
+    lunch = None
+    if lunch_start is not None:
+        lunch = f"{_hhmm(lunch_start)}~{_hhmm(lunch_end)}"
+    return {
+        "id": hours_id,
+        "day": day,
+        "요일": DAY_NAMES[day],
+        "영업시간": f"{_hhmm(opening)}~{_hhmm(closing)}",
+        "점심시간": lunch,
+        "doctor_id": doctor_id,
+        "opening_time": opening and opening.isoformat(),
+        "closing_time": closing and closing.isoformat(),
+        "lunch_start_time": lunch_start and lunch_start.isoformat(),
+        "lunch_end_time": lunch_end and lunch_end.isoformat(),
+    }
+
+
+class DoctorProjectionSerializer:
+    """
+    DoctorSerializer 와 같은 모양의 읽기 전용 목록 직렬화
+
+    모델 인스턴스와 DRF 필드를 거치지 않고 values_list() 조회 결과를
+    의사별로 묶어 dict 를 만듭니다. 많은 의사를 한 번에 직렬화할 때 사용합니다.
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    @property
+    def data(self):
+        doctors = list(
+            self.queryset.values_list(
+                "id", "name", "hospital_id", "hospital__name", "slot_minutes"
+            )
+        )
+        doctor_ids = [doctor[0] for doctor in doctors]
+
+        departments = defaultdict(list)
+        for doctor_id, department_id, name in (
+            DoctorDepartment.objects.filter(doctor_id__in=doctor_ids)
+            .order_by("id")
+            .values_list("doctor_id", "department_id", "department__name")
+        ):
+            departments[doctor_id].append({"id": department_id, "name": name})
+
+        treatments = defaultdict(list)
+        for doctor_id, treatment_id, name in (
+            DoctorTreatment.objects.filter(doctor_id__in=doctor_ids)
+            .order_by("id")
+            .values_list("doctor_id", "treatment_id", "treatment__name")
+        ):
+            treatments[doctor_id].append({"id": treatment_id, "name": name})
+
+        hours = defaultdict(list)
+        for row in (
+            BusinessHour.objects.filter(doctor_id__in=doctor_ids)
+            .order_by("id")
+            .values_list(
+                "id",
+                "doctor_id",
+                "day",
+                "opening_time",
+                "closing_time",
+                "lunch_start_time",
+                "lunch_end_time",
+            )
+        ):
+            hours[row[1]].append(_business_hour_data(row))
+
+        return [
+            {
+                "id": doctor_id,
+                "name": name,
+                "hospital": (
+                    {"id": hospital_id, "name": hospital_name}
+                    if hospital_id is not None
+                    else None
+                ),
+                "departments": departments[doctor_id],
+                "treatments": treatments[doctor_id],
+                "business_hours": hours[doctor_id],
+                "slot_minutes": slot_minutes,
+            }
+            for doctor_id, name, hospital_id, hospital_name, slot_minutes in doctors
+        ]
+
+
 class PatientSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -93,6 +195,15 @@ class PatientSerializer(serializers.ModelSerializer):
         fields = ["id", "name"]
 
 
+class TreatmentRequestEventSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    doctor_id = serializers.IntegerField()
+    patient = serializers.CharField(source="patient.name", allow_null=True)
+    status = serializers.CharField()
+    desired_datetime = serializers.DateTimeField()
+    expired_datetime = serializers.DateTimeField()
+
+
 class TreatmentRequestSerializer(serializers.ModelSerializer):
     patient_id = serializers.IntegerField(write_only=True)
     doctor_id = serializers.IntegerField(write_only=True)
@@ -1,6 +1,46 @@
+from contextlib import nullcontext
+from datetime import date, datetime
+
+from asgiref.sync import sync_to_async
 from clinic.enums import RequestStatus
-from clinic.models import Doctor, TreatmentRequest
-from rest_framework.exceptions import ValidationError
+from clinic.exceptions import Conflict
+from clinic.models import (
+    ArchivedTreatmentRequest,
+    BusinessHour,
+    Doctor,
+    Patient,
+    TreatmentRequest,
+)
+from clinic.schedule import (
+    get_expired_datetime,
+    get_slot_start,
+    is_business_time,
+    schedule_cache,
+)
+from clinic.signals import treatment_requests_changed
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ValidationError
+
+EXPIRE_CHUNK_SIZE = 1000
+ARCHIVE_CHUNK_SIZE = 1000
+# 더 이상 상태가 바뀌지 않는 요청
+FINISHED_STATUSES = (
+    RequestStatus.ACCEPTED,
+    RequestStatus.REFUSED,
+    RequestStatus.EXPIRED,
+)
+ARCHIVE_FIELDS = (
+    "id",
+    "patient_id",
+    "doctor_id",
+    "desired_datetime",
+    "created_datetime",
+    "expired_datetime",
+    "status",
+    "slot_start",
+)
+BATCH_MAX_SIZE = 1000
 
 
 def create_doctor(validated_data):
@@ -14,22 +54,335 @@ def create_doctor(validated_data):
     return doctor
 
 
+def replace_business_hours(doctor_id, hours_data):
+    """
+    의사의 주간 영업시간 전체를 한 번에 교체
+    """
+    if not Doctor.objects.filter(id=doctor_id).exists():
+        raise NotFound({"detail": "존재하지 않는 의사입니다."})
+
+    hours = [BusinessHour(**data) for data in hours_data]
+    return BusinessHour.objects.replace_week(doctor_id, hours)
+
+
 def create_request(validated_data):
     treatment_request = TreatmentRequest(**validated_data)
+    # 응답에 환자 이름이 들어가므로 검증하면서 함께 불러옵니다.
+    patient = Patient.objects.filter(id=treatment_request.patient_id).first()
+    if patient is None:
+        raise ValidationError({"detail": "존재하지 않는 환자입니다."})
+    treatment_request.patient = patient
     if not treatment_request.is_available:
+        # 거절된 요청도 기록되어 목록에 보이므로 함께 알립니다.
+        _notify([treatment_request])
         raise ValidationError({"detail": "영업 시간이 아닙니다."})
     treatment_request.save()
+    _notify([treatment_request])
     return treatment_request
 
 
+async def acreate_request(validated_data):
+    """
+    create_request 의 비동기 버전 (같은 검증과 기록을 그대로 사용합니다)
+    """
+    return await sync_to_async(create_request)(validated_data)
+
+
+def create_requests(items):
+    """
+    여러 진료 요청을 메모리에서 검증한 뒤 한 번에 생성
+
+    items 순서대로 생성된 TreatmentRequest 또는 에러 dict 목록을 반환합니다.
+    """
+    now = datetime.now()
+    patients = Patient.objects.in_bulk({item["patient_id"] for item in items})
+    doctor_ids = set(
+        Doctor.objects.filter(id__in={item["doctor_id"] for item in items}).values_list(
+            "id", flat=True
+        )
+    )
+    schedules = schedule_cache.get_many(doctor_ids)
+
+    results = []
+    treatment_requests = []
+    for item in items:
+        patient = patients.get(item["patient_id"])
+        doctor_id = item["doctor_id"]
+        desired_datetime = item["desired_datetime"]
+        if patient is None:
+            results.append({"detail": "존재하지 않는 환자입니다."})
+        elif doctor_id not in doctor_ids:
+            results.append({"detail": "존재하지 않는 의사입니다."})
+        elif desired_datetime <= now or not is_business_time(
+            desired_datetime, schedules[doctor_id]
+        ):
+            results.append({"detail": "영업 시간이 아닙니다."})
+        else:
+            treatment_request = TreatmentRequest(
+                patient=patient, doctor_id=doctor_id, desired_datetime=desired_datetime
+            )
+            results.append(treatment_request)
+            treatment_requests.append(treatment_request)
+
+    with transaction.atomic():
+        TreatmentRequest.objects.bulk_create(treatment_requests)
+        _notify(treatment_requests)
+    return results
+
+
+def _notify(treatment_requests):
+    treatment_requests_changed.send(
+        sender=TreatmentRequest, treatment_requests=treatment_requests
+    )
+
+
 def accept_request(request_id):
+    """
+    대기중이고 만료되지 않은 요청만 수락
+
+    요청 행을 한 번 읽고(환자, 슬롯 길이 포함) 영업시간 캐시로 결과를 정한 뒤, 조건부
+    UPDATE 한 번으로 상태를 바꿉니다. 영업시간은 캐시에 없을 때만 조회하고, 다른 요청이
+    먼저 상태를 바꿔 UPDATE 가 실패했을 때만 그 결과를 알리려고 상태를 다시 읽습니다.
+    """
+    now = datetime.now()
     try:
-        treatment_request = TreatmentRequest.objects.get(id=request_id)
+        treatment_request = _acceptable_requests().get(id=request_id)
     except TreatmentRequest.DoesNotExist:
-        raise ValidationError({"detail": "존재하지 않는 진료 요청입니다."})
+        raise NotFound({"detail": "존재하지 않는 진료 요청입니다."})
 
-    if treatment_request.is_expired:
-        raise ValidationError({"detail": "만료된 요청입니다."})
-    treatment_request.status = RequestStatus.ACCEPTED
-    treatment_request.save()
+    _check_acceptable(treatment_request.status)
+
+    schedule = schedule_cache.get(treatment_request.doctor_id)
+    status, condition, error = _next_status(treatment_request, schedule, now)
+    _transition(treatment_request, status, condition)
+    if error:
+        raise error
+    return treatment_request
+
+
+async def aaccept_request(request_id):
+    now = datetime.now()
+    try:
+        treatment_request = await _acceptable_requests().aget(id=request_id)
+    except TreatmentRequest.DoesNotExist:
+        raise NotFound({"detail": "존재하지 않는 진료 요청입니다."})
+
+    _check_acceptable(treatment_request.status)
+
+    schedule = await schedule_cache.aget(treatment_request.doctor_id)
+    status, condition, error = _next_status(treatment_request, schedule, now)
+    await _atransition(treatment_request, status, condition)
+    if error:
+        raise error
     return treatment_request
+
+
+def _acceptable_requests():
+    return TreatmentRequest.objects.select_related("patient").annotate(
+        slot_minutes=F("doctor__slot_minutes")
+    )
+
+
+def _check_acceptable(status):
+    if status == RequestStatus.ACCEPTED:
+        raise Conflict({"detail": "이미 수락된 요청입니다."})
+    if status == RequestStatus.EXPIRED:
+        raise ValidationError({"detail": "만료된 요청입니다."})
+    if status == RequestStatus.REFUSED:
+        raise ValidationError({"detail": "거절된 요청입니다."})
+
+
+def _next_status(treatment_request, schedule, now):
+    """
+    수락 시도로 바뀔 상태, UPDATE 조건, 수락하지 못한 경우의 에러
+    """
+    if treatment_request.desired_datetime <= now or not is_business_time(
+        treatment_request.desired_datetime, schedule
+    ):
+        return (
+            RequestStatus.REFUSED,
+            Q(),
+            ValidationError({"detail": "거절된 요청입니다."}),
+        )
+
+    if treatment_request.expired_datetime is None:
+        treatment_request.expired_datetime = get_expired_datetime(
+            treatment_request.created_datetime, schedule
+        )
+    if treatment_request.expired_datetime <= now:
+        return (
+            RequestStatus.EXPIRED,
+            Q(),
+            ValidationError({"detail": "만료된 요청입니다."}),
+        )
+
+    treatment_request.slot_start = get_slot_start(
+        treatment_request.desired_datetime, treatment_request.slot_minutes
+    )
+    return (
+        RequestStatus.ACCEPTED,
+        Q(expired_datetime__isnull=True) | Q(expired_datetime__gt=now),
+        None,
+    )
+
+
+def _transition(treatment_request, status, condition=Q()):
+    """
+    대기중인 요청의 상태를 바꾸고, 다른 요청이 먼저 상태를 바꿨다면 그 결과로 에러 처리
+    """
+    if not _update_status(treatment_request, status, condition):
+        _raise_transition_error(
+            TreatmentRequest.objects.filter(id=treatment_request.id)
+            .values_list("status", flat=True)
+            .first()
+        )
+
+
+async def _atransition(treatment_request, status, condition=Q()):
+    # 세이브포인트를 쓸 수 있도록 UPDATE 는 동기 함수로 한 스레드에서 실행합니다.
+    if not await sync_to_async(_update_status)(treatment_request, status, condition):
+        _raise_transition_error(
+            await TreatmentRequest.objects.filter(id=treatment_request.id)
+            .values_list("status", flat=True)
+            .afirst()
+        )
+
+
+def _update_status(treatment_request, status, condition):
+    # 경쟁하는 요청이 없으면 이 UPDATE 한 번이 유일한 쓰기입니다.
+    # (변경 기록은 트리거가 같은 문장에서 남깁니다.)
+    # 같은 슬롯이 이미 수락되어 있으면 (doctor, slot_start) 유니크 인덱스가 막습니다.
+    # 바깥 트랜잭션이 있을 때만 세이브포인트로 감싸 실패한 UPDATE 만 되돌립니다.
+    in_atomic_block = transaction.get_connection().in_atomic_block
+    try:
+        with transaction.atomic() if in_atomic_block else nullcontext():
+            updated = TreatmentRequest.objects.filter(
+                condition, id=treatment_request.id, status=RequestStatus.PENDING
+            ).update(
+                status=status,
+                expired_datetime=treatment_request.expired_datetime,
+                slot_start=treatment_request.slot_start,
+            )
+    except IntegrityError:
+        raise Conflict({"detail": "이미 수락된 진료 요청이 있는 시간입니다."})
+    if updated:
+        treatment_request.status = status
+        # 비동기 서비스도 이 함수를 스레드에서 실행하므로 여기서 알립니다.
+        _notify([treatment_request])
+    return updated
+
+
+def _raise_transition_error(current):
+    if current is None:
+        raise NotFound({"detail": "존재하지 않는 진료 요청입니다."})
+    _check_acceptable(current)
+    raise ValidationError({"detail": "만료된 요청입니다."})
+
+
+def _pending_requests():
+    return TreatmentRequest.objects.filter(status=RequestStatus.PENDING)
+
+
+def _update_status_in_chunks(queryset, status, chunk_size):
+    updated = 0
+    last_id = 0
+    while True:
+        ids = list(
+            queryset.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not ids:
+            return updated
+        updated += _pending_requests().filter(id__in=ids).update(status=status)
+        last_id = ids[-1]
+
+
+def fill_expired_datetimes(chunk_size=EXPIRE_CHUNK_SIZE):
+    """
+    만료 시각이 계산되지 않은 대기중 요청들의 만료 시각을 일괄 계산
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        treatment_requests = list(
+            _pending_requests()
+            .filter(expired_datetime__isnull=True, id__gt=last_id)
+            .order_by("id")
+            .only("id", "doctor_id", "created_datetime")[:chunk_size]
+        )
+        if not treatment_requests:
+            return updated
+        last_id = treatment_requests[-1].id
+
+        schedules = schedule_cache.get_many(
+            {request.doctor_id for request in treatment_requests}
+        )
+
+        changed = []
+        for treatment_request in treatment_requests:
+            schedule = schedules.get(treatment_request.doctor_id)
+            if not schedule:
+                continue
+            treatment_request.expired_datetime = get_expired_datetime(
+                treatment_request.created_datetime, schedule
+            )
+            changed.append(treatment_request)
+        updated += TreatmentRequest.objects.bulk_update(changed, ["expired_datetime"])
+
+
+def expire_requests(now=None, chunk_size=EXPIRE_CHUNK_SIZE):
+    """
+    대기중인 요청 중 희망 시각이 지난 요청은 거절, 만료 시각이 지난 요청은 만료 처리
+    """
+    now = now or datetime.now()
+    refused = _update_status_in_chunks(
+        _pending_requests().filter(desired_datetime__lte=now),
+        RequestStatus.REFUSED,
+        chunk_size,
+    )
+    computed = fill_expired_datetimes(chunk_size)
+    expired = _update_status_in_chunks(
+        _pending_requests().filter(expired_datetime__lte=now),
+        RequestStatus.EXPIRED,
+        chunk_size,
+    )
+    return {"refused": refused, "computed": computed, "expired": expired}
+
+
+def archive_requests(before, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    희망 시각이 before 이전인 끝난 요청(수락/거절/만료)을 보관 테이블로 이동
+
+    청크마다 복사와 삭제를 한 트랜잭션으로 처리하므로 중간에 멈춰도 다시 실행하면 됩니다.
+    """
+    # 아직 지나지 않은 수락 요청을 옮기면 슬롯 유니크 인덱스에서 빠져 중복 예약이 가능해집니다.
+    before = min(before, datetime.now())
+    archived = 0
+    for status in FINISHED_STATUSES:
+        # (status, desired_datetime) 인덱스 순서대로 앞에서부터 옮깁니다.
+        queryset = TreatmentRequest.objects.filter(
+            status=status, desired_datetime__lt=before
+        ).order_by("desired_datetime")
+        while True:
+            with transaction.atomic():
+                rows = list(queryset.values(*ARCHIVE_FIELDS)[:chunk_size])
+                if not rows:
+                    break
+                ArchivedTreatmentRequest.objects.bulk_create(
+                    [
+                        ArchivedTreatmentRequest(
+                            month=get_month(row["desired_datetime"]), **row
+                        )
+                        for row in rows
+                    ]
+                )
+                TreatmentRequest.objects.filter(
+                    id__in=[row["id"] for row in rows]
+                ).delete()
+            archived += len(rows)
+    return archived
+
+
+def get_month(value):
+    return date(value.year, value.month, 1)
@@ -0,0 +1,38 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.dispatch import Signal
+
+# 의사의 영업시간이 바뀌었을 때 발생 (kwargs: doctor_ids)
+business_hours_changed = Signal()
+
+# 의사의 검색 대상 정보(이름, 병원, 진료과, 비급여진료과목)가 바뀌었을 때 발생
+# (kwargs: doctor_ids)
+doctors_changed = Signal()
+
+# 대량 가져오기로 의사와 영업시간이 함께 만들어졌을 때 발생 (kwargs: doctor_ids)
+# 두 시그널의 파생 데이터를 모두 만들되 검색 문서는 한 번만 다시 만듭니다.
+doctors_created = Signal()
+
+# True 이면 영업시간 행마다 보내는 알림(post_save, post_delete 수신기)을 건너뜁니다.
+_business_hours_batch = ContextVar("business_hours_batch", default=False)
+
+
+@contextmanager
+def business_hours_batch():
+    """
+    블록 안의 영업시간 저장, 삭제는 행마다 알리지 않음 (호출한 쪽이 끝난 뒤 한 번 알립니다)
+    """
+    token = _business_hours_batch.set(True)
+    try:
+        yield
+    finally:
+        _business_hours_batch.reset(token)
+
+
+def in_business_hours_batch():
+    return _business_hours_batch.get()
+
+
+# 진료 요청이 생성되거나 상태가 바뀌었을 때 발생 (kwargs: treatment_requests)
+treatment_requests_changed = Signal()
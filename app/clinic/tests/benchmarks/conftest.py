@@ -0,0 +1,316 @@
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from datetime import time as dt_time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from clinic.enums import Days
+from clinic.models import (
+    BusinessHour,
+    Department,
+    Doctor,
+    DoctorDepartment,
+    Hospital,
+    Patient,
+    TreatmentRequest,
+)
+from clinic.signals import doctors_created
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+
+# CLINIC_BENCHMARK_SCALE 로 선택하는 데이터 규모
+SCALES = {
+    "small": {"doctors": 10, "requests": 1_000},
+    "medium": {"doctors": 10_000, "requests": 100_000},
+    "large": {"doctors": 10_000, "requests": 1_000_000},
+}
+CHUNK_SIZE = 5_000
+DEPARTMENT_NAMES = ["정형외과", "내과", "일반의", "한의사", "소아과", "피부과"]
+
+
+def next_monday():
+    today = datetime.now().date() + timedelta(days=1)
+    return today + timedelta(days=(Days.monday.value - today.weekday()) % 7)
+
+
+def seed(doctors, requests):
+    """
+    벤치마크용 데이터 생성 (의사는 평일 09~18시, 12~13시 점심시간)
+    """
+    hospitals = Hospital.objects.bulk_create(
+        [Hospital(name=f"메라키병원{i}") for i in range(max(doctors // 10, 1))]
+    )
+    departments = Department.objects.bulk_create(
+        [Department(name=name) for name in DEPARTMENT_NAMES]
+    )
+    doctor_objs = Doctor.objects.bulk_create(
+        [
+            Doctor(name=f"의사{i}", hospital=hospitals[i % len(hospitals)])
+            for i in range(doctors)
+        ],
+        batch_size=CHUNK_SIZE,
+    )
+    DoctorDepartment.objects.bulk_create(
+        [
+            DoctorDepartment(
+                doctor=doctor, department=departments[i % len(departments)]
+            )
+            for i, doctor in enumerate(doctor_objs)
+        ],
+        batch_size=CHUNK_SIZE,
+    )
+    BusinessHour.objects.bulk_create(
+        [
+            BusinessHour(
+                doctor=doctor,
+                day=day,
+                opening_time=dt_time(9, 0),
+                lunch_start_time=dt_time(12, 0),
+                lunch_end_time=dt_time(13, 0),
+                closing_time=dt_time(18, 0),
+            )
+            for doctor in doctor_objs
+            for day in Days.values()[:5]
+        ],
+        batch_size=CHUNK_SIZE,
+        notify=False,
+    )
+    doctors_created.send(
+        sender=Doctor, doctor_ids={doctor.id for doctor in doctor_objs}
+    )
+
+    patients = Patient.objects.bulk_create(
+        [Patient(name=f"환자{i}") for i in range(1_000)]
+    )
+    desired_datetime = datetime.combine(next_monday(), dt_time(10, 0))
+    for start in range(0, requests, CHUNK_SIZE):
+        TreatmentRequest.objects.bulk_create(
+            [
+                TreatmentRequest(
+                    doctor=doctor_objs[i % doctors],
+                    patient=patients[i % len(patients)],
+                    desired_datetime=desired_datetime
+                    + timedelta(minutes=15 * (i // doctors % 8)),
+                )
+                for i in range(start, min(start + CHUNK_SIZE, requests))
+            ]
+        )
+    return doctor_objs, patients
+
+
+class BenchmarkRegressionWarning(UserWarning):
+    pass
+
+
+class BenchmarkRecorder:
+    """
+    시나리오별 지연 시간(p50/p99)과 쿼리 수를 기록하고 기준값과 비교
+
+    쿼리 수는 기기와 관계없이 같으므로 기준값보다 늘면 측정한 테스트를 실패시키고,
+    지연 시간은 기준값을 잰 기기와 다를 수 있으므로 threshold 이상 느려지면 경고만 합니다.
+    """
+
+    def __init__(self, scale, baseline=None, threshold=0.2):
+        self.scale = scale
+        self.results = {}
+        # 기준 JSON 이 없으면 (다른 규모 등) 비교하지 않습니다.
+        self.baseline = baseline and baseline.get("results", {})
+        self.threshold = threshold
+
+    def measure(self, name, func, iterations):
+        durations = []
+        queries = []
+        for i in range(iterations):
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                func(i)
+                durations.append((time.perf_counter() - started) * 1000)
+            queries.append(len(context.captured_queries))
+        durations.sort()
+        self.record(
+            name,
+            {
+                "p50_ms": round(statistics.median(durations), 3),
+                "p99_ms": round(durations[int(len(durations) * 0.99) - 1], 3),
+                "queries": max(queries),
+            },
+        )
+
+    def measure_throughput(self, name, func, iterations):
+        """
+        func 가 반환한 바이트 수로 처리량(MB/s)을 기록
+        """
+        durations = []
+        size = 0
+        for _ in range(iterations):
+            started = time.perf_counter()
+            size = func()
+            durations.append(time.perf_counter() - started)
+        median = statistics.median(durations)
+        result = {
+            "p50_ms": round(median * 1000, 3),
+            "p99_ms": round(
+                sorted(durations)[int(len(durations) * 0.99) - 1] * 1000, 3
+            ),
+            "queries": 0,
+            "bytes": size,
+            "mb_per_s": round(size / median / 1_000_000, 1),
+        }
+        self.record(name, result)
+
+    def measure_concurrent(self, name, func, total, concurrency):
+        """
+        비동기 func 를 concurrency 개씩 동시에 total 번 실행하고 초당 처리량을 기록
+        """
+        durations = []
+
+        async def worker(semaphore, i):
+            async with semaphore:
+                started = time.perf_counter()
+                await func(i)
+                durations.append((time.perf_counter() - started) * 1000)
+
+        async def run():
+            semaphore = asyncio.Semaphore(concurrency)
+            await asyncio.gather(*(worker(semaphore, i) for i in range(total)))
+
+        started = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - started
+        durations.sort()
+        result = {
+            "p50_ms": round(statistics.median(durations), 3),
+            "p99_ms": round(durations[int(len(durations) * 0.99) - 1], 3),
+            "queries": 0,
+            "concurrency": concurrency,
+            "req_per_s": round(total / elapsed, 1),
+        }
+        self.record(name, result)
+
+    def measure_mixed(self, name, read, write, readers, writers, duration):
+        """
+        readers 개 스레드는 read 를, writers 개 스레드는 write 를 duration 초 동안 반복하고
+        초당 읽기/쓰기 수와 잠금 에러 수를 기록
+
+        read/write 는 처리했으면 True, 잠금 에러로 실패했으면 False 를 반환합니다.
+        """
+        deadline = time.perf_counter() + duration
+        lock = threading.Lock()
+        read_durations = []
+        counts = {"reads": 0, "writes": 0, "lock_errors": 0}
+
+        def worker(func, kind, i):
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    ok = func(i)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        if not ok:
+                            counts["lock_errors"] += 1
+                        else:
+                            counts[kind] += 1
+                            if kind == "reads":
+                                read_durations.append(elapsed)
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=readers + writers) as executor:
+            futures = [
+                executor.submit(worker, read, "reads", i) for i in range(readers)
+            ]
+            futures += [
+                executor.submit(worker, write, "writes", i) for i in range(writers)
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - started
+        read_durations.sort()
+        result = {
+            "p50_ms": round(statistics.median(read_durations or [0]), 3),
+            "p99_ms": round(
+                (
+                    read_durations[int(len(read_durations) * 0.99) - 1]
+                    if read_durations
+                    else 0
+                ),
+                3,
+            ),
+            "queries": 0,
+            "reads_per_s": round(counts["reads"] / elapsed, 1),
+            "writes_per_s": round(counts["writes"] / elapsed, 1),
+            "lock_errors": counts["lock_errors"],
+        }
+        self.record(name, result)
+
+    def write(self, path):
+        path.write_text(
+            json.dumps(
+                {"scale": self.scale, "results": self.results},
+                ensure_ascii=False,
+                indent=2,
+            )
+            + "\n"
+        )
+
+    def record(self, name, result):
+        self.results[name] = result
+        if self.baseline is None:
+            return
+        expected = self.baseline.get(name)
+        if expected is None:
+            warnings.warn(
+                f"{name}: 기준값이 없습니다. 기준 JSON 을 다시 만들어 주세요.",
+                BenchmarkRegressionWarning,
+            )
+            return
+        if result["p50_ms"] > expected["p50_ms"] * (1 + self.threshold):
+            warnings.warn(
+                f"{name}: p50 {expected['p50_ms']}ms -> {result['p50_ms']}ms",
+                BenchmarkRegressionWarning,
+            )
+        if result["queries"] > expected["queries"]:
+            pytest.fail(f"{name}: queries {expected['queries']} -> {result['queries']}")
+
+
+@pytest.fixture(scope="session")
+def benchmark_scale():
+    return os.environ.get("CLINIC_BENCHMARK_SCALE", "small")
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder(benchmark_scale):
+    """
+    세션 동안의 결과를 모아 CLINIC_BENCHMARK_OUTPUT(기본: bench-<scale>.json)에 저장
+
+    CLINIC_BENCHMARK_BASELINE(기본: baseline-<scale>.json)이 있으면 측정할 때마다 비교해
+    쿼리 수가 늘면 실패하고, p50 이 CLINIC_BENCHMARK_THRESHOLD(기본 0.2) 이상 늘면 경고합니다.
+    """
+    baseline = Path(
+        os.environ.get(
+            "CLINIC_BENCHMARK_BASELINE",
+            BENCHMARK_DIR / f"baseline-{benchmark_scale}.json",
+        )
+    )
+    recorder = BenchmarkRecorder(
+        benchmark_scale,
+        baseline=json.loads(baseline.read_text()) if baseline.exists() else None,
+        threshold=float(os.environ.get("CLINIC_BENCHMARK_THRESHOLD", "0.2")),
+    )
+    yield recorder
+
+    output = Path(
+        os.environ.get("CLINIC_BENCHMARK_OUTPUT", f"bench-{benchmark_scale}.json")
+    )
+    recorder.write(output)
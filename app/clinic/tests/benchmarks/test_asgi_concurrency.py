@@ -0,0 +1,101 @@
+"""
+ASGI 동시 처리량 벤치마크 (동기 APIView 와 비동기 뷰 비교)
+
+config.asgi.application 을 ASGI 서버 없이 직접 호출하여,
+CONCURRENCY 개의 요청을 동시에 보낼 때의 초당 처리량을 비교합니다.
+
+    CLINIC_BENCHMARK=1 pytest clinic/tests/benchmarks/test_asgi_concurrency.py
+"""
+
+import asyncio
+import os
+from datetime import datetime, time
+from urllib.parse import urlencode
+
+import pytest
+from clinic.tests.benchmarks.conftest import SCALES, next_monday, seed
+from django.urls import reverse
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("CLINIC_BENCHMARK"),
+        reason="CLINIC_BENCHMARK=1 일 때만 실행합니다.",
+    ),
+]
+
+TOTAL = 500
+CONCURRENCY = 50
+
+
+async def asgi_get(application, path, params):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": urlencode(params).encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver")],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 0),
+    }
+    disconnected = asyncio.Event()
+    messages = []
+
+    async def receive():
+        if messages:
+            # 응답이 끝날 때까지 연결을 유지합니다.
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+        messages.append(None)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    disconnected.set()
+    assert messages[1]["status"] == 200
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_concurrency_benchmarks(benchmark_scale, benchmark_recorder):
+    # given
+    from config.asgi import application
+
+    scale = SCALES[benchmark_scale]
+    doctors, _ = seed(scale["doctors"], scale["requests"])
+    # 15분 단위가 아닌 시각은 응답 캐시를 쓰지 않으므로 매번 DB 를 조회합니다.
+    open_time = datetime.combine(next_monday(), time(10, 5)).isoformat()
+    scenarios = [
+        ("doctor_list", "clinic:doctor-list", lambda i: {"time": open_time}),
+        (
+            "treatment_request_list",
+            "clinic:treatment-request-list",
+            lambda i: {"doctor_id": doctors[i % len(doctors)].id},
+        ),
+    ]
+
+    # when
+    for name, url_name, params in scenarios:
+        for prefix, path in (
+            ("sync", reverse(url_name)),
+            ("async", reverse(url_name.replace(":", ":async-"))),
+        ):
+            benchmark_recorder.measure_concurrent(
+                f"asgi_{name}_{prefix}",
+                lambda i: asgi_get(application, path, params(i)),
+                TOTAL,
+                CONCURRENCY,
+            )
+
+    # then
+    assert all(
+        benchmark_recorder.results[f"asgi_{name}_{prefix}"]["req_per_s"] > 0
+        for name, _, _ in scenarios
+        for prefix in ("sync", "async")
+    )
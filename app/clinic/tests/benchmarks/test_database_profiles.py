@@ -0,0 +1,132 @@
+"""
+SQLite 데이터베이스 프로필 벤치마크 (development 와 production 비교)
+
+읽기(의사 검색, 진료 요청 목록)와 쓰기(진료 요청 생성, 수락)를 여러 스레드에서
+동시에 보내면서 초당 읽기/쓰기 수와 잠금 에러(database is locked) 수를 비교합니다.
+
+    CLINIC_BENCHMARK=1 pytest clinic/tests/benchmarks/test_database_profiles.py
+"""
+
+import os
+import queue
+from contextlib import contextmanager
+from datetime import datetime, time
+
+import pytest
+from clinic.enums import RequestStatus
+from clinic.models import TreatmentRequest
+from clinic.tests.benchmarks.conftest import SCALES, next_monday, seed
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, connection, connections
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("CLINIC_BENCHMARK"),
+        reason="CLINIC_BENCHMARK=1 일 때만 실행합니다.",
+    ),
+]
+
+DURATION = 3
+READERS = 8
+WRITERS = 4
+
+
+@contextmanager
+def database_profile(name):
+    """
+    새로 만들어지는 연결에 프로필의 CONN_MAX_AGE 와 PRAGMA 를 적용
+    """
+    profile = settings.DATABASE_PROFILES[name]
+    # 스레드마다 만드는 연결은 이 설정 dict 를 함께 씁니다.
+    settings_dict = connections.settings["default"]
+    previous = settings_dict["CONN_MAX_AGE"]
+    connections.close_all()
+    settings_dict["CONN_MAX_AGE"] = profile["CONN_MAX_AGE"]
+    try:
+        with override_settings(SQLITE_PRAGMAS=profile["SQLITE_PRAGMAS"]):
+            # journal_mode 는 DB 파일에 남으므로 이전 프로필의 값을 되돌립니다.
+            journal_mode = profile["SQLITE_PRAGMAS"].get("journal_mode", "delete")
+            with connection.cursor() as cursor:
+                cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
+            yield
+    finally:
+        connections.close_all()
+        settings_dict["CONN_MAX_AGE"] = previous
+
+
+@pytest.mark.django_db(transaction=True)
+def test_database_profile_benchmarks(benchmark_scale, benchmark_recorder):
+    # given
+    scale = SCALES[benchmark_scale]
+    doctors, patients = seed(scale["doctors"], scale["requests"])
+    doctor_url = reverse("clinic:doctor-list")
+    request_url = reverse("clinic:treatment-request-list")
+    # 15분 단위가 아닌 시각은 응답 캐시를 쓰지 않으므로 매번 DB 를 조회합니다.
+    open_time = datetime.combine(next_monday(), time(10, 5))
+    pending_ids = queue.SimpleQueue()
+    for request_id in (
+        TreatmentRequest.objects.filter(status=RequestStatus.PENDING)
+        .order_by("id")
+        .values_list("id", flat=True)
+    ):
+        pending_ids.put(request_id)
+
+    def call(func):
+        try:
+            res = func(APIClient())
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            return False
+        finally:
+            # 테스트 클라이언트는 요청이 끝나도 연결을 정리하지 않으므로
+            # WSGI 핸들러와 같이 CONN_MAX_AGE 에 따라 연결을 닫습니다.
+            close_old_connections()
+        assert res.status_code < 500
+        return True
+
+    def read(i):
+        if i % 2:
+            return call(lambda client: client.get(doctor_url, {"time": open_time}))
+        return call(
+            lambda client: client.get(
+                request_url, {"doctor_id": doctors[i % len(doctors)].id}
+            )
+        )
+
+    def write(i):
+        if i % 2:
+            try:
+                request_id = pending_ids.get_nowait()
+            except queue.Empty:
+                # 수락할 대기 요청을 모두 썼으면 새 진료 요청을 보냅니다.
+                pass
+            else:
+                url = reverse("clinic:treatment-request-accept", args=[request_id])
+                return call(lambda client: client.patch(url))
+        data = {
+            "patient_id": patients[i % len(patients)].id,
+            "doctor_id": doctors[i % len(doctors)].id,
+            "desired_datetime": open_time,
+        }
+        return call(lambda client: client.post(request_url, data))
+
+    # when
+    for name in ("development", "production"):
+        with database_profile(name):
+            benchmark_recorder.measure_mixed(
+                f"mixed_read_write_{name}", read, write, READERS, WRITERS, DURATION
+            )
+
+    # then
+    development = benchmark_recorder.results["mixed_read_write_development"]
+    production = benchmark_recorder.results["mixed_read_write_production"]
+    # development 는 잠금을 짧게(busy_timeout) 기다리므로 잠금 에러가 나고,
+    # production 은 WAL 로 읽기가 쓰기를 기다리지 않고 잠금을 충분히 기다립니다.
+    assert development["lock_errors"] > 0
+    assert production["lock_errors"] < development["lock_errors"]
+    assert production["reads_per_s"] > development["reads_per_s"]
@@ -0,0 +1,103 @@
+"""
+엔드포인트 벤치마크
+
+    CLINIC_BENCHMARK=1 CLINIC_BENCHMARK_SCALE=medium pytest clinic/tests/benchmarks
+"""
+
+import os
+from datetime import datetime, time
+
+import pytest
+from clinic.enums import RequestStatus
+from clinic.models import TreatmentRequest
+from clinic.tests.benchmarks.conftest import SCALES, next_monday, seed
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("CLINIC_BENCHMARK"),
+        reason="CLINIC_BENCHMARK=1 일 때만 실행합니다.",
+    ),
+]
+
+ITERATIONS = 50
+
+
+@pytest.mark.django_db
+def test_endpoint_benchmarks(benchmark_scale, benchmark_recorder):
+    # given
+    scale = SCALES[benchmark_scale]
+    doctors, patients = seed(scale["doctors"], scale["requests"])
+    client = APIClient()
+    doctor_url = reverse("clinic:doctor-list")
+    request_url = reverse("clinic:treatment-request-list")
+    opening_url = reverse("clinic:doctor-next-available")
+    open_time = datetime.combine(next_monday(), time(10, 0))
+    pending_ids = list(
+        TreatmentRequest.objects.filter(status=RequestStatus.PENDING)
+        .order_by("id")
+        .values_list("id", flat=True)[:ITERATIONS]
+    )
+
+    def get(url, params):
+        res = client.get(url, params)
+        assert res.status_code == 200
+
+    # when
+    benchmark_recorder.measure(
+        "doctor_list_search",
+        lambda i: get(doctor_url, {"search": "메라키 내과"}),
+        ITERATIONS,
+    )
+    benchmark_recorder.measure(
+        "doctor_list_time",
+        lambda i: get(doctor_url, {"time": open_time}),
+        ITERATIONS,
+    )
+    benchmark_recorder.measure(
+        "doctor_list_search_time",
+        lambda i: get(doctor_url, {"search": "메라키 내과", "time": open_time}),
+        ITERATIONS,
+    )
+    benchmark_recorder.measure(
+        "doctor_next_available",
+        lambda i: get(opening_url, {"start": open_time.replace(hour=8)}),
+        ITERATIONS,
+    )
+    benchmark_recorder.measure(
+        "treatment_request_list",
+        lambda i: get(request_url, {"doctor_id": doctors[i % len(doctors)].id}),
+        ITERATIONS,
+    )
+
+    def post(i):
+        data = {
+            "patient_id": patients[i % len(patients)].id,
+            "doctor_id": doctors[i % len(doctors)].id,
+            "desired_datetime": open_time,
+        }
+        res = client.post(request_url, data)
+        assert res.status_code == 201
+
+    benchmark_recorder.measure("treatment_request_create", post, ITERATIONS)
+
+    def accept(i):
+        url = reverse("clinic:treatment-request-accept", args=[pending_ids[i]])
+        res = client.patch(url)
+        assert res.status_code == 200
+
+    benchmark_recorder.measure("treatment_request_accept", accept, ITERATIONS)
+
+    # then
+    # 기록기는 세션 전체에서 공유되므로 다른 벤치마크 결과가 함께 있을 수 있습니다.
+    assert set(benchmark_recorder.results) >= {
+        "doctor_list_search",
+        "doctor_list_time",
+        "doctor_list_search_time",
+        "doctor_next_available",
+        "treatment_request_list",
+        "treatment_request_create",
+        "treatment_request_accept",
+    }
@@ -0,0 +1,48 @@
+"""
+JSON 렌더러 벤치마크 (의사 목록 한 페이지 분량의 처리량)
+
+    CLINIC_BENCHMARK=1 pytest clinic/tests/benchmarks/test_renderer_throughput.py
+"""
+
+import os
+
+import pytest
+from clinic.models import Doctor
+from clinic.pagination import KeysetPagination
+from clinic.renderers import FastJSONRenderer
+from clinic.serializers import DoctorProjectionSerializer
+from clinic.tests.benchmarks.conftest import SCALES, seed
+from rest_framework.renderers import JSONRenderer
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        not os.environ.get("CLINIC_BENCHMARK"),
+        reason="CLINIC_BENCHMARK=1 일 때만 실행합니다.",
+    ),
+]
+
+ITERATIONS = 50
+
+
+@pytest.mark.django_db
+def test_renderer_benchmarks(benchmark_scale, benchmark_recorder):
+    # given
+    seed(SCALES[benchmark_scale]["doctors"], 0)
+    data = DoctorProjectionSerializer(
+        Doctor.objects.order_by("id")[: KeysetPagination.max_page_size]
+    ).data
+
+    # when
+    for name, renderer in (
+        ("render_doctor_list_drf", JSONRenderer()),
+        ("render_doctor_list_fast", FastJSONRenderer()),
+    ):
+        benchmark_recorder.measure_throughput(
+            name, lambda: len(renderer.render(data)), ITERATIONS
+        )
+
+    # then
+    drf = benchmark_recorder.results["render_doctor_list_drf"]
+    fast = benchmark_recorder.results["render_doctor_list_fast"]
+    assert drf["bytes"] == fast["bytes"]
@@ -10,6 +10,8 @@ from clinic.models import (
     Patient,
     TreatmentRequest,
 )
+from clinic.schedule import schedule_cache
+from django.core.cache import cache
 
 
 def get_next_weekday(weekday, date):
@@ -20,6 +22,12 @@ def get_next_weekday(weekday, date):
     return next_weekday
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    schedule_cache.clear()
+    cache.clear()
+
+
 @pytest.fixture
 def next_weekday():
     return get_next_weekday
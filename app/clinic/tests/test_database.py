@@ -0,0 +1,29 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="SQLite 연결 설정만 검사합니다."
+)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sqlite_pragmas_on_connect():
+    """
+    새 SQLite 연결마다 SQLITE_PRAGMAS 가 적용되는지 테스트
+    """
+    # given
+    pragmas = {"cache_size": -1234, "busy_timeout": 4321, "synchronous": "normal"}
+
+    with override_settings(SQLITE_PRAGMAS=pragmas):
+        # when
+        connection.close()
+        with connection.cursor() as cursor:
+            values = {}
+            for name in pragmas:
+                cursor.execute(f"PRAGMA {name}")
+                values[name] = cursor.fetchone()[0]
+
+    # then
+    assert values == {"cache_size": -1234, "busy_timeout": 4321, "synchronous": 1}
+    connection.close()
@@ -1,13 +1,35 @@
+import json
+import random
 from datetime import datetime, time, timedelta
+from io import StringIO
 
 import pytest
-from clinic.models import BusinessHour, Doctor, UninsuredTreatment
-from clinic.serializers import DoctorSerializer
+from clinic.availability import datetime_to_slot
+from clinic.caching import get_data_version
+from clinic.enums import Days, RequestStatus
+from clinic.models import (
+    AvailabilityBlock,
+    BusinessHour,
+    Doctor,
+    DoctorSearchDocument,
+    DoctorSearchToken,
+    Hospital,
+    ImportProgress,
+    TreatmentRequest,
+    UninsuredTreatment,
+)
+from clinic.schedule import get_slot_start, is_business_time, schedule_cache
+from clinic.selectors import get_next_openings
+from clinic.serializers import DoctorProjectionSerializer, DoctorSerializer
+from clinic.signals import business_hours_changed
+from django.core.management import CommandError, call_command
 from django.urls import reverse
 from pytest_django import DjangoAssertNumQueries
 from rest_framework.test import APIClient
 
 DOCTOR_URL = reverse("clinic:doctor-list")
+OPENING_URL = reverse("clinic:doctor-next-available")
+SLOT_END = timedelta(minutes=4, seconds=59)
 
 
 @pytest.mark.django_db
@@ -122,3 +144,743 @@ def test_search_doctor_with_hours(doctors):
     serializer = DoctorSerializer(doctor2)
     assert res.status_code == 200
     assert res.data == [serializer.data]
+
+
+@pytest.mark.django_db
+def test_search_doctor_with_hours_excludes_lunch_time(doctors, next_weekday):
+    # given
+    doctor, _ = doctors
+    monday = next_weekday(Days.monday.value, datetime.now()).date()
+    hours = BusinessHour.objects.create(
+        doctor=doctor,
+        day=Days.monday.value,
+        opening_time=time(9, 0),
+        lunch_start_time=time(12, 0),
+        lunch_end_time=time(13, 0),
+        closing_time=time(18, 0),
+    )
+
+    # when
+    client = APIClient()
+    lunch = client.get(DOCTOR_URL, {"time": datetime.combine(monday, time(12, 30))})
+    afternoon = client.get(DOCTOR_URL, {"time": datetime.combine(monday, time(13, 0))})
+
+    # then
+    assert lunch.status_code == 200
+    assert lunch.data == []
+    assert afternoon.data == [DoctorSerializer(doctor).data]
+
+    # when
+    hours.lunch_start_time = None
+    hours.lunch_end_time = None
+    hours.save()
+    lunch = client.get(DOCTOR_URL, {"time": datetime.combine(monday, time(12, 30))})
+
+    # then
+    assert lunch.data == [DoctorSerializer(doctor).data]
+
+
+@pytest.mark.django_db
+def test_search_doctor_at_session_end_matches_booking(doctors, patients, next_weekday):
+    """
+    세션이 끝나는 시각에 검색과 진료 요청이 같은 판단을 하는지 테스트
+    """
+    # given
+    doctor, _ = doctors
+    monday = next_weekday(Days.monday.value, datetime.now()).date()
+    BusinessHour.objects.create(
+        doctor=doctor,
+        day=Days.monday.value,
+        opening_time=time(9, 0),
+        lunch_start_time=time(12, 0),
+        lunch_end_time=time(13, 0),
+        closing_time=time(18, 0),
+    )
+    client = APIClient()
+    request_url = reverse("clinic:treatment-request-list")
+
+    for value, available in (
+        (time(12, 0), True),
+        (time(12, 0, 1), False),
+        (time(18, 0), True),
+        (time(18, 0, 1), False),
+        (time(18, 5), False),
+    ):
+        desired_datetime = datetime.combine(monday, value)
+
+        # when
+        search = client.get(DOCTOR_URL, {"time": desired_datetime})
+        booking = client.post(
+            request_url,
+            {
+                "patient_id": patients[0].id,
+                "doctor_id": doctor.id,
+                "desired_datetime": desired_datetime,
+            },
+        )
+
+        # then
+        assert search.status_code == 200
+        assert (search.data == [DoctorSerializer(doctor).data]) is available
+        assert (booking.status_code == 201) is available
+
+
+@pytest.mark.django_db
+def test_search_index_follows_related_changes(doctors, departments, hospital):
+    """
+    검색 역색인 갱신 테스트
+    """
+    # given
+    doctor, doctor2 = doctors
+    client = APIClient()
+
+    # when
+    hospital.name = "새싹병원"
+    hospital.save()
+    doctor.departments.remove(departments[2])
+
+    # then
+    res = client.get(DOCTOR_URL, {"search": "메라키"})
+    assert res.data == []
+    res = client.get(DOCTOR_URL, {"search": "새싹 일반의"})
+    assert [row["id"] for row in res.data] == [doctor2.id]
+
+    # when
+    departments[3].delete()
+
+    # then
+    res = client.get(DOCTOR_URL, {"search": "한의사"})
+    assert res.data == []
+    assert not doctor2.search_tokens.filter(token="한의").exists()
+
+
+@pytest.mark.django_db
+def test_search_response_cache(
+    doctor_with_hours, hospital, next_weekday, django_assert_num_queries
+):
+    """
+    의사 검색 응답 캐시 테스트
+    """
+    # given
+    client = APIClient()
+    monday = next_weekday(Days.monday.value, datetime.now()).date()
+    params = {"search": "메라키", "time": datetime.combine(monday, time(10))}
+    first = client.get(DOCTOR_URL, params)
+
+    # when
+    with django_assert_num_queries(0):
+        cached = client.get(DOCTOR_URL, params)
+
+    # then
+    assert cached.status_code == 200
+    assert first.data
+    assert cached.content == first.content
+    assert cached.data == first.data
+
+    # when
+    hospital.name = "새싹병원"
+    hospital.save()
+
+    # then
+    assert client.get(DOCTOR_URL, params).data == []
+    res = client.get(DOCTOR_URL, {**params, "search": "새싹"})
+    assert [row["id"] for row in res.data] == [row["id"] for row in first.data]
+
+
+@pytest.mark.django_db
+def test_search_cache_version_bumped_on_commit(
+    doctor_with_hours, hospital, django_capture_on_commit_callbacks
+):
+    """
+    의사 데이터가 바뀌면 바로 한 번, 커밋할 때 한 번 더 검색 캐시 버전을 올리는지 테스트
+    """
+    # given
+    version = get_data_version()
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        hospital.name = "새싹병원"
+        hospital.save()
+        changed = get_data_version()
+
+    # then
+    assert changed > version
+    assert callbacks
+    assert get_data_version() > changed
+
+
+@pytest.mark.django_db
+def test_async_doctor_api(doctor_with_hours, next_weekday):
+    """
+    비동기 의사 검색 API 테스트 (동기 API 와 같은 응답)
+    """
+    # given
+    client = APIClient()
+    monday = next_weekday(Days.monday.value, datetime.now()).date()
+    url = reverse("clinic:async-doctor-list")
+
+    for params in (
+        {},
+        {"search": "메라키 일반의", "limit": 1},
+        {"time": datetime.combine(monday, time(10, 5))},
+    ):
+        # when
+        res = client.get(url, params)
+        sync_res = client.get(DOCTOR_URL, params)
+
+        # then
+        assert res.status_code == 200
+        assert res.content == sync_res.content
+        assert res.has_header("Link") == sync_res.has_header("Link")
+
+
+@pytest.mark.django_db
+def test_search_documents(doctor_with_hours, departments):
+    """
+    의사 검색 문서 갱신 테스트
+    """
+    # given
+    doctor, doctor2 = doctor_with_hours
+
+    # when
+    doctor.departments.remove(departments[0])
+    doctor.hours.filter(day=Days.monday.value).update(opening_time=time(8, 0))
+
+    # then
+    document = DoctorSearchDocument.objects.get(doctor=doctor)
+    assert json.loads(document.card) == DoctorSerializer(doctor).data
+
+    # when
+    DoctorSearchDocument.objects.all().delete()
+    out = StringIO()
+    call_command("rebuild_search_documents", chunk_size=1, stdout=out)
+
+    # then
+    documents = DoctorSearchDocument.objects.in_bulk()
+    assert "documents: 2 rows" in out.getvalue()
+    assert documents.keys() == {doctor.id, doctor2.id}
+    assert documents[doctor.id].text == "손웅래\n메라키병원\n내과\n일반의"
+    for obj in (doctor, doctor2):
+        assert json.loads(documents[obj.id].card) == DoctorSerializer(obj).data
+
+
+@pytest.mark.django_db
+def test_projection_serializer_parity(doctor_with_hours):
+    """
+    values() 기반 의사 직렬화가 DoctorSerializer 와 같은 결과를 내는지 테스트
+    """
+    # given
+    doctor, doctor2 = doctor_with_hours
+    doctor.treatments.add(UninsuredTreatment.objects.create(name="다이어트약"))
+    doctor.hours.filter(day=Days.monday.value).update(
+        lunch_start_time=time(12, 30), lunch_end_time=time(13, 30)
+    )
+    Doctor.objects.create(name="무소속의사")
+    queryset = Doctor.objects.order_by("id")
+
+    # when
+    data = DoctorProjectionSerializer(queryset).data
+
+    # then
+    assert data == DoctorSerializer(queryset, many=True).data
+
+
+@pytest.mark.django_db
+def test_create_dummy_command():
+    # when
+    call_command(
+        "create_dummy",
+        hospitals=3,
+        doctors=20,
+        patients=10,
+        requests=100,
+        seed=1,
+        chunk_size=7,
+        stdout=StringIO(),
+    )
+
+    # then
+    assert Doctor.objects.count() == 20
+    assert TreatmentRequest.objects.count() == 100
+    assert not Doctor.objects.filter(departments=None).exists()
+    assert AvailabilityBlock.objects.values("doctor").distinct().count() == 20
+    assert DoctorSearchToken.objects.values("doctor").distinct().count() == 20
+
+
+@pytest.mark.django_db
+def test_next_available_doctors(doctor_with_hours, departments, patients, next_weekday):
+    """
+    의사별 가장 빠른 진료 가능 시각 조회 테스트
+    """
+    # given
+    doctor, doctor2 = doctor_with_hours
+    monday = next_weekday(Days.monday.value, datetime.now() + timedelta(days=1))
+    saturday = monday + timedelta(days=5)
+    TreatmentRequest.objects.create(
+        doctor=doctor,
+        patient=patients[0],
+        desired_datetime=datetime.combine(monday, time(9, 10)),
+        status=RequestStatus.ACCEPTED,
+        slot_start=datetime.combine(monday, time(9, 0)),
+    )
+    client = APIClient()
+    start = datetime.combine(monday, time(8, 52))
+
+    # when
+    res = client.get(OPENING_URL, {"start": start})
+
+    # then
+    assert res.status_code == 200
+    assert [(row["doctor_id"], row["available_datetime"]) for row in res.data] == [
+        (doctor.id, datetime.combine(monday, time(9, 15)).isoformat()),
+        (doctor2.id, datetime.combine(saturday, time(9, 0)).isoformat()),
+    ]
+    assert res.data[0]["name"] == doctor.name
+
+    # when
+    res = client.get(
+        OPENING_URL,
+        {"start": start, "end": datetime.combine(saturday, time(8, 0))},
+    )
+    res_department = client.get(
+        OPENING_URL, {"start": start, "department_id": departments[3].id}
+    )
+    res_search = client.get(OPENING_URL, {"start": start, "search": "한의사"})
+
+    # then
+    assert [row["doctor_id"] for row in res.data] == [doctor.id]
+    assert [row["doctor_id"] for row in res_department.data] == [doctor2.id]
+    assert [row["doctor_id"] for row in res_search.data] == [doctor2.id]
+
+
+@pytest.mark.django_db
+def test_next_available_doctors_from_past_start(doctor_with_hours):
+    """
+    지난 시각부터 조회해도 현재 시각 이후의 진료 가능 시각만 반환하는지 테스트
+    """
+    # given
+    client = APIClient()
+    now = datetime.now()
+
+    # when
+    res = client.get(OPENING_URL, {"start": now - timedelta(days=3)})
+    res_past = client.get(
+        OPENING_URL,
+        {"start": now - timedelta(days=10), "end": now - timedelta(days=3)},
+    )
+
+    # then
+    assert res.status_code == 200
+    assert res.data
+    assert all(
+        datetime.fromisoformat(row["available_datetime"]) > now for row in res.data
+    )
+    assert res_past.status_code == 200
+    assert res_past.data == []
+
+
+@pytest.mark.django_db
+def test_next_available_doctors_validation():
+    # given
+    client = APIClient()
+    start = datetime(2024, 3, 11, 10, 0)
+
+    for end in (start, start + timedelta(days=15)):
+        # when
+        res = client.get(OPENING_URL, {"start": start, "end": end})
+
+        # then
+        assert res.status_code == 400
+
+
+@pytest.mark.django_db
+def test_next_available_matches_accept_rules(hospital, patients, next_weekday):
+    """
+    배열로 계산한 진료 가능 시각이 진료 요청 수락 규칙(영업 시간, 슬롯 점유)과 같은지 테스트
+    """
+    # given
+    rng = random.Random(0)
+    monday = next_weekday(Days.monday.value, datetime.now() + timedelta(days=1))
+    start = datetime.combine(monday, time(8, 58))
+    end = start + timedelta(days=3)
+    doctors = []
+    for i in range(12):
+        doctor = Doctor.objects.create(
+            name=f"의사{i}", hospital=hospital, slot_minutes=rng.choice([5, 7, 15, 60])
+        )
+        for day in rng.sample(range(7), 4):
+            lunch = rng.random() < 0.5
+            BusinessHour.objects.create(
+                doctor=doctor,
+                day=day,
+                opening_time=time(rng.randint(6, 10), rng.choice([0, 10, 30])),
+                lunch_start_time=time(12, 0) if lunch else None,
+                lunch_end_time=time(13, 0) if lunch else None,
+                closing_time=time(rng.randint(14, 20), rng.choice([0, 45])),
+            )
+        for _ in range(rng.randint(0, 30)):
+            desired_datetime = start + timedelta(minutes=5 * rng.randrange(60 * 12))
+            TreatmentRequest.objects.get_or_create(
+                doctor=doctor,
+                slot_start=get_slot_start(desired_datetime, doctor.slot_minutes),
+                defaults={
+                    "patient": patients[0],
+                    "desired_datetime": desired_datetime,
+                    "status": RequestStatus.ACCEPTED,
+                },
+            )
+        doctors.append(doctor)
+
+    # when
+    openings = {
+        row["doctor_id"]: row["available_datetime"]
+        for row in get_next_openings({"start": start, "end": end, "limit": None})
+    }
+
+    # then
+    schedules = schedule_cache.get_many([doctor.id for doctor in doctors])
+    for doctor in doctors:
+        occupied = set(
+            TreatmentRequest.objects.filter(doctor=doctor)
+            .exclude(slot_start=None)
+            .values_list("slot_start", flat=True)
+        )
+        value = datetime.combine(monday, time(9, 0))
+        expected = None
+        while value < end:
+            # 영업 시간 경계는 양 끝을 포함하므로 슬롯 전체가 진료 시간인지 확인합니다.
+            if (
+                is_business_time(value, schedules[doctor.id])
+                and is_business_time(value + SLOT_END, schedules[doctor.id])
+                and get_slot_start(value, doctor.slot_minutes) not in occupied
+            ):
+                expected = value
+                break
+            value += timedelta(minutes=5)
+        assert openings.get(doctor.id) == expected, doctor.id
+
+
+@pytest.mark.django_db
+def test_replace_doctor_hours(doctor_with_hours, next_weekday):
+    """
+    의사의 주간 영업시간을 한 번에 교체하는 API 테스트
+    """
+    # given
+    doctor, doctor2 = doctor_with_hours
+    url = reverse("clinic:doctor-hours", args=[doctor.id])
+    data = [
+        {
+            "day": Days.monday.value,
+            "opening_time": "08:00",
+            "lunch_start_time": "12:00",
+            "lunch_end_time": "13:00",
+            "closing_time": "17:00",
+        },
+        {"day": Days.tuesday.value, "opening_time": "10:00", "closing_time": "19:00"},
+        {"day": Days.saturday.value, "opening_time": "09:00", "closing_time": "13:00"},
+    ]
+    notified = []
+
+    def receiver(sender, doctor_ids, **kwargs):
+        notified.append(set(doctor_ids))
+
+    business_hours_changed.connect(receiver)
+    try:
+        # when
+        res = APIClient().put(url, data, format="json")
+    finally:
+        business_hours_changed.disconnect(receiver)
+
+    # then
+    assert res.status_code == 200
+    assert [row["day"] for row in res.data] == [0, 1, 5]
+    assert notified == [{doctor.id}]
+    hours = {hour.day: hour for hour in doctor.hours.all()}
+    assert hours.keys() == {0, 1, 5}
+    assert hours[0].opening_time == time(8, 0)
+    assert hours[0].lunch_end_time == time(13, 0)
+    assert hours[1].opening_time == time(10, 0)
+    assert doctor2.hours.count() == 2
+
+    monday = next_weekday(Days.monday.value, datetime.now())
+    available = set(
+        Doctor.objects.filter(
+            id__in=AvailabilityBlock.objects.available_at(
+                datetime_to_slot(datetime.combine(monday, time(8, 30)))
+            )
+        ).values_list("id", flat=True)
+    )
+    assert available == {doctor.id}
+    document = DoctorSearchDocument.objects.get(doctor=doctor)
+    assert json.loads(document.card) == DoctorSerializer(doctor).data
+
+
+@pytest.mark.django_db
+def test_replace_doctor_hours_validation(doctor_with_hours):
+    # given
+    doctor, _ = doctor_with_hours
+    client = APIClient()
+    url = reverse("clinic:doctor-hours", args=[doctor.id])
+    hours = {"day": Days.monday.value, "opening_time": "09:00", "closing_time": "18:00"}
+
+    for data in (
+        [hours, hours],
+        [{**hours, "lunch_start_time": "12:00"}],
+        [{**hours, "day": 7}],
+    ):
+        # when
+        res = client.put(url, data, format="json")
+
+        # then
+        assert res.status_code == 400
+    assert doctor.hours.count() == 5
+
+    # when
+    res = client.put(reverse("clinic:doctor-hours", args=[0]), [hours], format="json")
+
+    # then
+    assert res.status_code == 404
+
+
+@pytest.mark.django_db
+def test_replace_doctor_hours_time_order(doctor_with_hours):
+    """
+    영업시간과 점심시간의 순서가 맞지 않으면 400 을 반환하는지 테스트
+    """
+    # given
+    doctor, _ = doctor_with_hours
+    client = APIClient()
+    url = reverse("clinic:doctor-hours", args=[doctor.id])
+    hours = {"day": Days.monday.value, "opening_time": "09:00", "closing_time": "18:00"}
+
+    for opening_time, closing_time in (("18:00", "09:00"), ("09:00", "09:00")):
+        # when
+        res = client.put(
+            url,
+            [{**hours, "opening_time": opening_time, "closing_time": closing_time}],
+            format="json",
+        )
+
+        # then
+        assert res.status_code == 400
+        assert res.json() == [
+            {"detail": ["영업 시작 시간은 종료 시간보다 빨라야 합니다."]}
+        ]
+
+    for opening_time, closing_time in (("09:03", "18:00"), ("09:00", "17:59:30")):
+        # when
+        res = client.put(
+            url,
+            [{**hours, "opening_time": opening_time, "closing_time": closing_time}],
+            format="json",
+        )
+
+        # then
+        assert res.status_code == 400
+        assert res.json() == [{"detail": ["영업시간은 5분 단위로 입력해주세요."]}]
+
+    for lunch_start_time, lunch_end_time in (
+        ("13:00", "12:00"),
+        ("12:00", "12:00"),
+        ("08:00", "10:00"),
+        ("17:00", "19:00"),
+        ("19:00", "20:00"),
+    ):
+        # when
+        res = client.put(
+            url,
+            [
+                {
+                    **hours,
+                    "lunch_start_time": lunch_start_time,
+                    "lunch_end_time": lunch_end_time,
+                }
+            ],
+            format="json",
+        )
+
+        # then
+        assert res.status_code == 400
+        assert res.json() == [
+            {"detail": ["점심시간은 영업시간 안에서 시작이 끝보다 빨라야 합니다."]}
+        ]
+    assert doctor.hours.count() == 5
+
+    # when
+    res = client.put(
+        url,
+        [{**hours, "lunch_start_time": "09:00", "lunch_end_time": "18:00"}],
+        format="json",
+    )
+
+    # then
+    assert res.status_code == 200
+
+
+@pytest.mark.django_db
+def test_import_directory_command(tmp_path, departments):
+    """
+    CSV/JSONL 파일로 의사, 병원, 진료과, 영업시간을 가져오는 명령 테스트
+    """
+    # given
+    csv_path = tmp_path / "doctors.csv"
+    csv_path.write_text(
+        "name,hospital,departments,treatments,slot_minutes,mon,sat\n"
+        "김의사,새봄병원,내과|피부과,보톡스,,09:00-12:30,13:30-18:00\n"
+        '이의사,새봄병원,피부과,,30,"09:00-12:00,13:00-18:00",\n',
+        encoding="utf-8",
+    )
+    jsonl_path = tmp_path / "doctors.jsonl"
+    jsonl_path.write_text(
+        json.dumps(
+            {
+                "name": "박의사",
+                "hospital": "새봄병원",
+                "departments": ["내과"],
+                "treatments": ["보톡스", "필러"],
+                "tue": "10:00-19:00",
+            },
+            ensure_ascii=False,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+    # when
+    out = StringIO()
+    call_command("import_directory", str(csv_path), chunk_size=1, stdout=out)
+    call_command("import_directory", str(jsonl_path), stdout=out)
+    call_command("import_directory", str(jsonl_path), stdout=out)
+
+    # then
+    assert "doctors: 2 rows" in out.getvalue()
+    assert "이미 가져온 파일입니다" in out.getvalue()
+    doctors = {doctor.name: doctor for doctor in Doctor.objects.all()}
+    assert doctors.keys() == {"김의사", "이의사", "박의사"}
+    assert Hospital.objects.filter(name="새봄병원").count() == 1
+    assert {doctor.hospital_id for doctor in doctors.values()} == {
+        Hospital.objects.get(name="새봄병원").id
+    }
+    assert set(doctors["김의사"].departments.values_list("name", flat=True)) == {
+        "내과",
+        "피부과",
+    }
+    assert doctors["김의사"].departments.get(name="내과") == departments[1]
+    assert UninsuredTreatment.objects.filter(name="보톡스").count() == 1
+    assert doctors["이의사"].slot_minutes == 30
+
+    hours = doctors["이의사"].hours.get()
+    assert hours.day == Days.monday.value
+    assert hours.first_session == (time(9, 0), time(12, 0))
+    assert hours.second_session == (time(13, 0), time(18, 0))
+    assert doctors["김의사"].hours.get(day=Days.saturday.value).closing_time == time(
+        18, 0
+    )
+    assert AvailabilityBlock.objects.filter(doctor=doctors["박의사"]).exists()
+    for doctor in doctors.values():
+        document = DoctorSearchDocument.objects.get(doctor=doctor)
+        assert json.loads(document.card) == DoctorSerializer(doctor).data
+
+
+@pytest.mark.django_db
+def test_import_directory_rebuilds_once_per_chunk(tmp_path, monkeypatch):
+    """
+    가져오기가 청크마다 검색 문서를 한 번만 다시 만드는지 테스트
+    """
+    # given
+    path = tmp_path / "doctors.jsonl"
+    lines = [
+        json.dumps({"name": f"의사{i}", "mon": "09:00-18:00"}, ensure_ascii=False)
+        for i in range(3)
+    ]
+    # 영업시간이 없는 의사도 검색 문서가 만들어져야 합니다.
+    lines.append(json.dumps({"name": "의사3"}, ensure_ascii=False))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    calls = []
+    rebuild = DoctorSearchDocument.objects.rebuild
+
+    def counting_rebuild(doctor_ids):
+        calls.append(set(doctor_ids))
+        return rebuild(doctor_ids)
+
+    monkeypatch.setattr(DoctorSearchDocument.objects, "rebuild", counting_rebuild)
+
+    # when
+    call_command("import_directory", str(path), chunk_size=2, stdout=StringIO())
+
+    # then
+    doctor_ids = dict(Doctor.objects.values_list("name", "id"))
+    assert calls == [
+        {doctor_ids["의사0"], doctor_ids["의사1"]},
+        {doctor_ids["의사2"], doctor_ids["의사3"]},
+    ]
+    assert DoctorSearchDocument.objects.count() == 4
+    assert AvailabilityBlock.objects.filter(doctor_id=doctor_ids["의사2"]).exists()
+
+
+@pytest.mark.django_db
+def test_import_directory_rejects_hours_out_of_order(tmp_path):
+    """
+    순서가 틀린 영업시간이 있으면 해당 레코드 번호와 함께 가져오기를 멈추는지 테스트
+    """
+    # given
+    path = tmp_path / "doctors.jsonl"
+
+    for mon, message in (
+        ("18:00-09:00", "영업 시작 시간은 종료 시간보다 빨라야 합니다."),
+        ("09:00-19:00,20:00-18:00", "점심시간은 영업시간 안에서"),
+        ("09:00-13:00,12:00-18:00", "점심시간은 영업시간 안에서"),
+    ):
+        path.write_text(
+            json.dumps({"name": "의사0", "mon": "09:00-18:00"}, ensure_ascii=False)
+            + "\n"
+            + json.dumps({"name": "의사1", "mon": mon}, ensure_ascii=False)
+            + "\n",
+            encoding="utf-8",
+        )
+
+        # when
+        with pytest.raises(CommandError, match=f"2번째 레코드.*{message}"):
+            call_command("import_directory", str(path), restart=True, stdout=StringIO())
+
+        # then
+        assert not BusinessHour.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_directory_resumes_after_failure(tmp_path):
+    """
+    가져오기가 중간에 실패하면 다시 실행했을 때 저장된 청크 다음부터 이어서 가져오는지 테스트
+    """
+    # given
+    path = tmp_path / "doctors.jsonl"
+    lines = [
+        json.dumps({"name": f"의사{i}", "mon": "09:00-18:00"}, ensure_ascii=False)
+        for i in range(7)
+    ]
+    broken = lines[:]
+    broken[4] = json.dumps({"name": "의사4", "mon": "오전"}, ensure_ascii=False)
+    path.write_text("\n".join(broken) + "\n", encoding="utf-8")
+
+    # when
+    with pytest.raises(CommandError, match="5번째 레코드"):
+        call_command("import_directory", str(path), chunk_size=2, stdout=StringIO())
+
+    # then
+    progress = ImportProgress.objects.get()
+    assert progress.records == 4
+    assert not progress.completed
+    assert Doctor.objects.count() == 4
+
+    # when
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    out = StringIO()
+    call_command("import_directory", str(path), chunk_size=2, stdout=out)
+
+    # then
+    assert "4번째 레코드 다음부터" in out.getvalue()
+    assert sorted(Doctor.objects.values_list("name", flat=True)) == [
+        f"의사{i}" for i in range(7)
+    ]
+    progress.refresh_from_db()
+    assert (progress.records, progress.completed) == (7, True)
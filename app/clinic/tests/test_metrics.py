@@ -0,0 +1,45 @@
+import pytest
+from clinic import metrics
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+
+@pytest.fixture
+def metrics_enabled(settings):
+    settings.REQUEST_METRICS_ENABLED = True
+    settings.REQUEST_METRICS_HEADERS = True
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+@pytest.mark.django_db
+def test_request_metrics(metrics_enabled, doctor_with_hours):
+    # when
+    client = APIClient()
+    res = client.get(reverse("clinic:doctor-list"))
+
+    # then
+    assert res.status_code == 200
+    assert res["X-Query-Count"] == "1"
+    assert "sql;dur=" in res["Server-Timing"]
+
+    # when
+    res = client.get(reverse("metrics"))
+
+    # then
+    body = res.content.decode()
+    assert res.status_code == 200
+    assert (
+        'clinic_request_queries_count{view="clinic:doctor-list",method="GET"} 1' in body
+    )
+    assert 'clinic_request_duration_seconds_bucket{view="clinic:doctor-list"' in body
+
+
+@pytest.mark.django_db
+def test_request_metrics_disabled(doctor_with_hours):
+    # when
+    res = APIClient().get(reverse("clinic:doctor-list"))
+
+    # then
+    assert "X-Query-Count" not in res
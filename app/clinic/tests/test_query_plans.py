@@ -0,0 +1,176 @@
+"""
+자주 실행되는 쿼리의 SQLite 실행 계획 테스트
+
+조건이 있는데 인덱스로 찾지(SEARCH) 않고 테이블 전체를 읽거나(SCAN),
+페이지를 자르기 전에 전체 결과를 정렬(USE TEMP B-TREE FOR ORDER BY)하는
+계획으로 바뀌면 실패합니다.
+"""
+
+from datetime import datetime
+
+import pytest
+from clinic.availability import slots_at
+from clinic.enums import RequestStatus
+from clinic.models import (
+    AvailabilityBlock,
+    BusinessHour,
+    DoctorSearchToken,
+    TreatmentRequest,
+    TreatmentRequestChange,
+)
+from clinic.selectors import (
+    get_archived_requests,
+    get_doctor_documents,
+    get_request_changes,
+    get_requests,
+)
+from clinic.services import _pending_requests
+from clinic.views import (
+    DoctorApi,
+    TreatmentRequestApi,
+    TreatmentRequestChangeApi,
+    TreatmentRequestHistoryApi,
+)
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="SQLite 실행 계획만 검사합니다."
+)
+
+NOW = datetime(2024, 3, 11, 10, 0)
+
+
+def query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def assert_indexed(queryset, ordered=False, seek=False):
+    plan = query_plan(queryset)
+    if queryset.query.where:
+        # 조건이 있는 쿼리는 인덱스로 찾아야(SEARCH) 합니다. 인덱스 순서로
+        # 전체를 읽는 SCAN ... USING INDEX 도 전체 스캔입니다.
+        full_scans = [line for line in plan if line.startswith("SCAN ")]
+    else:
+        # 정렬만 하는 쿼리는 인덱스 순서로 앞에서부터 읽는 SCAN 을 허용합니다.
+        full_scans = [
+            line for line in plan if line.startswith("SCAN ") and "USING" not in line
+        ]
+    assert not full_scans, "\n".join(plan)
+    if ordered:
+        assert "USE TEMP B-TREE FOR ORDER BY" not in plan, "\n".join(plan)
+    if seek:
+        # 다음 페이지는 커서 위치부터 인덱스를 찾아 읽어야 합니다.
+        assert plan[0].startswith("SEARCH "), "\n".join(plan)
+
+
+def page_queryset(pagination_class, queryset, cursor_values=None):
+    paginator = pagination_class()
+    params = {}
+    if cursor_values is not None:
+        params[paginator.cursor_query_param] = paginator.encode(cursor_values)
+    request = Request(APIRequestFactory().get("/", params))
+    return paginator.get_page_queryset(queryset, request)
+
+
+@pytest.mark.django_db
+def test_treatment_request_list_plans():
+    for filters in ({"doctor_id": 1}, {}):
+        for cursor_values in (None, [NOW, 1]):
+            assert_indexed(
+                page_queryset(
+                    TreatmentRequestApi.Pagination, get_requests(filters), cursor_values
+                ),
+                ordered=True,
+                seek=cursor_values is not None,
+            )
+
+
+@pytest.mark.django_db
+def test_doctor_search_plans():
+    for filters in (
+        {"search": "메라키 내과"},
+        {"time": NOW},
+        {"search": "메라키", "time": NOW},
+    ):
+        for cursor_values in (None, [1]):
+            assert_indexed(
+                page_queryset(
+                    DoctorApi.Pagination, get_doctor_documents(filters), cursor_values
+                ),
+                ordered=True,
+                seek=cursor_values is not None,
+            )
+    assert_indexed(DoctorSearchToken.objects.match(["메라키"]))
+    assert_indexed(AvailabilityBlock.objects.available_at(*slots_at(NOW)))
+
+
+@pytest.mark.django_db
+def test_expire_requests_plans():
+    pending = _pending_requests()
+    for queryset in (
+        pending.filter(desired_datetime__lte=NOW),
+        pending.filter(expired_datetime__lte=NOW),
+        pending.filter(expired_datetime__isnull=True),
+    ):
+        assert_indexed(queryset.filter(id__gt=0).order_by("id")[:1000])
+
+
+@pytest.mark.django_db
+def test_archive_plans():
+    assert_indexed(
+        TreatmentRequest.objects.filter(
+            status=RequestStatus.ACCEPTED, desired_datetime__lt=NOW
+        ).order_by("desired_datetime")[:1000],
+        ordered=True,
+    )
+    for filters in ({}, {"doctor_id": 1}, {"patient_id": 1}):
+        for cursor_values in (None, [NOW, 1]):
+            assert_indexed(
+                page_queryset(
+                    TreatmentRequestHistoryApi.Pagination,
+                    get_archived_requests({"month": NOW.date(), **filters}),
+                    cursor_values,
+                ),
+                ordered=True,
+                seek=cursor_values is not None,
+            )
+
+
+@pytest.mark.django_db
+def test_change_feed_plans():
+    # 첫 페이지는 id(rowid) 순서로 앞에서부터 읽고, 다음 페이지는 after 부터 찾아 읽습니다.
+    assert_indexed(
+        page_queryset(TreatmentRequestChangeApi.Pagination, get_request_changes(), [1]),
+        ordered=True,
+        seek=True,
+    )
+    assert_indexed(
+        TreatmentRequestChange.objects.filter(
+            treatment_request_id__in=[1, 2], to_status=RequestStatus.EXPIRED
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_schedule_plans():
+    assert_indexed(BusinessHour.objects.filter(doctor_id__in=[1, 2]))
+
+
+@pytest.mark.django_db
+def test_full_scan_is_detected():
+    # 인덱스가 없는 컬럼으로 찾으면 전체 스캔으로 검출되어야 합니다.
+    with pytest.raises(AssertionError):
+        assert_indexed(get_requests({}).filter(created_datetime__gt=NOW))
+    with pytest.raises(AssertionError):
+        assert_indexed(get_requests({}).order_by("created_datetime")[:10], ordered=True)
+    with pytest.raises(AssertionError):
+        assert_indexed(
+            get_requests({})
+            .filter(created_datetime__gt=NOW)
+            .order_by("desired_datetime")[:10]
+        )
@@ -0,0 +1,49 @@
+import importlib
+import sys
+from datetime import datetime, time
+from decimal import Decimal
+from io import BytesIO
+
+import pytest
+from clinic import jsonlib
+from clinic.parsers import FastJSONParser
+from clinic.renderers import FastJSONRenderer
+
+DATA = {
+    "name": "메라키병원",
+    "desired_datetime": datetime(2024, 3, 11, 10, 0, 30, 123456),
+    "opening_time": time(9, 0, 0, 500),
+    "price": Decimal("1.50"),
+    1: None,
+}
+EXPECTED = (
+    '{"name":"메라키병원","desired_datetime":"2024-03-11T10:00:30",'
+    '"opening_time":"09:00:00","price":1.5,"1":null}'
+).encode()
+
+
+@pytest.fixture
+def stdlib_jsonlib(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    yield importlib.reload(jsonlib)
+    monkeypatch.undo()
+    importlib.reload(jsonlib)
+
+
+def test_render_and_parse():
+    # when
+    content = FastJSONRenderer().render(DATA)
+    parsed = FastJSONParser().parse(BytesIO(content))
+
+    # then
+    assert content == EXPECTED
+    assert parsed["name"] == "메라키병원"
+    assert parsed["desired_datetime"] == "2024-03-11T10:00:30"
+    assert FastJSONRenderer().render(None) == b""
+
+
+def test_stdlib_fallback(stdlib_jsonlib):
+    # then
+    assert stdlib_jsonlib.orjson is None
+    assert stdlib_jsonlib.dumps(DATA) == EXPECTED
+    assert stdlib_jsonlib.loads(EXPECTED)["opening_time"] == "09:00:00"
@@ -0,0 +1,159 @@
+"""
+읽기 전용 복제본 라우팅 테스트
+
+primary(테스트 DB)와 별도의 SQLite 파일을 복제본으로 등록하고,
+sync_replicas 명령으로 복사한 시점의 데이터만 복제본에서 읽히는지 확인합니다.
+"""
+
+import time as time_module
+from datetime import datetime, time, timedelta
+from io import StringIO
+
+import pytest
+from clinic.enums import Days
+from clinic.middleware import ReplicaRoutingMiddleware
+from clinic.models import Doctor
+from clinic.replicas import ReadReplicaRouter, replica_reads
+from django.core.management import call_command
+from django.db import connection, connections
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != "sqlite", reason="SQLite 파일 복사로 복제본을 만듭니다."
+)
+
+DOCTOR_URL = reverse("clinic:doctor-list")
+REQUEST_URL = reverse("clinic:treatment-request-list")
+
+
+@pytest.fixture
+def replicas(settings, tmp_path):
+    aliases = ["replica1", "replica2"]
+    for alias in aliases:
+        connections.settings[alias] = {
+            **connections.settings["default"],
+            "NAME": str(tmp_path / f"{alias}.sqlite3"),
+        }
+    settings.DATABASE_REPLICAS = aliases
+    yield aliases
+    for alias in aliases:
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+
+
+@pytest.fixture
+def replica(settings, replicas):
+    settings.DATABASE_REPLICAS = replicas[:1]
+    return replicas[0]
+
+
+def sync_replicas():
+    call_command("sync_replicas", stdout=StringIO())
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reads_go_to_replica(replica, doctor_with_hours):
+    """
+    읽기 요청은 마지막으로 복사된 복제본에서 읽는지 테스트
+    """
+    # given
+    doctor, doctor2 = doctor_with_hours
+    sync_replicas()
+    doctor3 = Doctor.objects.create(name="새의사")
+
+    for url in (DOCTOR_URL, reverse("clinic:async-doctor-list")):
+        # when
+        res = APIClient().get(url)
+
+        # then
+        assert res.status_code == 200
+        assert {row["id"] for row in res.json()} == {doctor.id, doctor2.id}
+
+    # when
+    sync_replicas()
+    res = APIClient().get(DOCTOR_URL)
+
+    # then
+    assert {row["id"] for row in res.json()} == {doctor.id, doctor2.id, doctor3.id}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_read_your_writes(replica, doctor_with_hours, patients, next_weekday):
+    """
+    쓰기 요청을 보낸 클라이언트는 잠시 동안 primary 에서 읽는지 테스트
+    """
+    # given
+    doctor, _ = doctor_with_hours
+    sync_replicas()
+    client = APIClient()
+    other = APIClient()
+    desired_datetime = datetime.combine(
+        next_weekday(Days.monday.value, datetime.now() + timedelta(days=1)),
+        time(10, 0),
+    )
+
+    def request_ids(api_client):
+        res = api_client.get(REQUEST_URL, {"doctor_id": doctor.id})
+        assert res.status_code == 200
+        return [row["id"] for row in res.json()]
+
+    # when
+    res = client.post(
+        REQUEST_URL,
+        {
+            "doctor_id": doctor.id,
+            "patient_id": patients[0].id,
+            "desired_datetime": desired_datetime,
+        },
+    )
+
+    # then
+    assert res.status_code == 201
+    assert request_ids(client) == [res.data["id"]]
+    assert request_ids(other) == []
+
+    # when
+    client.cookies[ReplicaRoutingMiddleware.COOKIE_NAME] = str(time_module.time() - 60)
+
+    # then
+    assert request_ids(client) == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_replica_router(replica):
+    # given
+    router = ReadReplicaRouter()
+
+    # when, then
+    # 한 번도 복사되지 않은 복제본은 테이블이 없으므로 primary 에서 읽습니다.
+    with replica_reads():
+        assert Doctor.objects.all().db == "default"
+    sync_replicas()
+    assert Doctor.objects.all().db == "default"
+    with replica_reads():
+        assert Doctor.objects.all().db == replica
+        assert router.db_for_write(Doctor) == "default"
+    assert router.allow_migrate("default", "clinic")
+    assert not router.allow_migrate(replica, "clinic")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_one_replica_per_request(replicas, doctor_with_hours):
+    """
+    한 요청(replica_reads 블록)의 조회는 모두 같은 복제본에서 읽는지 테스트
+    """
+    # given
+    sync_replicas()
+
+    for _ in range(10):
+        # when
+        with replica_reads():
+            used = {Doctor.objects.all().db for _ in range(20)}
+            count = Doctor.objects.count()
+
+        # then
+        assert len(used) == 1
+        assert used <= set(replicas)
+        assert count == 2
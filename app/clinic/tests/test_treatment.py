@@ -1,15 +1,34 @@
-from datetime import datetime, time, timedelta
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from io import StringIO
 
 import pytest
+from asgiref.sync import async_to_sync, sync_to_async
 from clinic.enums import Days, RequestStatus
-from clinic.models import BusinessHour, Doctor, Patient, TreatmentRequest
-from clinic.views import TreatmentRequestApi
+from clinic.events import request_events
+from clinic.models import (
+    ArchivedTreatmentRequest,
+    BusinessHour,
+    Doctor,
+    Patient,
+    TreatmentRequest,
+    TreatmentRequestChange,
+)
+from clinic.schedule import ScheduleCache, schedule_cache
+from clinic.views import DoctorApi, TreatmentRequestApi
+from django.core.management import call_command
 from django.db import connection
+from django.test import AsyncClient
 from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from pytest_django import DjangoAssertNumQueries
 from rest_framework.test import APIClient
 
+CONCURRENT_ACCEPTS = 20
+
 
 @pytest.mark.django_db
 def test_post_treatment_requests(next_weekday, doctor_with_hours, patients):
@@ -206,3 +225,722 @@ def test_request_treatment(next_weekday):
         minutes=15
     )
     assert treatment_request.status == RequestStatus.PENDING
+
+
+@pytest.mark.django_db
+def test_expire_requests_command(next_weekday, doctor_with_hours, patients):
+    """
+    만료 요청 일괄 처리 테스트
+    """
+    # given
+    doctor, _ = doctor_with_hours
+    desired_datetime = datetime.combine(
+        next_weekday(Days.monday.value, datetime.now() + timedelta(days=1)),
+        time(10, 0),
+    )
+    stale, fresh, past = [
+        TreatmentRequest.objects.create(
+            patient=patient, doctor=doctor, desired_datetime=desired_datetime
+        )
+        for patient in patients[:3]
+    ]
+    TreatmentRequest.objects.filter(id=stale.id).update(
+        created_datetime=datetime(2024, 3, 11, 10, 0)
+    )
+    TreatmentRequest.objects.filter(id=past.id).update(
+        desired_datetime=datetime(2024, 3, 11, 10, 0)
+    )
+
+    # when
+    out = StringIO()
+    call_command("expire_requests", chunk_size=2, stdout=out)
+
+    # then
+    stale.refresh_from_db()
+    fresh.refresh_from_db()
+    past.refresh_from_db()
+    assert stale.status == RequestStatus.EXPIRED
+    assert stale.expired_datetime == datetime(2024, 3, 11, 10, 20)
+    assert fresh.status == RequestStatus.PENDING
+    assert fresh.expired_datetime is not None
+    assert past.status == RequestStatus.REFUSED
+    assert "refused=1 computed=2 expired=1" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_schedule_cache_warm_validation(
+    next_weekday, doctor_with_hours, patients, django_assert_num_queries
+):
+    """
+    영업시간 캐시 테스트
+    """
+    # given
+    doctor, _ = doctor_with_hours
+    desired_datetime = datetime.combine(
+        next_weekday(Days.monday.value, datetime.now() + timedelta(days=1)),
+        time(10, 0),
+    )
+    assert TreatmentRequest(
+        doctor=doctor, desired_datetime=desired_datetime
+    ).is_available
+
+    # when
+    with django_assert_num_queries(0):
+        treatment_request = TreatmentRequest(
+            doctor=doctor, patient=patients[0], desired_datetime=desired_datetime
+        )
+        available = treatment_request.is_available
+
+    # then
+    assert available
+    assert schedule_cache.stats()["hits"] == 1
+    assert schedule_cache.stats()["misses"] == 1
+
+    # when
+    doctor.hours.filter(day=Days.monday.value).update(opening_time=time(11, 0))
+
+    # then
+    assert treatment_request.is_available == False
+    assert schedule_cache.stats()["misses"] == 2
+
+
+@pytest.mark.django_db
+def test_schedule_cache_skips_store_after_invalidate(doctor_with_hours):
+    """
+    불러오는 도중 무효화된 schedule 은 캐시에 저장하지 않는지 테스트
+    """
+    # given
+    doctor, _ = doctor_with_hours
+    cache = ScheduleCache()
+    load = cache._hours_queryset
+
+    def load_then_change(doctor_ids):
+        # 이전 영업시간을 읽은 뒤 다른 요청이 영업시간을 바꾸고 무효화합니다.
+        hours = list(load(doctor_ids))
+        doctor.hours.filter(day=Days.monday.value).update(opening_time=time(11, 0))
+        cache.invalidate(doctor_ids)
+        return hours
+
+    cache._hours_queryset = load_then_change
+
+    # when
+    stale = cache.get(doctor.id)
+    cache._hours_queryset = load
+    fresh = cache.get(doctor.id)
+
+    # then
+    assert stale[Days.monday.value].opening_time == time(9, 0)
+    assert fresh[Days.monday.value].opening_time == time(11, 0)
+    assert cache.stats()["misses"] == 2
+
+
+@pytest.mark.django_db
+def test_get_treatment_requests_keyset_pagination(
+    treatment_requests, django_assert_max_num_queries
+):
+    """
+    진료 요청 목록 커서 페이지네이션 테스트
+    """
+    # given
+    client = APIClient()
+    url = reverse("clinic:treatment-request-list")
+    TreatmentRequest.objects.filter(id=treatment_requests[0].id).update(
+        desired_datetime=treatment_requests[0].desired_datetime + timedelta(hours=1)
+    )
+
+    # when
+    ids = []
+    next_url = f"{url}?limit=3"
+    while next_url:
+        with django_assert_max_num_queries(1):
+            res = client.get(next_url)
+        assert res.status_code == 200
+        assert len(res.data) <= 3
+        ids += [row["id"] for row in res.data]
+        next_url = res.headers.get("Link", "").partition(">")[0][1:]
+
+    # then
+    expected = [request.id for request in treatment_requests[1:]]
+    assert ids == expected + [treatment_requests[0].id]
+
+    # when
+    res = client.get(url, {"cursor": "invalid"})
+
+    # then
+    assert res.status_code == 400
+
+
+@pytest.mark.django_db
+def test_malformed_cursor(treatment_requests):
+    """
+    변조된 커서로 목록을 조회하면 400 을 반환하는지 테스트
+    """
+    # given
+    client = APIClient()
+    cursors = [
+        (reverse("clinic:doctor-list"), DoctorApi.Pagination, ["x"]),
+        (reverse("clinic:doctor-list"), DoctorApi.Pagination, [{"a": 1}]),
+        (reverse("clinic:doctor-list"), DoctorApi.Pagination, [None]),
+        (reverse("clinic:doctor-list"), DoctorApi.Pagination, [10**30]),
+        (
+            reverse("clinic:treatment-request-list"),
+            TreatmentRequestApi.Pagination,
+            [None, 1],
+        ),
+        (
+            reverse("clinic:treatment-request-list"),
+            TreatmentRequestApi.Pagination,
+            ["2024-01-01T00:00:00", "x"],
+        ),
+        (
+            reverse("clinic:treatment-request-list"),
+            TreatmentRequestApi.Pagination,
+            ["x", 1],
+        ),
+    ]
+
+    for url, pagination_class, values in cursors:
+        # when
+        res = client.get(url, {"cursor": pagination_class().encode(values)})
+
+        # then
+        assert res.status_code == 400, values
+        assert "cursor" in res.json()
+
+    # when
+    res = client.get(reverse("clinic:change-list"), {"after": str(10**30)})
+
+    # then
+    assert res.status_code == 400
+
+
+@pytest.mark.django_db
+def test_post_treatment_requests_batch(
+    next_weekday, doctor_with_hours, patients, django_assert_max_num_queries
+):
+    """
+    진료 요청 일괄 생성 테스트
+    """
+    # given
+    doctor, doctor2 = doctor_with_hours
+    monday = next_weekday(Days.monday.value, datetime.now() + timedelta(days=1))
+    desired_datetime = datetime.combine(monday, time(10, 0))
+    data = [
+        {
+            "patient_id": patient.id,
+            "doctor_id": doctor.id,
+            "desired_datetime": desired_datetime,
+        }
+        for patient in patients[:3]
+    ]
+    data += [
+        {
+            "patient_id": patients[3].id,
+            "doctor_id": doctor2.id,
+            "desired_datetime": desired_datetime,
+        },
+        {
+            "patient_id": patients[4].id,
+            "doctor_id": doctor.id + doctor2.id,
+            "desired_datetime": desired_datetime,
+        },
+        {"patient_id": patients[4].id, "doctor_id": doctor.id},
+    ]
+
+    # when
+    client = APIClient()
+    url = reverse("clinic:treatment-request-batch")
+    # 변경 기록(outbox)도 요청 수와 관계없이 INSERT 한 번으로 씁니다.
+    with django_assert_max_num_queries(7):
+        res = client.post(url, data, format="json")
+
+    # then
+    assert res.status_code == 200
+    assert [result["status"] for result in res.data] == [201, 201, 201, 400, 400, 400]
+    assert [result["request"]["patient"] for result in res.data[:3]] == [
+        patient.name for patient in patients[:3]
+    ]
+    assert res.data[3]["errors"] == {"detail": "영업 시간이 아닙니다."}
+    assert res.data[4]["errors"] == {"detail": "존재하지 않는 의사입니다."}
+    assert "desired_datetime" in res.data[5]["errors"]
+    assert TreatmentRequest.objects.filter(doctor=doctor).count() == 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_accept_treatment_request_concurrently(
+    next_weekday, doctor_with_hours, patients
+):
+    """
+    같은 진료 요청에 동시에 수락 요청을 보내도 한 번만 수락되는지 테스트
+    """
+    # given
+    doctor, _ = doctor_with_hours
+    desired_datetime = datetime.combine(
+        next_weekday(Days.monday.value, datetime.now() + timedelta(days=1)),
+        time(10, 0),
+    )
+    treatment_request = TreatmentRequest.objects.create(
+        patient=patients[0], doctor=doctor, desired_datetime=desired_datetime
+    )
+    url = reverse("clinic:treatment-request-accept", args=[treatment_request.id])
+    start = threading.Barrier(CONCURRENT_ACCEPTS)
+
+    def accept(_):
+        try:
+            start.wait()
+            return APIClient().patch(url).status_code
+        finally:
+            connection.close()
+
+    # when
+    with ThreadPoolExecutor(max_workers=CONCURRENT_ACCEPTS) as executor:
+        status_codes = list(executor.map(accept, range(CONCURRENT_ACCEPTS * 10)))
+
+    # then
+    treatment_request.refresh_from_db()
+    assert treatment_request.status == RequestStatus.ACCEPTED
+    assert status_codes.count(200) == 1
+    assert status_codes.count(409) == len(status_codes) - 1
+
+    # when
+    res = APIClient().patch(reverse("clinic:treatment-request-accept", args=[0]))
+
+    # then
+    assert res.status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+def test_accept_same_slot_concurrently(next_weekday, doctor_with_hours, patients):
+    """
+    같은 의사의 같은 슬롯에 있는 서로 다른 요청은 동시에 수락해도 하나만 수락되는지 테스트
+    """
+    # given
+    doctor, _ = doctor_with_hours
+    slot_start = datetime.combine(
+        next_weekday(Days.monday.value, datetime.now() + timedelta(days=1)),
+        time(10, 0),
+    )
+    treatment_requests = [
+        TreatmentRequest.objects.create(
+            patient=patients[i % len(patients)],
+            doctor=doctor,
+            desired_datetime=slot_start + timedelta(minutes=5 * (i % 3)),
+        )
+        for i in range(CONCURRENT_ACCEPTS)
+    ]
+    start = threading.Barrier(CONCURRENT_ACCEPTS)
+
+    def accept(treatment_request):
+        url = reverse("clinic:treatment-request-accept", args=[treatment_request.id])
+        try:
+            start.wait()
+            return APIClient().patch(url).status_code
+        finally:
+            connection.close()
+
+    # when
+    with ThreadPoolExecutor(max_workers=CONCURRENT_ACCEPTS) as executor:
+        status_codes = list(executor.map(accept, treatment_requests))
+
+    # then
+    assert status_codes.count(200) == 1
+    assert status_codes.count(409) == CONCURRENT_ACCEPTS - 1
+    accepted = TreatmentRequest.objects.get(status=RequestStatus.ACCEPTED)
+    assert accepted.slot_start == slot_start
+    assert TreatmentRequest.objects.filter(status=RequestStatus.PENDING).count() == (
+        CONCURRENT_ACCEPTS - 1
+    )
+
+
+@pytest.mark.django_db
+def test_accept_with_doctor_slot_minutes(next_weekday, doctor_with_hours, patients):
+    """
+    의사별 슬롯 길이에 따라 겹치는 요청 수락을 막는지 테스트
+    """
+    # given
+    doctor, _ = doctor_with_hours
+    doctor2 = Doctor.objects.create(name="김한시", slot_minutes=60)
+    for day in Days.values()[:5]:
+        BusinessHour.objects.create(
+            doctor=doctor2, day=day, opening_time=time(9), closing_time=time(19)
+        )
+    monday = next_weekday(Days.monday.value, datetime.now() + timedelta(days=1))
+    client = APIClient()
+
+    def accept(target, hour, minute):
+        treatment_request = TreatmentRequest.objects.create(
+            patient=patients[0],
+            doctor=target,
+            desired_datetime=datetime.combine(monday, time(hour, minute)),
+        )
+        url = reverse("clinic:treatment-request-accept", args=[treatment_request.id])
+        return client.patch(url).status_code
+
+    # when, then
+    assert accept(doctor, 10, 0) == 200
+    assert accept(doctor, 10, 30) == 200
+    assert accept(doctor, 10, 10) == 409
+    assert accept(doctor2, 10, 0) == 200
+    assert accept(doctor2, 10, 30) == 409
+    assert accept(doctor2, 11, 0) == 200
+
+
+@pytest.mark.django_db
+def test_async_treatment_request_api(next_weekday, doctor_with_hours, patients):
+    """
+    비동기 진료 요청 API 테스트 (동기 API 와 같은 응답)
+    """
+    # given
+    doctor, _ = doctor_with_hours
+    client = APIClient()
+    desired_datetime = datetime.combine(
+        next_weekday(Days.monday.value, datetime.now()), time(10, 0)
+    )
+    url = reverse("clinic:async-treatment-request-list")
+
+    # when
+    created = client.post(
+        url,
+        {
+            "patient_id": patients[0].id,
+            "doctor_id": doctor.id,
+            "desired_datetime": desired_datetime,
+        },
+        format="json",
+    )
+    closed = client.post(
+        url,
+        {
+            "patient_id": patients[0].id,
+            "doctor_id": doctor.id,
+            "desired_datetime": desired_datetime.replace(hour=20),
+        },
+        format="json",
+    )
+
+    # then
+    assert created.status_code == 201
+    assert created.json()["patient"] == patients[0].name
+    assert closed.status_code == 400
+    assert closed.json() == {"detail": "영업 시간이 아닙니다."}
+
+    # when
+    data = {
+        "patient_id": 0,
+        "doctor_id": doctor.id,
+        "desired_datetime": desired_datetime,
+    }
+    missing_patient = client.post(url, data, format="json")
+    sync_missing_patient = client.post(
+        reverse("clinic:treatment-request-list"), data, format="json"
+    )
+
+    # then
+    assert missing_patient.status_code == sync_missing_patient.status_code == 400
+    assert missing_patient.json() == sync_missing_patient.json()
+    assert missing_patient.json() == {"detail": "존재하지 않는 환자입니다."}
+
+    # when
+    params = {"doctor_id": doctor.id, "limit": 1}
+    res = client.get(url, params)
+    sync_res = client.get(reverse("clinic:treatment-request-list"), params)
+
+    # then
+    assert res.status_code == 200
+    assert res.json() == sync_res.json()
+    assert res["Link"].startswith(f"<http://testserver{url}?")
+
+    # when
+    accept_url = reverse(
+        "clinic:async-treatment-request-accept", args=[created.json()["id"]]
+    )
+    accepted = client.patch(accept_url)
+    again = client.patch(accept_url)
+    missing = client.patch(reverse("clinic:async-treatment-request-accept", args=[0]))
+
+    # then
+    assert accepted.status_code == 200
+    assert TreatmentRequest.objects.get(id=created.json()["id"]).status == (
+        RequestStatus.ACCEPTED
+    )
+    assert again.status_code == 409
+    assert missing.status_code == 404
+
+
+@pytest.mark.django_db
+def test_archive_requests_command(doctor_with_hours, patients):
+    """
+    끝난 진료 요청을 보관 테이블로 옮기고 이력 API 로 조회하는 테스트
+    """
+    # given
+    doctor, doctor2 = doctor_with_hours
+    statuses = [
+        RequestStatus.ACCEPTED,
+        RequestStatus.REFUSED,
+        RequestStatus.EXPIRED,
+        RequestStatus.PENDING,
+    ]
+    old = [
+        TreatmentRequest.objects.create(
+            patient=patients[i],
+            doctor=doctor,
+            desired_datetime=datetime(2024, 3, 11 + i, 10, 0),
+            status=status,
+            slot_start=(
+                datetime(2024, 3, 11 + i, 10, 0)
+                if status == RequestStatus.ACCEPTED
+                else None
+            ),
+        )
+        for i, status in enumerate(statuses)
+    ]
+    april = TreatmentRequest.objects.create(
+        patient=patients[0],
+        doctor=doctor2,
+        desired_datetime=datetime(2024, 4, 6, 10, 0),
+        status=RequestStatus.REFUSED,
+    )
+    recent = TreatmentRequest.objects.create(
+        patient=patients[0],
+        doctor=doctor,
+        desired_datetime=datetime.now() - timedelta(days=1),
+        status=RequestStatus.REFUSED,
+    )
+
+    # when
+    out = StringIO()
+    call_command("archive_requests", older_than=30, chunk_size=1, stdout=out)
+
+    # then
+    assert "archived=4" in out.getvalue()
+    assert set(TreatmentRequest.objects.values_list("id", flat=True)) == {
+        old[3].id,
+        recent.id,
+    }
+    archived = ArchivedTreatmentRequest.objects.get(id=old[0].id)
+    assert archived.month == date(2024, 3, 1)
+    assert archived.status == RequestStatus.ACCEPTED
+    assert archived.slot_start == datetime(2024, 3, 11, 10, 0)
+    assert archived.created_datetime == old[0].created_datetime
+
+    # when
+    url = reverse("clinic:treatment-request-history")
+    client = APIClient()
+    march = client.get(url, {"month": "2024-03", "doctor_id": doctor.id})
+    by_patient = client.get(url, {"month": "2024-04", "patient_id": patients[0].id})
+    missing_month = client.get(url, {"doctor_id": doctor.id})
+
+    # then
+    assert march.status_code == 200
+    assert [row["id"] for row in march.json()] == [request.id for request in old[:3]]
+    assert march.json()[0]["patient"] == patients[0].name
+    assert [row["id"] for row in by_patient.json()] == [april.id]
+    assert missing_month.status_code == 400
+
+    # when
+    call_command("archive_requests", older_than=30, stdout=out)
+
+    # then
+    assert ArchivedTreatmentRequest.objects.count() == 4
+
+
+async def read_event(chunks):
+    chunk = await asyncio.wait_for(anext(chunks), 5)
+    return dict(line.split(": ", 1) for line in chunk.decode().split("\n") if line)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_treatment_request_stream(next_weekday, doctor_with_hours, patients):
+    """
+    의사별 진료 요청 이벤트 스트림 테스트 (새 요청, 수락, 이어 받기)
+    """
+    # given
+    doctor, doctor2 = doctor_with_hours
+    url = reverse("clinic:async-treatment-request-stream")
+    list_url = reverse("clinic:treatment-request-list")
+    desired_datetime = datetime.combine(
+        next_weekday(Days.monday.value, datetime.now() + timedelta(days=1)),
+        time(10, 0),
+    )
+    client = APIClient()
+
+    def post(doctor_id, patient):
+        return client.post(
+            list_url,
+            {
+                "patient_id": patient.id,
+                "doctor_id": doctor_id,
+                "desired_datetime": desired_datetime,
+            },
+            format="json",
+        )
+
+    async def scenario():
+        res = await AsyncClient().get(url, {"doctor_id": doctor.id})
+        assert res.status_code == 200
+        assert res["Content-Type"] == "text/event-stream"
+        chunks = aiter(res.streaming_content)
+        assert await read_event(chunks) == {"retry": "3000"}
+
+        # when
+        await sync_to_async(post)(doctor2.id, patients[1])
+        created = await sync_to_async(post)(doctor.id, patients[0])
+        accepted = await sync_to_async(client.patch)(
+            reverse("clinic:treatment-request-accept", args=[created.data["id"]])
+        )
+
+        # then
+        assert accepted.status_code == 200
+        new_event = await read_event(chunks)
+        accept_event = await read_event(chunks)
+        assert new_event["event"] == "request"
+        assert json.loads(new_event["data"]) == {
+            **created.json(),
+            "doctor_id": doctor.id,
+            "status": RequestStatus.PENDING.value,
+        }
+        assert json.loads(accept_event["data"])["status"] == "수락됨"
+        await res.streaming_content.aclose()
+
+        # when
+        resumed = await AsyncClient().get(
+            url, {"doctor_id": doctor.id}, headers={"Last-Event-ID": new_event["id"]}
+        )
+        resumed_chunks = aiter(resumed.streaming_content)
+        await read_event(resumed_chunks)
+
+        # then
+        assert await read_event(resumed_chunks) == accept_event
+        await resumed.streaming_content.aclose()
+
+        # 형식이 다르거나, 다른 프로세스(epoch)가 발행한 id 는 이어 받을 수 없습니다.
+        _, seq = new_event["id"].split("-")
+        for last_event_id in ("1", f"{request_events.epoch}x-{seq}", f"other-{seq}"):
+            # when
+            expired = await AsyncClient().get(
+                url, {"doctor_id": doctor.id, "last_event_id": last_event_id}
+            )
+            expired_chunks = aiter(expired.streaming_content)
+            await read_event(expired_chunks)
+
+            # then
+            assert (await read_event(expired_chunks))["event"] == "reset"
+            await expired.streaming_content.aclose()
+
+        # when
+        missing = await AsyncClient().get(url, {"doctor_id": 0})
+
+        # then
+        assert missing.status_code == 404
+
+    async_to_sync(scenario)()
+
+    # then
+    sync_server = client.get(url, {"doctor_id": doctor.id})
+    assert sync_server.status_code == 501
+    assert not request_events._subscribers
+
+
+@pytest.mark.django_db
+def test_treatment_request_changes(next_weekday, doctor_with_hours, patients):
+    """
+    진료 요청 생성과 상태 변경이 변경 기록(outbox)에 남고 /changes 로 이어 읽는지 테스트
+    """
+    # given
+    doctor, _ = doctor_with_hours
+    client = APIClient()
+    list_url = reverse("clinic:treatment-request-list")
+    url = reverse("clinic:change-list")
+    desired_datetime = datetime.combine(
+        next_weekday(Days.monday.value, datetime.now() + timedelta(days=1)),
+        time(10, 0),
+    )
+
+    def post(patient, desired_datetime):
+        return client.post(
+            list_url,
+            {
+                "patient_id": patient.id,
+                "doctor_id": doctor.id,
+                "desired_datetime": desired_datetime,
+            },
+            format="json",
+        )
+
+    # when
+    accepted, stale, conflict = [
+        post(patient, desired_datetime).data["id"] for patient in patients[:3]
+    ]
+    closed = post(patients[3], desired_datetime.replace(hour=20))
+    client.patch(reverse("clinic:treatment-request-accept", args=[accepted]))
+    conflicted = client.patch(
+        reverse("clinic:treatment-request-accept", args=[conflict])
+    )
+    TreatmentRequest.objects.filter(id=stale).update(
+        created_datetime=datetime(2024, 3, 11, 10, 0)
+    )
+    call_command("expire_requests", stdout=StringIO())
+
+    # then
+    assert closed.status_code == 400
+    assert conflicted.status_code == 409
+    changes = [
+        (row["treatment_request_id"], row["from_status"], row["to_status"])
+        for row in client.get(url).json()
+    ]
+    refused_id = TreatmentRequest.objects.get(patient=patients[3]).id
+    assert changes == [
+        (accepted, None, "대기중"),
+        (stale, None, "대기중"),
+        (conflict, None, "대기중"),
+        (refused_id, None, "거절됨"),
+        (accepted, "대기중", "수락됨"),
+        (stale, "대기중", "만료됨"),
+    ]
+    assert all(
+        abs(created_datetime - datetime.now()) < timedelta(minutes=1)
+        for created_datetime in TreatmentRequestChange.objects.values_list(
+            "created_datetime", flat=True
+        )
+    )
+
+    # when
+    first = client.get(url, {"limit": 4})
+    rest = client.get(first["Link"][1 : first["Link"].index(">")])
+    after_last = client.get(url, {"after": rest.json()[-1]["seq"]})
+    invalid = client.get(url, {"after": "abc"})
+
+    # then
+    assert [row["seq"] for row in first.json() + rest.json()] == list(
+        TreatmentRequestChange.objects.order_by("id").values_list("id", flat=True)
+    )
+    assert f"after={first.json()[-1]['seq']}" in first["Link"]
+    assert "Link" not in rest
+    assert after_last.json() == []
+    assert invalid.status_code == 400
+
+
+@pytest.mark.django_db
+def test_treatment_request_change_triggers():
+    """
+    마이그레이션을 모두 적용한 뒤에도 변경 기록 트리거가 남아 있는지 테스트
+
+    SQLite 는 테이블을 다시 만들 때 트리거를 지우므로, 이후 마이그레이션이
+    clinic_treatmentrequest 를 다시 만들면 이 테스트가 실패합니다.
+    """
+    if connection.vendor != "sqlite":
+        pytest.skip("SQLite 트리거만 검사합니다.")
+
+    # when
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s",
+            ["clinic_treatmentrequest"],
+        )
+        triggers = {row[0] for row in cursor.fetchall()}
+
+    # then
+    assert triggers == {
+        "clinic_treatmentrequest_change_insert",
+        "clinic_treatmentrequest_change_update",
+    }
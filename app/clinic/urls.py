@@ -1,4 +1,19 @@
-from clinic.views import DoctorApi, RequestAcceptApi, TreatmentRequestApi
+from clinic.async_views import (
+    AsyncDoctorApi,
+    AsyncRequestAcceptApi,
+    AsyncTreatmentRequestApi,
+    AsyncTreatmentRequestStreamApi,
+)
+from clinic.views import (
+    DoctorApi,
+    DoctorHoursApi,
+    DoctorOpeningApi,
+    RequestAcceptApi,
+    TreatmentRequestApi,
+    TreatmentRequestBatchApi,
+    TreatmentRequestChangeApi,
+    TreatmentRequestHistoryApi,
+)
 from clinic.viewsets import (
     BusinessHourViewSet,
     DepartmentViewSet,
@@ -22,11 +37,31 @@ router.register(r"doctors/doctor", DoctorDetailViewSet, basename="doctor-detail"
 
 urlpatterns = [
     path(r"doctors/", DoctorApi.as_view(), name="doctor-list"),
+    path(
+        r"doctors/next-available/",
+        DoctorOpeningApi.as_view(),
+        name="doctor-next-available",
+    ),
+    path(
+        r"doctors/doctor/<int:id>/hours/",
+        DoctorHoursApi.as_view(),
+        name="doctor-hours",
+    ),
     path(
         r"treatment-requests/",
         include(
             [
                 path("", TreatmentRequestApi.as_view(), name="treatment-request-list"),
+                path(
+                    "batch/",
+                    TreatmentRequestBatchApi.as_view(),
+                    name="treatment-request-batch",
+                ),
+                path(
+                    "history/",
+                    TreatmentRequestHistoryApi.as_view(),
+                    name="treatment-request-history",
+                ),
                 path(
                     r"<int:id>/accept/",
                     RequestAcceptApi.as_view(),
@@ -35,5 +70,29 @@ urlpatterns = [
             ]
         ),
     ),
+    path(r"changes/", TreatmentRequestChangeApi.as_view(), name="change-list"),
+    path(
+        r"async/",
+        include(
+            [
+                path("doctors/", AsyncDoctorApi.as_view(), name="async-doctor-list"),
+                path(
+                    "treatment-requests/",
+                    AsyncTreatmentRequestApi.as_view(),
+                    name="async-treatment-request-list",
+                ),
+                path(
+                    "treatment-requests/stream/",
+                    AsyncTreatmentRequestStreamApi.as_view(),
+                    name="async-treatment-request-stream",
+                ),
+                path(
+                    "treatment-requests/<int:id>/accept/",
+                    AsyncRequestAcceptApi.as_view(),
+                    name="async-treatment-request-accept",
+                ),
+            ]
+        ),
+    ),
     path("", include(router.urls)),
 ]
@@ -1,16 +1,71 @@
-from clinic.selectors import get_doctors, get_requests
-from clinic.serializers import DoctorSerializer, TreatmentRequestSerializer
-from clinic.services import accept_request, create_doctor, create_request
+from datetime import datetime, timedelta
+
+from clinic import metrics
+from clinic.caching import (
+    doctor_search_cache_key,
+    get_cached_response,
+    set_cached_response,
+)
+from clinic.enums import Days
+from clinic.pagination import (
+    KeysetPagination,
+    SequencePagination,
+    get_paginated_response,
+    get_rendered_paginated_response,
+)
+from clinic.responses import RenderedResponse
+from clinic.schedule import validate_business_hours
+from clinic.selectors import (
+    OPENING_WINDOW,
+    get_archived_requests,
+    get_doctor_documents,
+    get_next_openings,
+    get_request_changes,
+    get_requests,
+)
+from clinic.serializers import (
+    BusinessHourSerializer,
+    DoctorSerializer,
+    TreatmentRequestSerializer,
+)
+from clinic.services import (
+    BATCH_MAX_SIZE,
+    accept_request,
+    create_doctor,
+    create_request,
+    create_requests,
+    replace_business_hours,
+)
+from django.http import HttpResponse
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import mixins, serializers, status, viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+PAGINATION_PARAMETERS = [
+    OpenApiParameter(
+        name="cursor",
+        description="다음 페이지 커서 (Link 헤더의 next 주소에 포함됩니다)",
+        required=False,
+        type=OpenApiTypes.STR,
+    ),
+    OpenApiParameter(
+        name="limit",
+        description="페이지 크기",
+        required=False,
+        type=OpenApiTypes.INT,
+    ),
+]
+
 
 class DoctorApi(APIView):
     serializer_class = DoctorSerializer
 
+    class Pagination(KeysetPagination):
+        ordering = ("doctor_id",)
+
     class FilterSerializer(serializers.Serializer):
         search = serializers.CharField(default="", required=False)
         time = serializers.DateTimeField(required=False)
@@ -29,6 +84,7 @@ class DoctorApi(APIView):
                 required=False,
                 type=OpenApiTypes.DATETIME,
             ),
+            *PAGINATION_PARAMETERS,
         ],
         responses={200: DoctorSerializer(many=True)},
         tags=["Doctors"],
@@ -37,10 +93,34 @@ class DoctorApi(APIView):
         filter_serializer = self.FilterSerializer(data=request.query_params)
         filter_serializer.is_valid(raise_exception=True)
 
-        doctors = get_doctors(filter_serializer.validated_data)
+        rendered = request.accepted_renderer.format == "json"
+        cache_key = None
+        if rendered:
+            cache_key = doctor_search_cache_key(
+                filter_serializer.validated_data, request
+            )
+        if cache_key:
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                content, headers = cached
+                return RenderedResponse(content, headers=headers)
 
-        output_serializer = self.serializer_class(doctors, many=True)
-        return Response(output_serializer.data, status=status.HTTP_200_OK)
+        documents = get_doctor_documents(filter_serializer.validated_data)
+
+        response = get_rendered_paginated_response(
+            pagination_class=self.Pagination,
+            queryset=documents,
+            field="card",
+            request=request,
+        )
+        headers = {key: value for key, value in response.items() if key == "Link"}
+        if not rendered:
+            # Browsable API 등 다른 렌더러는 데이터로 다시 렌더링합니다.
+            return Response(response.data, headers=headers)
+
+        if cache_key:
+            set_cached_response(cache_key, response.content, headers)
+        return response
 
     @extend_schema(
         request=DoctorSerializer, responses={201: DoctorSerializer}, tags=["Doctors"]
@@ -55,9 +135,133 @@ class DoctorApi(APIView):
         return Response(output_serializer.data, status=status.HTTP_201_CREATED)
 
 
+class DoctorOpeningApi(APIView):
+    MAX_WINDOW = timedelta(days=14)
+
+    class FilterSerializer(serializers.Serializer):
+        search = serializers.CharField(default="", required=False)
+        department_id = serializers.IntegerField(required=False)
+        start = serializers.DateTimeField(required=False)
+        end = serializers.DateTimeField(required=False)
+        limit = serializers.IntegerField(
+            default=20, min_value=1, max_value=1000, required=False
+        )
+
+        def validate(self, data):
+            start = data.setdefault("start", datetime.now())
+            end = data.setdefault("end", start + OPENING_WINDOW)
+            if end <= start:
+                raise ValidationError({"detail": "end 는 start 보다 늦어야 합니다."})
+            if end - start > DoctorOpeningApi.MAX_WINDOW:
+                raise ValidationError(
+                    {
+                        "detail": f"최대 {DoctorOpeningApi.MAX_WINDOW.days}일까지 "
+                        "조회할 수 있습니다."
+                    }
+                )
+            return data
+
+    class OutputSerializer(serializers.Serializer):
+        doctor_id = serializers.IntegerField()
+        name = serializers.CharField()
+        available_datetime = serializers.DateTimeField()
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="search",
+                description="검색어",
+                required=False,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="department_id",
+                description="진료과 id",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+            OpenApiParameter(
+                name="start",
+                description="조회 시작 시각 (기본: 현재 시각, 지난 시각이면 현재 시각)",
+                required=False,
+                type=OpenApiTypes.DATETIME,
+            ),
+            OpenApiParameter(
+                name="end",
+                description="조회 끝 시각 (기본: start 로부터 7일, 최대 14일)",
+                required=False,
+                type=OpenApiTypes.DATETIME,
+            ),
+            OpenApiParameter(
+                name="limit",
+                description="최대 의사 수 (기본: 20)",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+        ],
+        responses={200: OutputSerializer(many=True)},
+        tags=["Doctors"],
+    )
+    def get(self, request):
+        filter_serializer = self.FilterSerializer(data=request.query_params)
+        filter_serializer.is_valid(raise_exception=True)
+
+        openings = get_next_openings(filter_serializer.validated_data)
+
+        output_serializer = self.OutputSerializer(openings, many=True)
+        return Response(output_serializer.data)
+
+
+class DoctorHoursApi(APIView):
+    class InputSerializer(serializers.Serializer):
+        day = serializers.ChoiceField(choices=Days.choices())
+        opening_time = serializers.TimeField()
+        lunch_start_time = serializers.TimeField(required=False, allow_null=True)
+        lunch_end_time = serializers.TimeField(required=False, allow_null=True)
+        closing_time = serializers.TimeField()
+
+        def validate(self, data):
+            try:
+                validate_business_hours(
+                    data["opening_time"],
+                    data["closing_time"],
+                    data.get("lunch_start_time"),
+                    data.get("lunch_end_time"),
+                )
+            except ValueError as e:
+                raise ValidationError({"detail": str(e)})
+            return data
+
+    class InputListSerializer(serializers.ListSerializer):
+        def validate(self, data):
+            days = [hour["day"] for hour in data]
+            if len(days) != len(set(days)):
+                raise ValidationError({"detail": "같은 요일이 중복되었습니다."})
+            return data
+
+    @extend_schema(
+        request=InputSerializer(many=True),
+        responses={200: BusinessHourSerializer(many=True)},
+        tags=["Doctors"],
+    )
+    def put(self, request, id):
+        serializer = self.InputListSerializer(
+            child=self.InputSerializer(), data=request.data
+        )
+        serializer.is_valid(raise_exception=True)
+
+        hours = replace_business_hours(id, serializer.validated_data)
+
+        output_serializer = BusinessHourSerializer(hours, many=True)
+        return Response(output_serializer.data)
+
+
 class TreatmentRequestApi(APIView):
     serializer_class = TreatmentRequestSerializer
 
+    class Pagination(KeysetPagination):
+        ordering = ("desired_datetime", "id")
+
     class FilterSerializer(serializers.Serializer):
         doctor_id = serializers.IntegerField(required=False)
 
@@ -75,6 +279,7 @@ class TreatmentRequestApi(APIView):
                 required=False,
                 type=OpenApiTypes.INT,
             ),
+            *PAGINATION_PARAMETERS,
         ],
         responses={200: OutputSerializer(many=True)},
         tags=["Treatment Requests"],
@@ -85,8 +290,12 @@ class TreatmentRequestApi(APIView):
 
         treatment_requests = get_requests(filter_serializer.validated_data)
 
-        output_serializer = self.OutputSerializer(treatment_requests, many=True)
-        return Response(output_serializer.data, status=status.HTTP_200_OK)
+        return get_paginated_response(
+            pagination_class=self.Pagination,
+            serializer_class=self.OutputSerializer,
+            queryset=treatment_requests,
+            request=request,
+        )
 
     @extend_schema(
         request=TreatmentRequestSerializer,
@@ -103,6 +312,147 @@ class TreatmentRequestApi(APIView):
         return Response(output_serializer.data, status=status.HTTP_201_CREATED)
 
 
+class TreatmentRequestBatchApi(APIView):
+    class ResultSerializer(serializers.Serializer):
+        status = serializers.IntegerField()
+        request = TreatmentRequestApi.OutputSerializer(required=False)
+        errors = serializers.DictField(required=False)
+
+    @extend_schema(
+        request=TreatmentRequestSerializer(many=True),
+        responses={200: ResultSerializer(many=True)},
+        tags=["Treatment Requests"],
+    )
+    def post(self, request):
+        if not isinstance(request.data, list) or not request.data:
+            raise ValidationError({"detail": "진료 요청 목록을 보내주세요."})
+        if len(request.data) > BATCH_MAX_SIZE:
+            raise ValidationError(
+                {"detail": f"한 번에 최대 {BATCH_MAX_SIZE}개까지 요청할 수 있습니다."}
+            )
+
+        results = [None] * len(request.data)
+        items = []
+        for i, data in enumerate(request.data):
+            serializer = TreatmentRequestSerializer(data=data)
+            if serializer.is_valid():
+                items.append((i, serializer.validated_data))
+            else:
+                results[i] = {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "errors": serializer.errors,
+                }
+
+        created = create_requests([validated_data for _, validated_data in items])
+        for (i, _), result in zip(items, created):
+            if isinstance(result, dict):
+                results[i] = {"status": status.HTTP_400_BAD_REQUEST, "errors": result}
+            else:
+                results[i] = {"status": status.HTTP_201_CREATED, "request": result}
+
+        output_serializer = self.ResultSerializer(results, many=True)
+        return Response(output_serializer.data, status=status.HTTP_200_OK)
+
+
+class TreatmentRequestHistoryApi(APIView):
+    class Pagination(KeysetPagination):
+        ordering = ("desired_datetime", "id")
+
+    class FilterSerializer(serializers.Serializer):
+        month = serializers.DateField(input_formats=["%Y-%m"])
+        doctor_id = serializers.IntegerField(required=False)
+        patient_id = serializers.IntegerField(required=False)
+
+    class OutputSerializer(serializers.Serializer):
+        id = serializers.IntegerField()
+        doctor_id = serializers.IntegerField(allow_null=True)
+        patient = serializers.CharField(source="patient.name", allow_null=True)
+        status = serializers.CharField()
+        desired_datetime = serializers.DateTimeField()
+        expired_datetime = serializers.DateTimeField()
+        slot_start = serializers.DateTimeField()
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="month",
+                description="희망 시각의 월 (YYYY-MM)",
+                required=True,
+                type=OpenApiTypes.STR,
+            ),
+            OpenApiParameter(
+                name="doctor_id",
+                description="의사 id",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+            OpenApiParameter(
+                name="patient_id",
+                description="환자 id",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+            *PAGINATION_PARAMETERS,
+        ],
+        responses={200: OutputSerializer(many=True)},
+        tags=["Treatment Requests"],
+    )
+    def get(self, request):
+        filter_serializer = self.FilterSerializer(data=request.query_params)
+        filter_serializer.is_valid(raise_exception=True)
+
+        treatment_requests = get_archived_requests(filter_serializer.validated_data)
+
+        return get_paginated_response(
+            pagination_class=self.Pagination,
+            serializer_class=self.OutputSerializer,
+            queryset=treatment_requests,
+            request=request,
+        )
+
+
+class TreatmentRequestChangeApi(APIView):
+    class Pagination(SequencePagination):
+        page_size = 1000
+        max_page_size = 10000
+
+    class OutputSerializer(serializers.Serializer):
+        seq = serializers.IntegerField(source="id")
+        treatment_request_id = serializers.IntegerField()
+        doctor_id = serializers.IntegerField(allow_null=True)
+        from_status = serializers.CharField(allow_null=True)
+        to_status = serializers.CharField()
+        created_datetime = serializers.DateTimeField()
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="after",
+                description="마지막으로 받은 seq (이 seq 다음 변경부터 반환)",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+            OpenApiParameter(
+                name="limit",
+                description="페이지 크기 (기본: 1000)",
+                required=False,
+                type=OpenApiTypes.INT,
+            ),
+        ],
+        responses={200: OutputSerializer(many=True)},
+        tags=["Treatment Requests"],
+    )
+    def get(self, request):
+        changes = get_request_changes()
+
+        return get_paginated_response(
+            pagination_class=self.Pagination,
+            serializer_class=self.OutputSerializer,
+            queryset=changes,
+            request=request,
+        )
+
+
 class RequestAcceptApi(APIView):
 
     class OutputSerializer(serializers.Serializer):
@@ -120,3 +470,12 @@ class RequestAcceptApi(APIView):
 
         output_serializer = self.OutputSerializer(treatment_request)
         return Response(output_serializer.data, status=status.HTTP_200_OK)
+
+
+def metrics_view(request):
+    """
+    Prometheus text format 지표
+    """
+    return HttpResponse(
+        metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -12,8 +12,11 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -46,6 +49,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "clinic.middleware.RequestMetricsMiddleware",
+    "clinic.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -79,12 +84,66 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.0/ref/settings/#databases
 
+# 데이터베이스 프로필 (환경 변수 CLINIC_DATABASE_PROFILE 로 선택, 기본: development)
+# CONN_MAX_AGE: 연결을 유지하는 시간(초), SQLITE_PRAGMAS: 새 SQLite 연결마다 실행할 PRAGMA
+DATABASE_PROFILES = {
+    "development": {
+        "CONN_MAX_AGE": 0,
+        # 잠금을 짧게만 기다리므로 동시에 쓰는 요청이 많으면 database is locked 가 납니다.
+        # (sqlite3 모듈의 기본값은 5초로 production 과 차이가 없습니다.)
+        "SQLITE_PRAGMAS": {"busy_timeout": 100},
+    },
+    "production": {
+        "CONN_MAX_AGE": 600,
+        "SQLITE_PRAGMAS": {
+            # 쓰는 동안에도 읽기가 막히지 않도록 WAL 로 기록합니다.
+            "journal_mode": "wal",
+            # WAL 에서는 NORMAL 이어도 DB 가 손상되지 않고, 체크포인트 때만 fsync 합니다.
+            "synchronous": "normal",
+            # 다른 연결이 쓰는 중이면 바로 실패하지 않고 최대 5초 기다립니다.
+            "busy_timeout": 5000,
+            "cache_size": -64000,  # 64MB
+            "mmap_size": 256 * 1024 * 1024,
+            "temp_store": "memory",
+        },
+    },
+}
+DATABASE_PROFILE = os.environ.get("CLINIC_DATABASE_PROFILE", "development")
+if DATABASE_PROFILE not in DATABASE_PROFILES:
+    raise ImproperlyConfigured(
+        f"CLINIC_DATABASE_PROFILE must be one of {', '.join(DATABASE_PROFILES)}"
+    )
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("CLINIC_DATABASE_NAME", BASE_DIR / "db.sqlite3"),
+        "CONN_MAX_AGE": DATABASE_PROFILES[DATABASE_PROFILE]["CONN_MAX_AGE"],
+        # 유지된 연결이 끊겼으면 요청 처리 전에 다시 연결합니다.
+        "CONN_HEALTH_CHECKS": True,
+        # 메모리 DB 의 공유 캐시는 잠금을 기다리지 않고 바로 실패하므로,
+        # 동시 요청 테스트가 실제와 같이 잠금을 기다리도록 파일 DB 를 씁니다.
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
     }
 }
+SQLITE_PRAGMAS = DATABASE_PROFILES[DATABASE_PROFILE]["SQLITE_PRAGMAS"]
+
+# 읽기 전용 복제본 (CLINIC_DATABASE_REPLICAS: 쉼표로 구분한 SQLite 파일 경로)
+# 읽기 요청의 조회만 복제본으로 보내며, 복제본은 sync_replicas 명령으로 primary 를 복사합니다.
+DATABASE_REPLICAS = []
+for number, name in enumerate(
+    filter(None, os.environ.get("CLINIC_DATABASE_REPLICAS", "").split(",")), 1
+):
+    alias = f"replica{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "NAME": name,
+        "TEST": {"NAME": BASE_DIR / f"test_{alias}.sqlite3"},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["clinic.replicas.ReadReplicaRouter"]
+# 쓰기 요청을 보낸 클라이언트는 이 시간(초) 동안 primary 에서 읽습니다. (복제 주기보다 길게)
+READ_YOUR_WRITES_SECONDS = 5
 
 
 # Password validation
@@ -130,6 +189,16 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # orjson 이 없으면 표준 json 모듈로 동작합니다.
+    "DEFAULT_RENDERER_CLASSES": [
+        "clinic.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "clinic.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 SPECTACULAR_SETTINGS = {
@@ -158,3 +227,16 @@ SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
     "DISABLE_ERRORS_AND_WARNINGS": True,
 }
+
+# 의사별 영업시간 캐시 (clinic.schedule.schedule_cache)
+SCHEDULE_CACHE_MAX_SIZE = 10000
+# True 이면 Django 캐시에 저장한 버전으로 다른 프로세스의 변경도 반영합니다.
+SCHEDULE_CACHE_SHARED_VERSION = False
+
+# 요청별 쿼리 수, SQL 시간 등을 기록합니다. (clinic.middleware.RequestMetricsMiddleware)
+REQUEST_METRICS_ENABLED = False
+# True 이면 X-Query-Count, Server-Timing 응답 헤더를 추가합니다.
+REQUEST_METRICS_HEADERS = False
+
+# 의사 검색 응답 캐시 유지 시간(초). 데이터가 바뀌면 버전이 올라가 즉시 무효화됩니다.
+DOCTOR_SEARCH_CACHE_TIMEOUT = 300